@@ -0,0 +1,170 @@
+"""답변 캐시 (LRU + TTL, 선택적 디스크 저장)
+
+같은 질문이 같은 시스템 프롬프트(= 같은 규정 문서 집합)로 다시 들어오면
+LLM을 호출하지 않고 저장된 답변을 바로 돌려줍니다.
+디스크 저장은 백그라운드 스레드가 save_interval초 동안의 변경을 모아 한 번에 합니다.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# 답변 캐시 파일 경로 (로컬 캐시)
+ANSWER_CACHE_FILE = "answer_cache.json"
+
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.。？！~]+$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """캐시 키용 질문 정규화 (공백/끝 문장부호/대소문자 차이 무시)"""
+    question = _WHITESPACE.sub(" ", question.strip().lower())
+    return _TRAILING_PUNCTUATION.sub("", question)
+
+
+def prompt_fingerprint(system_prompt: str) -> str:
+    """시스템 프롬프트 지문"""
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+
+class AnswerCache:
+    """(정규화된 질문, 프롬프트 지문) → 답변 캐시"""
+
+    def __init__(self, max_entries: int = 500, ttl_seconds: float = 24 * 60 * 60, path: str | None = ANSWER_CACHE_FILE, save_interval: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        # key -> {"answer": str, "created_at": float(epoch), "sources": [문서 이름]}
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+        self._thread = None
+        if self.path:
+            self._thread = threading.Thread(target=self._run, name="answer-cache-saver", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    @staticmethod
+    def make_key(question: str, fingerprint: str) -> str:
+        """캐시 키 생성"""
+        return f"{fingerprint}:{normalize_question(question)}"
+
+    def get(self, question: str, fingerprint: str) -> str | None:
+        """캐시된 답변 반환 (없거나 만료되었으면 None)"""
+        key = self.make_key(question, fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry["created_at"] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["answer"]
+
+    def contains(self, question: str, fingerprint: str) -> bool:
+        """만료되지 않은 답변이 있는지 확인 (적중 통계에 포함하지 않음)"""
+        with self._lock:
+            entry = self._entries.get(self.make_key(question, fingerprint))
+            return entry is not None and time.time() - entry["created_at"] <= self.ttl_seconds
+
+    def put(self, question: str, fingerprint: str, answer: str, sources: list[str] | None = None):
+        """답변 저장 (가장 오래 사용되지 않은 항목부터 제거)
+
+        sources는 답변 생성 시 프롬프트에 포함된 규정 문서 이름 목록입니다.
+        """
+        key = self.make_key(question, fingerprint)
+        with self._lock:
+            self._entries[key] = {"answer": answer, "created_at": time.time(), "sources": sorted(sources or [])}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty.set()
+
+    def invalidate_documents(self, names: list[str]) -> int:
+        """해당 규정 문서를 참고한 항목만 삭제. 삭제한 항목 수 반환"""
+        names = set(names)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if names & set(entry.get("sources", []))]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._dirty.set()
+            return len(stale)
+
+    def clear(self):
+        """모든 항목 삭제"""
+        with self._lock:
+            self._entries.clear()
+            self._dirty.set()
+
+    def stats(self) -> dict:
+        """캐시 적중/실패 통계"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    # --- 저장/로드 ---
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._dirty.wait()
+            # 짧은 시간 안의 변경은 모아서 한 번만 저장
+            self._stop.wait(self.save_interval)
+            self._dirty.clear()
+            self._save()
+
+    def close(self, timeout: float = 10.0):
+        """종료 시 저장 스레드를 멈추고 남은 변경 저장"""
+        if self._thread is None or self._stop.is_set():
+            return
+        self._stop.set()
+        self._dirty.set()
+        self._thread.join(timeout)
+        self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        # 잠금은 항목 목록을 복사하는 동안만 잡고, 파일 쓰기는 잠금 밖에서 함
+        with self._lock:
+            items = list(self._entries.items())
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(items, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # 디스크 저장 실패는 메모리 캐시 동작에 영향 없음
+            pass
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, entry in items:
+            if now - entry.get("created_at", 0) <= self.ttl_seconds:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
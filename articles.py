@@ -0,0 +1,277 @@
+"""규정 구조(장/절/조/항/호) 분석, 조항 인덱스 및 인용 확인"""
+
+import hashlib
+import re
+import threading
+
+# 줄 맨 앞의 "제25조(육아휴직)", "제25조의2" 형태 조항 제목
+# ("제25조에 따라", "제25조 제2항에 따라"처럼 줄 맨 앞에 온 참조 문구는 제외)
+ARTICLE_PATTERN = re.compile(
+    r"^\s*제\s*(\d+)\s*조(?:\s*의\s*(\d+))?(?=\s*[(（]|\s+(?!제\s*\d)|\s*$)",
+    re.MULTILINE,
+)
+CHAPTER_PATTERN = re.compile(r"^\s*(제\s*\d+\s*장.*)$", re.MULTILINE)
+SECTION_PATTERN = re.compile(r"^\s*(제\s*\d+\s*절.*)$", re.MULTILINE)
+TITLE_PATTERN = re.compile(r"^[^(（\n]*[(（]([^)）\n]+)[)）]")
+# 항: ①~⑳
+PARAGRAPH_PATTERN = re.compile(r"[①-⑳]")
+# 호: 줄 맨 앞의 "1.", "2."
+ITEM_PATTERN = re.compile(r"^\s*(\d+)\.\s", re.MULTILINE)
+
+# 질문/답변 속 조항 인용: "제25조", "제25조의2", "제25조 제2항", "제25조 2항"
+CITATION_PATTERN = re.compile(
+    r"제\s*(\d+)\s*조(?:\s*의\s*(\d+))?(?:\s*(?:제\s*)?(\d+)\s*항)?"
+)
+# 인용 앞에 붙은 규정 이름 후보 ("…규정", "…규칙", "…지침")
+REGULATION_NAME_PATTERN = re.compile(r"([가-힣A-Za-z0-9]+(?:규정|규칙|지침))\s*$")
+# 법령/규정 이름으로 보이는 표기 ("근로기준법", "…시행령", "…규칙" 등)
+SOURCE_NAME_PATTERN = re.compile(r"[가-힣A-Za-z0-9]+(?:법|령|규칙|규정|지침)")
+
+# 첫 조항 이전의 내용 (제목, 목차 등)
+PREAMBLE_LABEL = "전문"
+
+
+def article_label(number: str, sub_number: str | None = None) -> str:
+    """조항 표기 정규화 ("제 25 조 의 2" → "제25조의2")"""
+    return f"제{int(number)}조" + (f"의{int(sub_number)}" if sub_number else "")
+
+
+def _compact(text: str) -> str:
+    return re.sub(r"\s+", "", text)
+
+
+def split_articles(text: str) -> list[tuple[str, str]]:
+    """본문을 (조항 표기, 조항 본문) 목록으로 분할
+
+    같은 조항 번호가 다시 나오면(부칙 등) "제1조 (2)"처럼 순번을 붙입니다.
+    """
+    matches = list(ARTICLE_PATTERN.finditer(text))
+    articles = []
+    preamble = text[:matches[0].start()] if matches else text
+    if preamble.strip():
+        articles.append((PREAMBLE_LABEL, preamble.strip()))
+
+    seen = {}
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        label = article_label(match.group(1), match.group(2))
+        seen[label] = seen.get(label, 0) + 1
+        if seen[label] > 1:
+            label = f"{label} ({seen[label]})"
+        articles.append((label, text[match.start():end].strip()))
+    return articles
+
+
+def article_hashes(text: str) -> dict[str, str]:
+    """조항별 내용 해시 (공백 차이는 무시)"""
+    return {
+        label: hashlib.sha256(" ".join(body.split()).encode("utf-8")).hexdigest()[:16]
+        for label, body in split_articles(text)
+    }
+
+
+def diff_articles(old: dict[str, str], new: dict[str, str]) -> dict:
+    """조항 해시 비교 결과 (추가/삭제/변경된 조항 목록과 변경 없는 조항 수)"""
+    return {
+        "added": [label for label in new if label not in old],
+        "removed": [label for label in old if label not in new],
+        "modified": [label for label in new if label in old and old[label] != new[label]],
+        "unchanged": sum(1 for label in new if old.get(label) == new[label]),
+    }
+
+
+def _split_paragraphs(body: str) -> dict[int, dict]:
+    """조항 본문을 항(①②…)별로 분할하고 각 항의 호(1. 2. …)를 추출"""
+    markers = list(PARAGRAPH_PATTERN.finditer(body))
+    paragraphs = {}
+    for i, marker in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(body)
+        text = body[marker.start():end].strip()
+        items = {}
+        item_matches = list(ITEM_PATTERN.finditer(text))
+        for j, item in enumerate(item_matches):
+            item_end = item_matches[j + 1].start() if j + 1 < len(item_matches) else len(text)
+            items[int(item.group(1))] = text[item.start():item_end].strip()
+        paragraphs[ord(marker.group()) - 0x245F] = {"text": text, "items": items}
+    return paragraphs
+
+
+def parse_structure(text: str) -> list[dict]:
+    """본문을 조항 단위로 분석
+
+    각 항목: {"label", "title", "chapter", "section", "text", "paragraphs": {항 번호: {"text", "items"}}}
+    """
+    headings = sorted(
+        [(m.start(), "chapter", m.group(1).strip()) for m in CHAPTER_PATTERN.finditer(text)]
+        + [(m.start(), "section", m.group(1).strip()) for m in SECTION_PATTERN.finditer(text)]
+    )
+    matches = list(ARTICLE_PATTERN.finditer(text))
+    articles = []
+    seen = {}
+    chapter = section = None
+    heading_index = 0
+    for i, match in enumerate(matches):
+        # 이 조항 앞에 나온 장/절 제목 반영 (새 장이 시작되면 절은 초기화)
+        while heading_index < len(headings) and headings[heading_index][0] < match.start():
+            _, kind, heading = headings[heading_index]
+            if kind == "chapter":
+                chapter, section = heading, None
+            else:
+                section = heading
+            heading_index += 1
+
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        # 조항 본문 끝에 붙은 다음 장/절 제목 제거
+        next_heading = min(
+            (start for start, _, _ in headings if match.start() < start < end),
+            default=end,
+        )
+        body = text[match.start():next_heading].strip()
+
+        label = article_label(match.group(1), match.group(2))
+        seen[label] = seen.get(label, 0) + 1
+        if seen[label] > 1:
+            label = f"{label} ({seen[label]})"
+        title = TITLE_PATTERN.match(body)
+        articles.append({
+            "label": label,
+            "title": title.group(1).strip() if title else "",
+            "chapter": chapter,
+            "section": section,
+            "text": body,
+            "paragraphs": _split_paragraphs(body),
+        })
+    return articles
+
+
+class ArticleIndex:
+    """(규정 이름, 조항 표기) → 조항 정보 인덱스"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._articles = {}  # (name, label) -> article
+        self._hashes = {}  # name -> 색인한 문서 해시
+        self._names = {}  # 공백 제거한 규정 이름 -> 규정 이름
+        self.synced_version = None
+
+    def upsert(self, name: str, content: str, digest: str | None = None):
+        """문서 조항 색인 (기존 조항은 교체)"""
+        with self._lock:
+            self.remove(name)
+            for article in parse_structure(content):
+                self._articles[(name, article["label"])] = article
+            self._hashes[name] = digest
+            self._names[_compact(name)] = name
+
+    def remove(self, name: str):
+        """문서 조항 제거"""
+        with self._lock:
+            for key in [key for key in self._articles if key[0] == name]:
+                del self._articles[key]
+            self._hashes.pop(name, None)
+            self._names.pop(_compact(name), None)
+
+    def sync(self, documents: list[dict], version: str | None = None, load_content=None):
+        """문서 메타데이터 목록과 인덱스를 맞춤 (해시가 바뀐 문서만 load_content(name)으로 다시 분석)"""
+        with self._lock:
+            if version is not None and version == self.synced_version:
+                return
+            names = {doc["name"] for doc in documents}
+            for name in list(self._hashes):
+                if name not in names:
+                    self.remove(name)
+            for doc in documents:
+                if doc["name"] in self._hashes and (doc.get("hash") is None or self._hashes[doc["name"]] == doc.get("hash")):
+                    continue
+                self.upsert(doc["name"], load_content(doc["name"]), doc.get("hash"))
+            # 모든 문서를 불러온 뒤에만 기록 (중간에 실패하면 다음 호출에서 다시 시도)
+            self.synced_version = version
+
+    def get(self, name: str, label: str) -> dict | None:
+        """조항 조회"""
+        return self._articles.get((name, label))
+
+    def find_regulation(self, text: str) -> str | None:
+        """텍스트에 언급된 규정 이름 (가장 긴 이름 우선)
+
+        전체 이름이 없으면 텍스트 끝의 "…규정/규칙/지침" 표기가 이름의 일부인 규정을 찾습니다.
+        """
+        compact = _compact(text)
+        matched = [name for key, name in self._names.items() if key and key in compact]
+        if matched:
+            return max(matched, key=len)
+        candidate = REGULATION_NAME_PATTERN.search(text)
+        if candidate:
+            partial = [name for key, name in self._names.items() if candidate.group(1) in key]
+            if len(partial) == 1:
+                return partial[0]
+        return None
+
+    def resolve_question(self, question: str) -> list[dict]:
+        """질문이 특정 조항을 직접 지목하면("인사규정 제25조") 그 조항만 반환"""
+        citation = CITATION_PATTERN.search(question)
+        if not citation:
+            return []
+        label = article_label(citation.group(1), citation.group(2))
+        name = self.find_regulation(question[:citation.start()])
+        if name is None:
+            # 다른 법령/규정 이름 뒤의 조항이면("근로기준법 제74조") 업로드된 규정으로 보지 않음
+            if SOURCE_NAME_PATTERN.search(question[:citation.start()]):
+                return []
+            # 규정 이름 없이 조항만 지목한 경우 해당 조항이 하나뿐일 때만 사용
+            owners = [key[0] for key in self._articles if key[1] == label]
+            if len(owners) != 1:
+                return []
+            name = owners[0]
+        article = self.get(name, label)
+        if article is None:
+            return []
+        paragraph = citation.group(3)
+        text = article["text"]
+        if paragraph and int(paragraph) in article["paragraphs"]:
+            # 항까지 지목했으면 조항 제목과 해당 항만 사용
+            heading = text.splitlines()[0] if text else label
+            text = f"{heading}\n{article['paragraphs'][int(paragraph)]['text']}"
+        return [{"name": name, "page": None, "text": text, "article": label}]
+
+    def verify_citations(self, answer: str) -> list[dict]:
+        """답변 속 "규정명 + 조항" 인용을 인덱스와 대조
+
+        반환: [{"citation": str, "status": "ok" | "missing_article" | "missing_paragraph" | "unknown_regulation"}]
+        규정 이름을 특정할 수 없는 인용(예: 법령 조항)은 확인 대상에서 제외합니다.
+        """
+        results = []
+        current = None  # 앞에서 마지막으로 언급된 규정
+        last_end = 0
+        for match in CITATION_PATTERN.finditer(answer):
+            window = answer[max(last_end, match.start() - 30):match.start()]
+            last_end = match.end()
+            name = self.find_regulation(window)
+            if name is None:
+                candidate = REGULATION_NAME_PATTERN.search(window)
+                if candidate:
+                    results.append({"citation": f"{candidate.group(1)} {match.group().strip()}", "status": "unknown_regulation"})
+                    current = None
+                    continue
+                # "제16조 및 제17조"처럼 바로 이어지는 인용만 앞 규정을 따름
+                # (사이에 다른 법령 이름이 있으면 그 법령의 조항)
+                if len(_compact(window)) > 10 or SOURCE_NAME_PATTERN.search(window):
+                    current = None
+                name = current
+            if name is None:
+                continue
+            current = name
+            label = article_label(match.group(1), match.group(2))
+            article = self.get(name, label)
+            if article is None:
+                status = "missing_article"
+            elif match.group(3) and article["paragraphs"] and int(match.group(3)) not in article["paragraphs"]:
+                status = "missing_paragraph"
+            else:
+                status = "ok"
+            results.append({"citation": f"{name} {match.group().strip()}", "status": status})
+        return results
+
+    def stats(self) -> dict:
+        """색인된 규정/조항 수"""
+        return {"regulations": len(self._hashes), "articles": len(self._articles)}
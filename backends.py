@@ -0,0 +1,125 @@
+"""OpenAI / Firestore 백엔드 선택
+
+환경 변수 HR_CHATBOT_BACKEND로 백엔드를 고릅니다.
+- live (기본값): st.secrets의 OPENAI_API_KEY와 [firebase] 서비스 계정 사용
+- emulator: OpenAI는 live와 같고, Firestore는 FIRESTORE_EMULATOR_HOST의 에뮬레이터 사용
+- fake: FAKE_OPENAI_BASE_URL의 로컬 대체 서버와 메모리 Firestore 사용 (벤치마크용)
+
+openai, firebase_admin 등 무거운 패키지는 클라이언트를 실제로 만들 때 import하며,
+LazyResource로 감싸면 첫 사용 시점까지 생성(과 네트워크 연결)을 미룹니다.
+"""
+
+import os
+import threading
+
+BACKEND_ENV = "HR_CHATBOT_BACKEND"
+
+# fake 백엔드에서 모든 세션이 공유하는 메모리 Firestore
+_fake_firestore = None
+
+
+def backend_name() -> str:
+    """현재 백엔드 이름"""
+    return os.environ.get(BACKEND_ENV, "live")
+
+
+class LazyResource:
+    """처음 속성에 접근할 때 factory()로 객체를 만드는 대리자 (스레드 안전)"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._value = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> bool:
+        """이미 객체를 만들었는지"""
+        return self._value is not None
+
+    def get(self):
+        """대상 객체 (없으면 생성)"""
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = self._factory()
+        return self._value
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+def create_openai_client(secrets):
+    """OpenAI 클라이언트 생성"""
+    from openai import OpenAI
+
+    if backend_name() == "fake":
+        return OpenAI(
+            api_key="fake",
+            base_url=os.environ.get("FAKE_OPENAI_BASE_URL", "http://127.0.0.1:8765/v1"),
+            max_retries=0,
+        )
+    # 재시도는 LLMGateway가 백오프와 함께 담당하므로 SDK 자체 재시도는 끔
+    return OpenAI(api_key=secrets["OPENAI_API_KEY"], max_retries=0)
+
+
+def get_fake_firestore():
+    """fake 백엔드의 메모리 Firestore (프로세스 전체 공유)"""
+    global _fake_firestore
+    if _fake_firestore is None:
+        from fake_backends import InMemoryFirestore
+        _fake_firestore = InMemoryFirestore(float(os.environ.get("FAKE_FIRESTORE_LATENCY", 0)))
+    return _fake_firestore
+
+
+def firestore_increment(value: int = 1):
+    """숫자 필드를 서버에서 value만큼 늘리는 쓰기 값 (firestore.Increment)"""
+    if backend_name() == "fake":
+        from fake_backends import FakeIncrement
+        return FakeIncrement(value)
+    from google.cloud.firestore import Increment
+    return Increment(value)
+
+
+def firestore_array_union(values: list):
+    """배열 필드에 없는 값만 서버에서 추가하는 쓰기 값 (firestore.ArrayUnion)"""
+    if backend_name() == "fake":
+        from fake_backends import FakeArrayUnion
+        return FakeArrayUnion(values)
+    from google.cloud.firestore import ArrayUnion
+    return ArrayUnion(values)
+
+
+def firestore_array_remove(values: list):
+    """배열 필드에서 값을 서버에서 제거하는 쓰기 값 (firestore.ArrayRemove)"""
+    if backend_name() == "fake":
+        from fake_backends import FakeArrayRemove
+        return FakeArrayRemove(values)
+    from google.cloud.firestore import ArrayRemove
+    return ArrayRemove(values)
+
+
+def create_firestore_client(secrets):
+    """Firestore 클라이언트 생성"""
+    backend = backend_name()
+    if backend == "fake":
+        return get_fake_firestore()
+    if backend == "emulator":
+        # google-cloud-firestore는 FIRESTORE_EMULATOR_HOST가 설정되어 있으면 에뮬레이터에 연결
+        from google.cloud import firestore as gcloud_firestore
+        return gcloud_firestore.Client(project=os.environ.get("GCLOUD_PROJECT", "demo-hr-chatbot"))
+
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    if not firebase_admin._apps:
+        # secrets.toml에서 Firebase 설정 읽기
+        firebase_config = dict(secrets["firebase"])
+        cred = credentials.Certificate(firebase_config)
+
+        # storage bucket 설정
+        project_id = firebase_config.get('project_id')
+        firebase_admin.initialize_app(cred, {
+            'storageBucket': f"{project_id}.firebasestorage.app"
+        })
+
+    return firestore.client()
@@ -0,0 +1,152 @@
+"""오프라인 부하 테스트
+
+OpenAI와 Firebase 자격 증명 없이, 로컬 대체 OpenAI 서버와 메모리 Firestore로
+N개의 동시 세션이 FAQ 버튼과 자유 질문 입력 경로를 거치게 하고
+처리량, 턴 지연 시간(p50/p95/p99), Firestore 작업 수를 보고합니다.
+
+    python benchmarks/load_test.py --sessions 8 --turns 5 --ttft 0.3 --tps 80
+
+각 세션은 streamlit.testing의 AppTest로 streamlit_app.py를 실제로 실행합니다.
+st.cache_resource 자원(문서 캐시, 답변 캐시 등)은 실제 서버처럼 모든 세션이 공유합니다.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from metrics import percentile  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "streamlit_app.py")
+FAQ_COUNT = 5
+FREE_TEXT_QUESTIONS = [
+    "육아휴직은 몇 번 분리해서 사용할 수 있어",
+    "직장 내 괴롭힘 분리조치 기간은?",
+    "왜 주민등록번호 뒷자리가 필요해",
+    "인사규정 제25조 알려줘",
+    "출산휴가 신청은 언제까지 해야 해?",
+    "연차휴가는 며칠까지 이월할 수 있나요?",
+]
+
+
+def synthetic_regulation(articles: int = 60) -> tuple[str, list[str]]:
+    """벤치마크용 가상 규정 문서 (페이지별 텍스트)"""
+    pages = []
+    for page in range(articles // 5):
+        lines = []
+        for n in range(page * 5 + 1, page * 5 + 6):
+            lines.append(f"제{n}조(조항 {n}) ① 직원은 휴가, 휴직, 복직 및 급여에 관하여 이 조에 따른다.")
+            lines.append(f"② 육아휴직은 자녀 1명당 1년 이내로 하며 {n % 3 + 1}회 분할하여 사용할 수 있다.")
+        pages.append("\n".join(lines))
+    return "\n".join(pages), pages
+
+
+def make_session(args):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+    at.secrets["OPENAI_API_KEY"] = "fake"
+    at.secrets["ANSWER_CACHE_SIZE"] = args.answer_cache_size
+    at.secrets["ANSWER_CACHE_FILE"] = ""
+    at.run()
+    return at
+
+
+def run_session(session_id: int, args, latencies: list, kinds: list, lock: threading.Lock):
+    rng = random.Random(args.seed + session_id)
+    at = make_session(args)
+    for _ in range(args.turns):
+        if rng.random() < args.faq_ratio:
+            kind = "faq"
+            action = at.button(key=f"faq_{rng.randint(1, FAQ_COUNT)}").click()
+        else:
+            kind = "free_text"
+            action = at.chat_input[0].set_value(rng.choice(FREE_TEXT_QUESTIONS))
+        started = time.perf_counter()
+        action.run()
+        elapsed = time.perf_counter() - started
+        if at.exception:
+            raise RuntimeError(f"session {session_id}: {at.exception}")
+        with lock:
+            latencies.append(elapsed)
+            kinds.append(kind)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=8, help="동시 세션 수")
+    parser.add_argument("--turns", type=int, default=5, help="세션당 질문 수")
+    parser.add_argument("--faq-ratio", type=float, default=0.5, help="FAQ 버튼 질문 비율")
+    parser.add_argument("--ttft", type=float, default=0.3, help="대체 OpenAI 서버의 첫 토큰까지 시간(초)")
+    parser.add_argument("--tps", type=float, default=80.0, help="대체 OpenAI 서버의 초당 토큰 수")
+    parser.add_argument("--completion-tokens", type=int, default=120, help="답변당 토큰 수")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429/503 응답 비율")
+    parser.add_argument("--firestore-latency", type=float, default=0.0, help="메모리 Firestore 작업당 지연(초)")
+    parser.add_argument("--answer-cache-size", type=int, default=500, help="답변 캐시 크기 (0이면 사용 안 함)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="스크립트 실행 제한 시간(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from fake_backends import FakeOpenAIServer
+
+    server = FakeOpenAIServer(
+        ttft_seconds=args.ttft,
+        tokens_per_second=args.tps,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+    ).start()
+    os.environ["HR_CHATBOT_BACKEND"] = "fake"
+    os.environ["FAKE_OPENAI_BASE_URL"] = server.base_url
+    os.environ["FAKE_FIRESTORE_LATENCY"] = str(args.firestore_latency)
+
+    # 인덱스/캐시/로그 파일이 저장소를 어지럽히지 않도록 임시 디렉터리에서 실행
+    workdir = tempfile.mkdtemp(prefix="hr-chatbot-bench-")
+    os.chdir(workdir)
+
+    import backends
+    from doc_store import save_document
+
+    db = backends.get_fake_firestore()
+    content, pages = synthetic_regulation()
+    save_document(db, "인사규정", content, pages)
+    ops_before = db.ops.snapshot()
+
+    latencies, kinds = [], []
+    lock = threading.Lock()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+        futures = [
+            executor.submit(run_session, i, args, latencies, kinds, lock)
+            for i in range(args.sessions)
+        ]
+        for future in futures:
+            future.result()
+    wall = time.perf_counter() - started
+    server.stop()
+
+    ops_after = db.ops.snapshot()
+    ops = {key: ops_after[key] - ops_before[key] for key in ops_after}
+    turns = len(latencies)
+
+    print(f"sessions={args.sessions} turns/session={args.turns} faq_ratio={args.faq_ratio} "
+          f"ttft={args.ttft}s tps={args.tps} error_rate={args.error_rate}")
+    print(f"turns: {turns} (faq {kinds.count('faq')}, free_text {kinds.count('free_text')}) in {wall:.2f}s")
+    print(f"throughput: {turns / wall:.2f} turns/s")
+    print("turn latency: " + ", ".join(
+        f"p{int(q * 100)}={percentile(latencies, q) * 1000:.0f}ms" for q in (0.5, 0.95, 0.99)
+    ))
+    print(f"openai requests: {server.requests} (errors {server.errors})")
+    print(f"firestore ops: reads={ops['reads']} writes={ops['writes']} deletes={ops['deletes']} queries={ops['queries']}"
+          f" ({ops['reads'] / max(turns, 1):.2f} reads/turn)")
+    print(f"workdir: {workdir}")
+
+
+if __name__ == "__main__":
+    main()
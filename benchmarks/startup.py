@@ -0,0 +1,175 @@
+"""시작 시간 벤치마크
+
+새 컨테이너/레플리카에서 처음 들어온 세션이 겪는 비용을 측정합니다.
+- import 시간: 모듈마다 새 파이썬 프로세스에서 처음 import할 때 걸리는 시간
+- 첫 렌더링까지 시간: 새 프로세스에서 streamlit_app.py를 처음 실행할 때
+  대화 히스토리(첫 st.chat_message)를 그리기 시작하기까지의 시간과 스크립트 전체 실행 시간
+- 첫 실행 후 로드되지 않은 무거운 패키지 (지연 import가 유지되는지 확인)
+- Firestore 클라이언트를 처음 만든 시점 (첫 렌더링 이후여야 함)
+
+OpenAI/Firebase 자격 증명 없이 메모리 Firestore(fake 백엔드)로 실행합니다.
+fake 백엔드는 firebase_admin을 import하지 않으므로, Firestore는 패키지 로드 대신
+backends.create_firestore_client 호출 시점을 기록해 확인합니다. (사이드바 FAQ 목록을
+읽느라 첫 실행 안에서는 클라이언트가 만들어지지만, 대화 히스토리를 그린 뒤여야 합니다.)
+--firestore-latency로 Firestore 작업마다 지연을 넣으면 네트워크 I/O가 첫 렌더링을 막는지 볼 수 있습니다.
+
+    python benchmarks/startup.py --runs 5 --firestore-latency 0.05
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "streamlit_app.py")
+
+# import 시간을 잴 모듈 (앱 모듈 + 외부 패키지)
+IMPORT_MODULES = [
+    "streamlit",
+    "openai",
+    "firebase_admin",
+    "PyPDF2",
+    "numpy",
+    "backends",
+    "pdf_ingest",
+    "doc_store",
+    "retrieval",
+    "semantic_cache",
+    "single_flight",
+]
+# 채팅 화면 첫 실행에서 import되지 않아야 하는 패키지
+DEFERRED_MODULES = ["openai", "PyPDF2"]
+
+
+def median(values: list[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def measure_import(module: str) -> float | None:
+    """새 프로세스에서 module을 import하는 데 걸린 시간(ms), 설치되지 않았으면 None"""
+    code = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {ROOT!r})\n"
+        "started = time.perf_counter()\n"
+        "try:\n"
+        f"    import {module}\n"
+        "except ImportError:\n"
+        "    print('null'); raise SystemExit\n"
+        "print((time.perf_counter() - started) * 1000)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+    output = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not output or output[-1] == "null":
+        return None
+    return float(output[-1])
+
+
+def run_first_render(timeout: float) -> dict:
+    """(자식 프로세스에서) 앱을 처음 실행하고 시간 측정"""
+    started = time.perf_counter()
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    streamlit_import_ms = (time.perf_counter() - started) * 1000
+
+    first_render = {}
+    original_chat_message = st.chat_message
+
+    def timed_chat_message(*args, **kwargs):
+        first_render.setdefault("at", time.perf_counter())
+        return original_chat_message(*args, **kwargs)
+
+    st.chat_message = timed_chat_message
+
+    # Firestore 클라이언트 생성 시점 기록 (live 백엔드라면 firebase_admin import + gRPC 연결)
+    import backends
+    firestore_created = {}
+    original_create_firestore_client = backends.create_firestore_client
+
+    def timed_create_firestore_client(*args, **kwargs):
+        firestore_created.setdefault("at", time.perf_counter())
+        return original_create_firestore_client(*args, **kwargs)
+
+    backends.create_firestore_client = timed_create_firestore_client
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.secrets["OPENAI_API_KEY"] = "fake"
+    at.secrets["ANSWER_CACHE_FILE"] = ""
+    run_started = time.perf_counter()
+    at.run()
+    run_ms = (time.perf_counter() - run_started) * 1000
+    if at.exception:
+        raise RuntimeError(str(at.exception))
+
+    return {
+        "streamlit_import_ms": streamlit_import_ms,
+        "first_render_ms": (first_render["at"] - run_started) * 1000 if first_render else None,
+        "first_run_ms": run_ms,
+        "firestore_client_ms": (firestore_created["at"] - run_started) * 1000 if firestore_created else None,
+        "loaded_deferred": [name for name in DEFERRED_MODULES if name in sys.modules],
+    }
+
+
+def measure_first_render(args) -> dict:
+    env = dict(os.environ)
+    env["HR_CHATBOT_BACKEND"] = "fake"
+    env["FAKE_FIRESTORE_LATENCY"] = str(args.firestore_latency)
+    # 인덱스/캐시/로그 파일이 저장소를 어지럽히지 않도록 임시 디렉터리에서 실행
+    workdir = tempfile.mkdtemp(prefix="hr-chatbot-startup-")
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--timeout", str(args.timeout)],
+        capture_output=True, text=True, cwd=workdir, env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or result.stdout.strip())
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="측정 반복 횟수 (중앙값 보고)")
+    parser.add_argument("--firestore-latency", type=float, default=0.0, help="메모리 Firestore 작업당 지연(초)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="스크립트 실행 제한 시간(초)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, ROOT)
+        print(json.dumps(run_first_render(args.timeout)))
+        return
+
+    print(f"python {sys.version.split()[0]} · runs={args.runs} · firestore_latency={args.firestore_latency}s")
+    print("cold import (median ms):")
+    for module in IMPORT_MODULES:
+        samples = [measure_import(module) for _ in range(args.runs)]
+        if any(sample is None for sample in samples):
+            print(f"  {module:<16} not installed")
+        else:
+            print(f"  {module:<16} {median(samples):8.1f}")
+
+    runs = [measure_first_render(args) for _ in range(args.runs)]
+    renders = [run["first_render_ms"] for run in runs if run["first_render_ms"] is not None]
+    print("first session (median ms):")
+    print(f"  streamlit import   {median([run['streamlit_import_ms'] for run in runs]):8.1f}")
+    print(f"  first render       {median(renders):8.1f}" if renders else "  first render       n/a")
+    print(f"  first script run   {median([run['first_run_ms'] for run in runs]):8.1f}")
+    created = [run["firestore_client_ms"] for run in runs if run["firestore_client_ms"] is not None]
+    print(f"  firestore client   {median(created):8.1f}" if created else "  firestore client   not created")
+    early = sum(
+        1 for run in runs
+        if run["firestore_client_ms"] is not None and run["first_render_ms"] is not None
+        and run["firestore_client_ms"] < run["first_render_ms"]
+    )
+    if early:
+        print(f"warning: Firestore client created before first render in {early}/{len(runs)} runs")
+    loaded = sorted({name for run in runs for name in run["loaded_deferred"]})
+    print(f"deferred packages loaded on first run: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
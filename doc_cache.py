@@ -0,0 +1,109 @@
+"""규정 문서 목록 캐시 (프로세스 전체 공유)
+
+모든 Streamlit 세션이 같은 캐시를 사용하므로 질문마다 documents 컬렉션을
+다시 읽지 않습니다. 업로드/삭제 시 즉시 무효화하고, 다른 서버 인스턴스에서의
+변경은 Firestore 스냅샷 리스너 또는 TTL 만료로 반영합니다.
+"""
+
+import hashlib
+import threading
+import time
+
+
+def documents_version(documents: list[dict]) -> str:
+    """문서 목록의 버전 (이름 + 내용 해시)"""
+    digest = hashlib.sha256()
+    for doc in sorted(documents, key=lambda d: d["name"]):
+        doc_hash = doc.get("hash") or hashlib.sha256(doc.get("content", "").encode("utf-8")).hexdigest()
+        digest.update(doc["name"].encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(doc_hash.encode("ascii"))
+    return digest.hexdigest()[:16]
+
+
+class DocumentCache:
+    """TTL과 명시적 무효화를 지원하는 문서 목록 캐시"""
+
+    def __init__(self, ttl_seconds: float = 300):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._documents = None
+        self._version = None
+        self._loaded_at = 0.0
+        self._watch = None
+        self._watch_factory = None
+        self._watch_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, loader) -> list[dict]:
+        """캐시된 문서 목록 반환 (없거나 만료되었으면 loader로 다시 읽음)"""
+        self._start_watch()
+        with self._lock:
+            if self._documents is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+                self.hits += 1
+                return self._documents
+            self.misses += 1
+            documents = loader()
+            self._documents = documents
+            self._version = documents_version(documents)
+            self._loaded_at = time.monotonic()
+            return documents
+
+    @property
+    def version(self) -> str | None:
+        """현재 캐시된 문서 집합의 버전"""
+        return self._version
+
+    def invalidate(self):
+        """캐시 무효화 (다음 get에서 다시 읽음)"""
+        with self._lock:
+            self._documents = None
+            self.invalidations += 1
+
+    def watch(self, collection_ref):
+        """Firestore 스냅샷 리스너로 다른 인스턴스의 변경 감지"""
+        first_snapshot = threading.Event()
+
+        def on_snapshot(col_snapshot, changes, read_time):
+            # 리스너 등록 직후의 첫 스냅샷은 변경이 아님
+            if not first_snapshot.is_set():
+                first_snapshot.set()
+                return
+            self.invalidate()
+
+        self._watch = collection_ref.on_snapshot(on_snapshot)
+        return self._watch
+
+    def watch_on_first_load(self, query_factory):
+        """첫 get() 때 query_factory()가 만든 쿼리에 리스너 등록
+
+        Firestore 클라이언트 생성과 리스너 연결을 문서가 처음 필요할 때까지 미룹니다.
+        """
+        self._watch_factory = query_factory
+
+    def _start_watch(self):
+        if self._watch_factory is None:
+            return
+        with self._watch_lock:
+            factory, self._watch_factory = self._watch_factory, None
+            if factory is None:
+                return
+            try:
+                self.watch(factory())
+            except Exception:
+                # 리스너를 사용할 수 없으면 TTL 만료로만 갱신
+                pass
+
+    def stats(self) -> dict:
+        """캐시 적중/실패 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / total if total else 0.0,
+            "version": self._version,
+            "watching": self._watch is not None,
+        }
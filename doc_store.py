@@ -0,0 +1,254 @@
+"""규정 문서 Firestore 저장소
+
+문서마다 가벼운 메타데이터 문서(documents/{name})를 두고, 본문은 페이지 단위
+(긴 페이지는 더 잘게 나눈) documents/{name}/chunks/{내용 해시} 하위 문서로 저장합니다.
+청크 순서와 페이지 번호는 메타데이터의 chunks 목록에 두므로, 페이지가 추가되거나
+밀려도 내용이 바뀐 청크만 다시 씁니다.
+목록 화면은 메타데이터만 읽고, 본문은 필요할 때만 불러옵니다.
+"""
+
+import hashlib
+from datetime import datetime
+
+from articles import article_hashes, diff_articles
+from retrieval import chunk_text, content_hash
+
+DOCUMENTS_COLLECTION = "documents"
+CHUNKS_COLLECTION = "chunks"
+
+# Firestore WriteBatch 최대 작업 수
+BATCH_LIMIT = 500
+
+# 청크 하위 문서 하나에 넣을 최대 글자 수 (Firestore 문서 크기 제한 1 MiB보다 충분히 작게)
+STORAGE_CHUNK_CHARS = 50_000
+
+# 목록 화면에 보여줄 미리보기 길이
+PREVIEW_CHARS = 500
+
+# 목록 조회 시 읽을 메타데이터 필드 (본문 제외)
+METADATA_FIELDS = ["name", "hash", "file_hash", "page_count", "size", "chunk_count", "preview", "uploaded_at", "active"]
+
+
+def _chunk_id(chunk: dict) -> str:
+    """청크 하위 문서 ID (본문 내용 해시, 위치와 무관)"""
+    return content_hash(chunk["text"])[:32]
+
+
+def file_hash(data: bytes) -> str:
+    """업로드 파일 해시"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_same_upload(documents: list[dict], name: str, uploaded_file_hash: str) -> bool:
+    """같은 이름의 문서가 같은 파일로 이미 저장되어 있는지 (텍스트 추출 전에 확인)"""
+    return any(doc["name"] == name and doc.get("file_hash") == uploaded_file_hash for doc in documents)
+
+
+def find_duplicate(documents: list[dict], name: str, uploaded_file_hash: str | None = None, digest: str | None = None) -> dict | None:
+    """같은 파일 또는 같은 내용이 다른 이름으로 이미 저장되어 있으면 그 문서 메타데이터 반환"""
+    for doc in documents:
+        if doc["name"] == name:
+            continue
+        if uploaded_file_hash and doc.get("file_hash") == uploaded_file_hash:
+            return doc
+        if digest and doc.get("hash") == digest:
+            return doc
+    return None
+
+
+class _BatchWriter:
+    """BATCH_LIMIT 작업마다 자동으로 커밋하는 WriteBatch 래퍼"""
+
+    def __init__(self, db):
+        self.db = db
+        self._batch = db.batch()
+        self._ops = 0
+
+    def set(self, ref, data: dict):
+        self._batch.set(ref, data)
+        self._count()
+
+    def delete(self, ref):
+        self._batch.delete(ref)
+        self._count()
+
+    def _count(self):
+        self._ops += 1
+        if self._ops >= BATCH_LIMIT:
+            self.commit()
+
+    def commit(self):
+        if self._ops:
+            self._batch.commit()
+        self._batch = self.db.batch()
+        self._ops = 0
+
+
+def split_for_storage(content: str, pages: list[str] | None = None) -> list[dict]:
+    """본문을 저장용 청크({"text", "page"})로 분할 (빈 페이지 제외)"""
+    if pages is None:
+        pieces = [(None, content)]
+    else:
+        pieces = [(number, text) for number, text in enumerate(pages, 1) if text]
+    chunks = []
+    for page, text in pieces:
+        for start in range(0, len(text), STORAGE_CHUNK_CHARS):
+            chunks.append({"text": text[start:start + STORAGE_CHUNK_CHARS], "page": page})
+    return chunks
+
+
+def retrieval_chunks(stored_chunks: list[dict]) -> list[dict]:
+    """저장용 청크를 검색 인덱스용 청크로 분할 (페이지 번호 유지)"""
+    return [
+        {"text": text, "page": chunk.get("page")}
+        for chunk in stored_chunks
+        for text in chunk_text(chunk["text"])
+    ]
+
+
+def save_document(db, name: str, content: str, pages: list[str] | None = None, uploaded_file_hash: str | None = None) -> dict:
+    """규정 문서를 메타데이터 + 청크 하위 문서로 저장 (변경된 청크만 다시 씀)
+
+    새 청크를 모두 쓴 뒤 메타데이터를 쓰고, 참조가 끊긴 청크는 그 다음에 지워서
+    읽는 쪽이 (저장 중이거나 중간에 실패해도) 빠진 청크가 있는 문서를 보지 않게 합니다.
+    반환값: {"changed", "written_chunks", "deleted_chunks", "articles"(조항별 변경 요약)}
+    """
+    chunks = split_for_storage(content, pages)
+    digest = content_hash(content)
+
+    doc_ref = db.collection(DOCUMENTS_COLLECTION).document(name)
+    chunks_ref = doc_ref.collection(CHUNKS_COLLECTION)
+
+    snapshot = doc_ref.get()
+    old = (snapshot.to_dict() or {}) if snapshot.exists else {}
+    old_articles = old.get("article_hashes")
+    if old_articles is None and old.get("content"):
+        # 이전 형식 문서는 본문에서 조항 해시 계산
+        old_articles = article_hashes(old["content"])
+    new_articles = article_hashes(content)
+    summary = {
+        "changed": False,
+        "written_chunks": 0,
+        "deleted_chunks": 0,
+        "articles": diff_articles(old_articles or {}, new_articles),
+    }
+
+    # 같은 내용이 이미 청크 형식으로 저장되어 있으면 건너뜀
+    if old.get("hash") == digest and old.get("chunk_count") is not None and old.get("active", True):
+        return summary
+
+    existing = {c.id for c in chunks_ref.select([]).stream()}
+    writer = _BatchWriter(db)
+
+    order = []
+    for chunk in chunks:
+        chunk_id = _chunk_id(chunk)
+        order.append({"id": chunk_id, "page": chunk.get("page")})
+        if chunk_id in existing:
+            continue
+        # 같은 내용의 청크가 여러 번 나오면 한 번만 씀
+        existing.add(chunk_id)
+        writer.set(chunks_ref.document(chunk_id), {"text": chunk["text"]})
+        summary["written_chunks"] += 1
+    writer.commit()
+
+    doc_ref.set({
+        "name": name,
+        "hash": digest,
+        "file_hash": uploaded_file_hash,
+        "page_count": len(pages) if pages is not None else None,
+        "size": len(content.encode("utf-8")),
+        "chunk_count": len(chunks),
+        "chunks": order,
+        "preview": content[:PREVIEW_CHARS],
+        "article_hashes": new_articles,
+        "uploaded_at": datetime.now(),
+        "active": True,
+    })
+    summary["changed"] = True
+
+    # 새 메타데이터가 반영된 뒤에 더 이상 참조하지 않는 청크 삭제 (이전 형식의 위치 기반 청크 포함)
+    # 중간에 실패해도 남는 것은 참조되지 않는 청크뿐이고, 다음 저장 때 다시 지움
+    referenced = {entry["id"] for entry in order}
+    for chunk_id in existing - referenced:
+        writer.delete(chunks_ref.document(chunk_id))
+        summary["deleted_chunks"] += 1
+    writer.commit()
+    return summary
+
+
+def list_documents(db) -> list[dict]:
+    """활성화된 문서의 메타데이터 목록 (본문은 읽지 않음)"""
+    docs = (
+        db.collection(DOCUMENTS_COLLECTION)
+        .where("active", "==", True)
+        .select(METADATA_FIELDS)
+        .stream()
+    )
+    documents = []
+    for doc in docs:
+        data = doc.to_dict()
+        documents.append({
+            "name": data.get("name", doc.id),
+            "hash": data.get("hash"),
+            "file_hash": data.get("file_hash"),
+            "page_count": data.get("page_count"),
+            "size": data.get("size"),
+            "chunk_count": data.get("chunk_count"),
+            "preview": data.get("preview", ""),
+            "uploaded_at": data.get("uploaded_at", ""),
+        })
+    return sorted(documents, key=lambda d: d["name"])
+
+
+def load_document_chunks(db, name: str) -> list[dict]:
+    """문서의 저장용 청크({"text", "page"}) 목록 로드 (메타데이터의 chunks 순서대로)
+
+    위치 기반 청크 ID를 쓰던 이전 형식과 청크 하위 문서가 없는 형식
+    (본문이 content 필드에 있는 문서)도 읽을 수 있습니다.
+    """
+    doc_ref = db.collection(DOCUMENTS_COLLECTION).document(name)
+    snapshot = doc_ref.get()
+    data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+    chunks_ref = doc_ref.collection(CHUNKS_COLLECTION)
+
+    order = data.get("chunks")
+    if order is not None:
+        texts = {c.id: (c.to_dict() or {}).get("text", "") for c in chunks_ref.stream()}
+        return [{"text": texts.get(entry["id"], ""), "page": entry.get("page")} for entry in order]
+
+    chunks = [
+        {"text": chunk["text"], "page": chunk.get("page")}
+        for chunk in (c.to_dict() for c in chunks_ref.order_by("index").stream())
+    ]
+    if chunks:
+        return chunks
+    return split_for_storage(data.get("content", ""))
+
+
+def join_chunks(chunks: list[dict]) -> str:
+    """저장용 청크를 이어 붙여 본문 복원"""
+    parts = []
+    previous_page = None
+    for i, chunk in enumerate(chunks):
+        # 한 페이지가 여러 청크로 나뉜 경우에는 구분자 없이 이어 붙임
+        if i and chunk["page"] != previous_page:
+            parts.append("\n")
+        parts.append(chunk["text"])
+        previous_page = chunk["page"]
+    return "".join(parts)
+
+
+def load_document_content(db, name: str) -> str:
+    """문서 전체 본문 로드"""
+    return join_chunks(load_document_chunks(db, name))
+
+
+def delete_document(db, name: str):
+    """문서 메타데이터와 청크 하위 문서 삭제"""
+    doc_ref = db.collection(DOCUMENTS_COLLECTION).document(name)
+    writer = _BatchWriter(db)
+    for chunk in doc_ref.collection(CHUNKS_COLLECTION).stream():
+        writer.delete(chunk.reference)
+    writer.delete(doc_ref)
+    writer.commit()
@@ -0,0 +1,480 @@
+"""로컬 대체 백엔드 (벤치마크/부하 테스트용)
+
+- InMemoryFirestore: 앱이 사용하는 Firestore API 일부를 메모리에서 흉내 내고 작업 수를 셉니다.
+- FakeOpenAIServer: OpenAI Chat Completions 스트리밍(SSE)을 흉내 내는 로컬 HTTP 서버로,
+  첫 토큰까지의 시간(TTFT)과 초당 토큰 수를 설정할 수 있습니다.
+"""
+
+import copy
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Firestore ---
+
+_OPERATORS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "in": lambda a, b: a in b,
+}
+
+
+class FirestoreOpCounter:
+    """Firestore 작업 수 (문서 읽기/쓰기/삭제, 쿼리 수)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.writes = 0
+        self.deletes = 0
+        self.queries = 0
+
+    def add(self, name: str, n: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"reads": self.reads, "writes": self.writes, "deletes": self.deletes, "queries": self.queries}
+
+
+class FakeDocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field: str):
+        return (self._data or {}).get(field)
+
+
+class FakeDocumentReference:
+    def __init__(self, db, path: tuple):
+        self._db = db
+        self.path = path
+        self.id = path[-1]
+
+    def collection(self, name: str):
+        return FakeCollectionReference(self._db, self.path + (name,))
+
+    def set(self, data: dict, merge: bool = False):
+        self._db._set(self.path, data, merge)
+
+    def update(self, data: dict):
+        self._db._set(self.path, data, merge=True)
+
+    def get(self):
+        self._db.ops.add("reads")
+        return FakeDocumentSnapshot(self, self._db._get(self.path))
+
+    def delete(self):
+        self._db._delete(self.path)
+
+
+class FakeQuery:
+    def __init__(self, db, path: tuple, filters=(), orders=(), limit_count=None, fields=None, cursor=None):
+        self._db = db
+        self._path = path
+        self._filters = list(filters)
+        self._orders = list(orders)
+        self._limit = limit_count
+        self._fields = fields
+        self._cursor = cursor
+
+    def _copy(self, **changes):
+        values = {
+            "filters": self._filters,
+            "orders": self._orders,
+            "limit_count": self._limit,
+            "fields": self._fields,
+            "cursor": self._cursor,
+        }
+        values.update(changes)
+        return FakeQuery(self._db, self._path, **values)
+
+    def where(self, field: str = None, op: str = None, value=None, filter=None):
+        if filter is not None:
+            field, op, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=self._filters + [(field, op, value)])
+
+    def order_by(self, field: str, direction: str = "ASCENDING"):
+        return self._copy(orders=self._orders + [(field, direction)])
+
+    def limit(self, count: int):
+        return self._copy(limit_count=count)
+
+    def select(self, fields):
+        return self._copy(fields=list(fields))
+
+    def start_after(self, values):
+        return self._copy(cursor=values)
+
+    def _matches(self):
+        rows = []
+        for path, data in self._db._children(self._path):
+            if all(_OPERATORS[op](data.get(field), value) for field, op, value in self._filters):
+                rows.append((path, data))
+        for field, direction in reversed(self._orders):
+            rows = [row for row in rows if field in row[1]]
+            rows.sort(key=lambda row: row[1][field], reverse=direction == "DESCENDING")
+        if self._cursor is not None and self._orders:
+            cursor = self._cursor.to_dict() if hasattr(self._cursor, "to_dict") else self._cursor
+            field, direction = self._orders[0]
+            value = cursor[field] if isinstance(cursor, dict) else cursor
+            after = (lambda v: v < value) if direction == "DESCENDING" else (lambda v: v > value)
+            rows = [row for row in rows if after(row[1][field])]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return rows
+
+    def stream(self):
+        self._db.ops.add("queries")
+        rows = self._matches()
+        self._db.ops.add("reads", max(len(rows), 1))
+        for path, data in rows:
+            if self._fields is not None:
+                data = {field: data[field] for field in self._fields if field in data}
+            yield FakeDocumentSnapshot(FakeDocumentReference(self._db, path), copy.deepcopy(data))
+
+    def get(self):
+        return list(self.stream())
+
+    def count(self):
+        return FakeAggregationQuery(self)
+
+    def on_snapshot(self, callback):
+        return self._db._watch(self, callback)
+
+
+class FakeAggregationQuery:
+    def __init__(self, query: FakeQuery):
+        self._query = query
+
+    def get(self):
+        self._query._db.ops.add("queries")
+        # 집계 쿼리는 문서 1000개당 읽기 1회로 과금됨
+        count = len(self._query._matches())
+        self._query._db.ops.add("reads", count // 1000 + 1)
+        return [[type("AggregationResult", (), {"alias": "count", "value": count})()]]
+
+
+class FakeCollectionReference(FakeQuery):
+    def __init__(self, db, path: tuple):
+        super().__init__(db, path)
+        self.id = path[-1]
+
+    def document(self, doc_id: str | None = None):
+        return FakeDocumentReference(self._db, self._path + (doc_id or uuid.uuid4().hex[:20],))
+
+    def add(self, data: dict):
+        ref = self.document()
+        ref.set(data)
+        return datetime.now(), ref
+
+
+class FakeWriteBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def set(self, reference, data: dict, merge: bool = False):
+        self._ops.append(("set", reference.path, data, merge))
+
+    def update(self, reference, data: dict):
+        self._ops.append(("set", reference.path, data, True))
+
+    def delete(self, reference):
+        self._ops.append(("delete", reference.path, None, False))
+
+    def commit(self):
+        if len(self._ops) > 500:
+            raise ValueError("A write batch can contain at most 500 operations.")
+        for kind, path, data, merge in self._ops:
+            if kind == "set":
+                self._db._set(path, data, merge)
+            else:
+                self._db._delete(path)
+        self._ops = []
+
+
+class _FakeWatch:
+    def __init__(self, db, entry):
+        self._db = db
+        self._entry = entry
+
+    def unsubscribe(self):
+        with self._db._lock:
+            if self._entry in self._db._watches:
+                self._db._watches.remove(self._entry)
+
+
+class InMemoryFirestore:
+    """메모리 기반 Firestore 클라이언트 (앱에서 사용하는 API만 지원)"""
+
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.ops = FirestoreOpCounter()
+        self._lock = threading.RLock()
+        self._docs = {}  # path tuple -> data
+        self._watches = []  # (collection path, callback)
+
+    def collection(self, name: str):
+        return FakeCollectionReference(self, (name,))
+
+    def batch(self):
+        return FakeWriteBatch(self)
+
+    # --- 내부 저장소 ---
+
+    def _delay(self):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    def _set(self, path: tuple, data: dict, merge: bool = False):
+        self._delay()
+        self.ops.add("writes")
+        with self._lock:
+            current = self._docs.get(path) if merge else None
+            new = dict(current or {})
+            for key, value in data.items():
+                if isinstance(value, FakeIncrement):
+                    new[key] = (new.get(key) or 0) + value.value
+                elif isinstance(value, FakeArrayUnion):
+                    existing = list(new.get(key) or [])
+                    new[key] = existing + [v for v in value.values if v not in existing]
+                elif isinstance(value, FakeArrayRemove):
+                    new[key] = [v for v in new.get(key) or [] if v not in value.values]
+                else:
+                    new[key] = copy.deepcopy(value)
+            self._docs[path] = new
+        self._notify(path)
+
+    def _get(self, path: tuple):
+        self._delay()
+        with self._lock:
+            return copy.deepcopy(self._docs.get(path))
+
+    def _delete(self, path: tuple):
+        self._delay()
+        self.ops.add("deletes")
+        with self._lock:
+            self._docs.pop(path, None)
+        self._notify(path)
+
+    def _children(self, collection_path: tuple):
+        self._delay()
+        depth = len(collection_path) + 1
+        with self._lock:
+            return [
+                (path, data) for path, data in self._docs.items()
+                if len(path) == depth and path[:-1] == collection_path
+            ]
+
+    def _watch(self, query: FakeQuery, callback):
+        entry = (query._path, callback)
+        with self._lock:
+            self._watches.append(entry)
+        callback(list(query.stream()), [], datetime.now())
+        return _FakeWatch(self, entry)
+
+    def _notify(self, path: tuple):
+        with self._lock:
+            callbacks = [callback for collection_path, callback in self._watches if path[:-1] == collection_path]
+        for callback in callbacks:
+            callback([], [path], datetime.now())
+
+
+class FakeIncrement:
+    """firestore.Increment 대체"""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeArrayUnion:
+    """firestore.ArrayUnion 대체"""
+
+    def __init__(self, values):
+        self.values = list(values)
+
+
+class FakeArrayRemove:
+    """firestore.ArrayRemove 대체"""
+
+    def __init__(self, values):
+        self.values = list(values)
+
+
+# --- OpenAI ---
+
+FAKE_ANSWER = (
+    "육아휴직 신청 시에는 육아휴직 신청서와 자녀 주민등록번호 뒷자리가 포함된 가족관계증명서를 "
+    "제출해 주세요. 인사규정 제25조에 따라 신청서는 휴직개시예정일 30일 전까지 제출해야 합니다. "
+    "추가로 궁금한 사항이 있으신가요? "
+)
+
+
+class FakeOpenAIServer:
+    """OpenAI Chat Completions API를 흉내 내는 로컬 HTTP 서버
+
+    ttft_seconds 후 첫 토큰을 보내고 이후 tokens_per_second 속도로 completion_tokens개를 스트리밍합니다.
+    error_rate 비율로 429 또는 503 응답을 돌려줍니다.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ttft_seconds: float = 0.3,
+        tokens_per_second: float = 80.0,
+        completion_tokens: int = 120,
+        error_rate: float = 0.0,
+    ):
+        self.ttft_seconds = ttft_seconds
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._prefixes = set()  # 이전 요청들의 메시지 앞부분 해시
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _cached_prefix(self, messages: list[dict]) -> int:
+        """이전 요청과 메시지 단위로 일치하는 앞부분 길이 (OpenAI처럼 1024 이상, 128 단위만 캐시)"""
+        digest = hashlib.sha256()
+        matched = 0
+        length = 0
+        with self._lock:
+            for message in messages:
+                digest.update(json.dumps(message, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+                length += len(message.get("content") or "")
+                key = digest.hexdigest()
+                if key in self._prefixes:
+                    matched = length
+                else:
+                    self._prefixes.add(key)
+        return matched // 128 * 128 if matched >= 1024 else 0
+
+    def _tokens(self):
+        pieces = itertools.cycle(FAKE_ANSWER.split(" "))
+        return [next(pieces) + " " for _ in range(self.completion_tokens)]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _json(self, status: int, body: dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                    failed = random.random() < server.error_rate
+                    if failed:
+                        server.errors += 1
+                if failed:
+                    status = random.choice([429, 503])
+                    self._json(status, {"error": {"message": "fake upstream error", "type": "rate_limit_error" if status == 429 else "server_error"}})
+                    return
+
+                prompt_chars = sum(len(m.get("content") or "") for m in request.get("messages", []))
+                usage = {
+                    "prompt_tokens": prompt_chars,
+                    "completion_tokens": server.completion_tokens,
+                    "total_tokens": prompt_chars + server.completion_tokens,
+                    "prompt_tokens_details": {"cached_tokens": server._cached_prefix(request.get("messages", []))},
+                }
+                base = {
+                    "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                    "created": int(time.time()),
+                    "model": request.get("model", "gpt-4o-mini"),
+                }
+                tokens = server._tokens()
+
+                if not request.get("stream"):
+                    time.sleep(server.ttft_seconds)
+                    self._json(200, {
+                        **base,
+                        "object": "chat.completion",
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop"}],
+                        "usage": usage,
+                    })
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+
+                def send(payload):
+                    self.wfile.write(f"data: {payload}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+
+                def chunk(delta: dict, finish_reason=None):
+                    return json.dumps({
+                        **base,
+                        "object": "chat.completion.chunk",
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                    }, ensure_ascii=False)
+
+                time.sleep(server.ttft_seconds)
+                send(chunk({"role": "assistant", "content": ""}))
+                interval = 1.0 / server.tokens_per_second if server.tokens_per_second else 0
+                for token in tokens:
+                    send(chunk({"content": token}))
+                    if interval:
+                        time.sleep(interval)
+                send(chunk({}, "stop"))
+                if (request.get("stream_options") or {}).get("include_usage"):
+                    send(json.dumps({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage}))
+                send("[DONE]")
+                self.close_connection = True
+
+        return Handler
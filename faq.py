@@ -0,0 +1,46 @@
+"""사이드바 FAQ 목록
+
+기본 FAQ 뒤에 관리자가 검색 이력 분석 결과에서 채택한 질문을 붙입니다.
+채택한 질문은 Firestore settings/faq 문서의 questions 배열에 저장합니다.
+추가/삭제는 ArrayUnion/ArrayRemove로 서버에서 처리해 여러 관리자가 동시에 바꿔도 덮어쓰지 않습니다.
+"""
+
+from backends import firestore_array_remove, firestore_array_union
+
+SETTINGS_COLLECTION = "settings"
+FAQ_DOCUMENT = "faq"
+
+DEFAULT_FAQ_QUESTIONS = [
+    "4대보험 피부양자 등록을 하려면 어떤 서류를 제출해야 하나요?",
+    "육아휴직 신청 시 제출해야 할 서류는 무엇인가요?",
+    "육아휴직 1년 사용 후 6개월 연장 시 필요한 서류는 무엇인가요?",
+    "육아휴직 급여를 얼마나 받을 수 있나요?",
+    "출산휴가 후 육아휴직 바로 전환하려면 어떻게 하나요?",
+]
+
+
+def _faq_ref(db):
+    return db.collection(SETTINGS_COLLECTION).document(FAQ_DOCUMENT)
+
+
+def load_added_questions(db) -> list[str]:
+    """관리자가 채택한 FAQ 질문"""
+    snapshot = _faq_ref(db).get()
+    return list((snapshot.to_dict() or {}).get("questions", [])) if snapshot.exists else []
+
+
+def load_faq_questions(db) -> list[str]:
+    """기본 FAQ + 채택한 FAQ"""
+    added = [q for q in load_added_questions(db) if q not in DEFAULT_FAQ_QUESTIONS]
+    return DEFAULT_FAQ_QUESTIONS + added
+
+
+def add_faq_question(db, question: str):
+    """FAQ 질문 채택 (이미 있으면 무시)"""
+    if question not in DEFAULT_FAQ_QUESTIONS:
+        _faq_ref(db).set({"questions": firestore_array_union([question])}, merge=True)
+
+
+def remove_faq_question(db, question: str):
+    """채택한 FAQ 질문 삭제 (기본 FAQ는 삭제할 수 없음)"""
+    _faq_ref(db).set({"questions": firestore_array_remove([question])}, merge=True)
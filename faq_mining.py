@@ -0,0 +1,176 @@
+"""검색 이력에서 자주 묻는 질문 찾기 (FAQ 제안)
+
+chat_logs를 페이지 단위로 훑으며 질문을 정규화해 같은 질문끼리 먼저 합치고,
+남은 고유 질문들을 n-gram 해시 벡터로 바꿔 유사도가 기준 이상인 질문끼리 묶습니다.
+묶음(클러스터)은 질문 수 순으로 정렬하고, 기존 FAQ와 겹치지 않는 것을 FAQ 후보로 제안합니다.
+
+관리자 화면 외에 명령줄에서도 실행할 수 있습니다 (.streamlit/secrets.toml 사용).
+
+    python faq_mining.py --since 2026-07-01 --top 10 -o faq_suggestions.json
+"""
+
+import argparse
+import json
+from collections import Counter
+
+import numpy as np
+
+from semantic_cache import embed_question, question_numbers, question_words
+
+# 고유 질문이 많아도 메모리를 적게 쓰도록 캐시보다 작은 벡터 차원 사용
+MINING_VECTOR_DIM = 1024
+# 클러스터 기준으로 삼을 최대 고유 질문 수와 한 번에 벡터로 바꿔 비교할 나머지 질문 수
+MAX_SEEDS = 2000
+CANDIDATE_BLOCK = 1024
+
+
+def collect_questions(logs) -> dict:
+    """로그를 한 건씩 읽어 정규화한 질문별 {"count", "faq", "variants": Counter} 집계
+
+    메모리는 로그 수가 아니라 고유 질문 수에 비례합니다.
+    """
+    questions = {}
+    for log in logs:
+        query = (log.get("query") or "").strip()
+        key = " ".join(question_words(query))
+        if not key:
+            continue
+        entry = questions.setdefault(key, {"count": 0, "faq": 0, "variants": Counter()})
+        entry["count"] += 1
+        entry["faq"] += 1 if log.get("source") == "faq" else 0
+        entry["variants"][query] += 1
+    return questions
+
+
+def cluster_questions(questions: dict, threshold: float = 0.85, max_seeds: int = MAX_SEEDS) -> list[dict]:
+    """유사한 질문끼리 묶어 질문 수 순으로 정렬한 클러스터 목록
+
+    빈도 상위 max_seeds개 질문을 기준(seed) 후보로 삼아, 많이 나온 기준부터 유사도가
+    threshold 이상인 질문을 묶습니다. 숫자가 다른 질문("1년", "3년")은 묶지 않습니다.
+    기준이 아닌 질문은 CANDIDATE_BLOCK개씩 벡터로 바꿔 기준들과 한 번에 비교하고 버리므로,
+    벡터 메모리는 고유 질문 수와 무관합니다. 어느 기준에도 묶이지 않은 질문은 버립니다.
+    """
+    keys = sorted(questions, key=lambda k: questions[k]["count"], reverse=True)
+    if not keys:
+        return []
+    representatives = [questions[k]["variants"].most_common(1)[0][0] for k in keys]
+
+    # 기준 후보끼리 먼저 묶음 (앞선 기준에 묶인 후보는 기준이 되지 않음)
+    seed_count = min(len(keys), max_seeds)
+    seed_vectors = np.stack([embed_question(text, MINING_VECTOR_DIM) for text in representatives[:seed_count]])
+    number_keys = {}
+    seed_numbers = np.array([number_keys.setdefault(question_numbers(text), len(number_keys)) for text in representatives[:seed_count]])
+    owner = np.full(len(keys), -1)
+    seed_scores = seed_vectors @ seed_vectors.T
+    for seed in range(seed_count):
+        if owner[seed] >= 0:
+            continue
+        mask = (owner[:seed_count] < 0) & (seed_scores[seed] >= threshold) & (seed_numbers == seed_numbers[seed])
+        owner[:seed_count][mask] = seed
+        owner[seed] = seed
+
+    # 나머지 질문은 블록 단위로 가장 많이 나온 기준에 붙임
+    seeds = np.flatnonzero(owner[:seed_count] == np.arange(seed_count))
+    for block_start in range(seed_count, len(keys), CANDIDATE_BLOCK):
+        block = representatives[block_start:block_start + CANDIDATE_BLOCK]
+        vectors = np.stack([embed_question(text, MINING_VECTOR_DIM) for text in block])
+        numbers = np.array([number_keys.get(question_numbers(text), -1) for text in block])
+        matches = (vectors @ seed_vectors[seeds].T >= threshold) & (numbers[:, np.newaxis] == seed_numbers[seeds][np.newaxis, :])
+        matched = matches.any(axis=1)
+        owner[block_start:block_start + len(block)][matched] = seeds[matches.argmax(axis=1)[matched]]
+
+    clusters = {}
+    for index in np.flatnonzero(owner >= 0):
+        question = questions[keys[index]]
+        cluster = clusters.setdefault(int(owner[index]), {"count": 0, "faq": 0, "variants": Counter()})
+        cluster["count"] += question["count"]
+        cluster["faq"] += question["faq"]
+        cluster["variants"].update(question["variants"])
+    return sorted(
+        (
+            {
+                "question": representatives[seed],
+                "count": cluster["count"],
+                "faq_share": cluster["faq"] / cluster["count"] if cluster["count"] else 0.0,
+                "variants": [text for text, _ in cluster["variants"].most_common(5)],
+            }
+            for seed, cluster in clusters.items()
+        ),
+        key=lambda c: c["count"],
+        reverse=True,
+    )
+
+
+def suggest_faqs(clusters: list[dict], existing: list[str], top_n: int = 10, min_count: int = 3, threshold: float = 0.85) -> list[dict]:
+    """기존 FAQ와 겹치지 않고 min_count번 이상 나온 클러스터 상위 top_n개"""
+    existing_vectors = [embed_question(text, MINING_VECTOR_DIM) for text in existing]
+    suggestions = []
+    for cluster in clusters:
+        if cluster["count"] < min_count:
+            break
+        vector = embed_question(cluster["question"], MINING_VECTOR_DIM)
+        if any(float(vector @ other) >= threshold for other in existing_vectors):
+            continue
+        suggestions.append(cluster)
+        if len(suggestions) >= top_n:
+            break
+    return suggestions
+
+
+def mine_faqs(logs, existing: list[str], top_n: int = 10, min_count: int = 3, threshold: float = 0.85) -> dict:
+    """로그에서 FAQ 후보 찾기
+
+    {"logs", "unique_questions", "clusters": 상위 클러스터, "suggestions": FAQ 후보}
+    """
+    total = 0
+
+    def counted(logs):
+        nonlocal total
+        for log in logs:
+            total += 1
+            yield log
+
+    questions = collect_questions(counted(logs))
+    clusters = cluster_questions(questions, threshold)
+    return {
+        "logs": total,
+        "unique_questions": len(questions),
+        "clusters": clusters[:max(top_n * 3, 30)],
+        "suggestions": suggest_faqs(clusters, existing, top_n, min_count, threshold),
+    }
+
+
+def main():
+    from log_export import parse_date
+
+    parser = argparse.ArgumentParser(description="검색 이력에서 FAQ 후보 찾기")
+    parser.add_argument("--since", type=parse_date, help="이 날짜 이후 로그만 (YYYY-MM-DD)")
+    parser.add_argument("--top", type=int, default=10, help="제안할 FAQ 수")
+    parser.add_argument("--min-count", type=int, default=3, help="제안할 최소 질문 수")
+    parser.add_argument("--threshold", type=float, default=0.85, help="같은 질문으로 볼 유사도")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일")
+    args = parser.parse_args()
+
+    import streamlit as st
+    from backends import create_firestore_client
+    from faq import load_faq_questions
+    from log_store import iter_logs
+
+    db = create_firestore_client(st.secrets)
+    result = mine_faqs(
+        iter_logs(db, start=args.since),
+        load_faq_questions(db),
+        top_n=args.top,
+        min_count=args.min_count,
+        threshold=args.threshold,
+    )
+    print(f"로그 {result['logs']:,}건 · 고유 질문 {result['unique_questions']:,}개")
+    for rank, suggestion in enumerate(result["suggestions"], 1):
+        print(f"{rank:>2}. ({suggestion['count']:,}회) {suggestion['question']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""대화 히스토리 토큰 예산 관리
+
+최근 대화는 토큰 예산 안에서 원문 그대로 보내고, 예산을 벗어난 이전 대화는
+누적 요약으로 압축합니다. 요약은 새로 창 밖으로 밀려난 대화가 있을 때만 다시 만듭니다.
+"""
+
+from tokens import count_tokens
+
+# 메시지마다 붙는 역할/구분자 토큰 (대략치)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def message_tokens(message: dict) -> int:
+    """메시지 하나의 토큰 수"""
+    return count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def split_history(messages: list[dict], token_budget: int) -> tuple[list[dict], list[dict]]:
+    """(예산 밖의 이전 대화, 예산 안의 최근 대화)로 분리
+
+    마지막 메시지(현재 질문)는 예산과 관계없이 항상 최근 대화에 포함합니다.
+    """
+    used = 0
+    start = len(messages)
+    for i in range(len(messages) - 1, -1, -1):
+        tokens = message_tokens(messages[i])
+        if start < len(messages) and used + tokens > token_budget:
+            break
+        used += tokens
+        start = i
+    return messages[:start], messages[start:]
+
+
+def build_history(messages: list[dict], token_budget: int, state: dict, summarize) -> list[dict]:
+    """API로 보낼 대화 히스토리 생성
+
+    state는 세션별 요약 상태({"summary": str, "covered": int})이며 이 함수가 갱신합니다.
+    summarize(previous_summary, new_messages)는 새 요약 문자열을 반환해야 합니다.
+    """
+    older, recent = split_history(messages, token_budget)
+
+    # 대화가 초기화되었으면 요약도 초기화
+    if state.get("covered", 0) > len(messages):
+        state.clear()
+
+    covered = state.get("covered", 0)
+    if len(older) > covered:
+        state["summary"] = summarize(state.get("summary", ""), older[covered:])
+        state["covered"] = len(older)
+
+    if not state.get("summary") or not older:
+        return recent
+    summary_message = {
+        "role": "system",
+        "content": f"이전 대화 요약:\n{state['summary']}",
+    }
+    return [summary_message] + recent
@@ -0,0 +1,198 @@
+"""채팅 로그 전체 내보내기 (JSONL / CSV / Parquet)
+
+chat_logs 컬렉션을 페이지 단위로 읽으면서 파일에 바로 써서,
+로그가 몇 달 치 쌓여도 메모리에는 한 페이지(Parquet은 한 row group)만 둡니다.
+Parquet은 pyarrow가 설치되어 있을 때만 사용할 수 있습니다.
+
+관리자 화면 외에 명령줄에서도 실행할 수 있습니다 (.streamlit/secrets.toml 사용).
+
+    python log_export.py --format csv --since 2026-01-01 --until 2026-06-30 -o chat_logs.csv
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from log_store import count_logs, iter_logs
+
+# 형식 -> (MIME 타입, 확장자)
+EXPORT_FORMATS = {
+    "jsonl": ("application/jsonl", ".jsonl"),
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+EXPORT_FIELDS = ["id", "timestamp", "source", "query", "response", "metrics"]
+
+# 한 번에 읽는 로그 수 (Parquet row group 크기)
+EXPORT_PAGE_SIZE = 500
+
+# 관리자 화면 내보내기용 임시 파일 이름 접두어와 보관 시간
+EXPORT_TEMP_PREFIX = "chat_logs_"
+EXPORT_TEMP_MAX_AGE = 60 * 60
+
+
+def parquet_available() -> bool:
+    """pyarrow 설치 여부"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def available_formats() -> list[str]:
+    """현재 환경에서 쓸 수 있는 내보내기 형식"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or parquet_available()]
+
+
+def _timestamp(value):
+    """Firestore timestamp(UTC) -> UTC 기준 naive datetime"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _flat_row(log: dict) -> dict:
+    """CSV/Parquet용 행 (metrics는 JSON 문자열)"""
+    metrics = log.get("metrics")
+    return {
+        "id": log.get("id"),
+        "timestamp": _timestamp(log.get("timestamp")),
+        "source": log.get("source", "chat"),
+        "query": log.get("query", ""),
+        "response": log.get("response", ""),
+        "metrics": json.dumps(metrics, ensure_ascii=False) if metrics else None,
+    }
+
+
+def _write_jsonl(f, logs, on_row):
+    for log in logs:
+        row = {field: log[field] for field in EXPORT_FIELDS if field in log}
+        if isinstance(row.get("timestamp"), datetime):
+            row["timestamp"] = _timestamp(row["timestamp"]).isoformat()
+        f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        on_row()
+
+
+def _write_csv(f, logs, on_row):
+    writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for log in logs:
+        row = _flat_row(log)
+        if isinstance(row["timestamp"], datetime):
+            row["timestamp"] = row["timestamp"].isoformat()
+        writer.writerow(row)
+        on_row()
+
+
+def _write_parquet(path, logs, on_row):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("timestamp", pa.timestamp("us")),
+        ("source", pa.string()),
+        ("query", pa.string()),
+        ("response", pa.string()),
+        ("metrics", pa.string()),
+    ])
+    with pq.ParquetWriter(path, schema) as writer:
+        rows = []
+        for log in logs:
+            rows.append(_flat_row(log))
+            on_row()
+            if len(rows) >= EXPORT_PAGE_SIZE:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                rows = []
+        if rows:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+
+
+def export_logs(db, fmt: str, path: str, start=None, end=None, progress_callback=None) -> int:
+    """[start, end) 범위의 로그를 fmt 형식으로 path에 쓰고 내보낸 건수 반환
+
+    progress_callback(done, total)은 100건마다와 끝났을 때 호출됩니다.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    total = count_logs(db, start, end) if progress_callback else 0
+    done = 0
+
+    def on_row():
+        nonlocal done
+        done += 1
+        if progress_callback and done % 100 == 0:
+            progress_callback(done, total)
+
+    logs = iter_logs(db, start, end, page_size=EXPORT_PAGE_SIZE)
+    if fmt == "parquet":
+        _write_parquet(path, logs, on_row)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if fmt == "csv":
+                _write_csv(f, logs, on_row)
+            else:
+                _write_jsonl(f, logs, on_row)
+
+    if progress_callback:
+        progress_callback(done, max(total, done))
+    return done
+
+
+def create_export_file(fmt: str, directory: str | None = None) -> str:
+    """내보내기용 임시 파일 생성 (요청마다 다른 이름)"""
+    fd, path = tempfile.mkstemp(prefix=EXPORT_TEMP_PREFIX, suffix=EXPORT_FORMATS[fmt][1], dir=directory)
+    os.close(fd)
+    return path
+
+
+def remove_stale_exports(directory: str | None = None, max_age: float = EXPORT_TEMP_MAX_AGE) -> int:
+    """중단된 내보내기가 남긴 오래된 임시 파일 삭제. 삭제한 파일 수 반환"""
+    directory = directory or tempfile.gettempdir()
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in glob.glob(os.path.join(directory, f"{EXPORT_TEMP_PREFIX}*")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            # 다른 프로세스가 먼저 지운 파일
+            continue
+    return removed
+
+
+def parse_date(value: str):
+    """명령줄 날짜 인자 (YYYY-MM-DD) 변환"""
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="chat_logs 전체 내보내기")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="jsonl")
+    parser.add_argument("--since", type=parse_date, help="시작일 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--until", type=parse_date, help="종료일 (YYYY-MM-DD, 포함)")
+    parser.add_argument("-o", "--output", help="출력 파일 (기본값: chat_logs.<형식>)")
+    args = parser.parse_args()
+
+    import streamlit as st
+    from backends import create_firestore_client
+
+    db = create_firestore_client(st.secrets)
+    end = args.until + timedelta(days=1) if args.until else None
+    output = args.output or f"chat_logs{EXPORT_FORMATS[args.format][1]}"
+    count = export_logs(
+        db, args.format, output, args.since, end,
+        progress_callback=lambda done, total: print(f"\r{done:,} / {total:,}", end="", flush=True),
+    )
+    print(f"\n{count:,}건을 {output}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
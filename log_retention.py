@@ -0,0 +1,211 @@
+"""채팅 로그 보존 기간 정책
+
+기준 시각(cutoff)보다 오래된 Firestore 로그를 timestamp 순으로 한 페이지씩 조회해
+최대 500건씩 WriteBatch로 삭제합니다. 같은 기준으로 일별 롤업 문서와
+회전된 로컬 백업 파일도 지웁니다. (전체 삭제일 때는 오늘 롤업과 질문별 누적 롤업도 지움)
+
+작업은 백그라운드 스레드에서 돌고 진행 상황을 상태 파일에 남기므로, 중간에 프로세스가
+재시작되어도 다음 실행에서 같은 기준 시각으로 이어서 삭제합니다.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+from log_store import DAILY_COLLECTION, LOGS_COLLECTION, QUESTIONS_COLLECTION
+from log_writer import FIRESTORE_BATCH_LIMIT, LEGACY_LOG_FILE, LOG_FILE, rotated_log_files
+
+# 진행 상태 파일 (로컬 캐시)
+RETENTION_STATE_FILE = "log_retention.json"
+# 자동 실행 간격
+RETENTION_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+def _remove_file(path: str) -> bool:
+    """파일 삭제 (없으면 무시). 삭제했으면 True"""
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+class RetentionJob:
+    """보존 기간이 지난 로그를 지우는 백그라운드 작업 (프로세스 전체 공유)"""
+
+    def __init__(self, db, path: str = LOG_FILE, state_path: str | None = RETENTION_STATE_FILE, page_size: int = FIRESTORE_BATCH_LIMIT):
+        self.db = db
+        self.path = path
+        self.state_path = state_path
+        self.page_size = min(page_size, FIRESTORE_BATCH_LIMIT)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._cancel = threading.Event()
+        # status: idle / running / done / cancelled / failed
+        self.state = {
+            "status": "idle",
+            "cutoff": None,
+            "include_current": False,
+            "deleted": 0,
+            "rollups_deleted": 0,
+            "files_deleted": 0,
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+        }
+        self._load_state()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, cutoff: datetime, include_current: bool = False) -> bool:
+        """cutoff 이전 로그 삭제 시작 (이미 실행 중이면 False)
+
+        include_current가 True면 현재 로컬 로그 파일과 이전 형식 파일도 지웁니다 (전체 삭제).
+        """
+        with self._lock:
+            if self.running:
+                return False
+            self._cancel.clear()
+            self.state.update({
+                "status": "running",
+                "cutoff": cutoff.isoformat(),
+                "include_current": include_current,
+                "deleted": 0,
+                "rollups_deleted": 0,
+                "files_deleted": 0,
+                "started_at": datetime.now().isoformat(),
+                "finished_at": None,
+                "error": None,
+            })
+            self._save_state()
+            self._start_thread()
+            return True
+
+    def start_for_age(self, max_age_days: float) -> bool:
+        """max_age_days일보다 오래된 로그 삭제 시작"""
+        return self.start(datetime.now() - timedelta(days=max_age_days))
+
+    def resume(self) -> bool:
+        """중단된 작업이 있으면 같은 기준 시각으로 이어서 실행"""
+        with self._lock:
+            if self.running or self.state["status"] not in ("running", "cancelled", "failed"):
+                return False
+            self._cancel.clear()
+            self.state.update({"status": "running", "error": None, "finished_at": None})
+            self._save_state()
+            self._start_thread()
+            return True
+
+    def maybe_run_scheduled(self, max_age_days: float | None) -> bool:
+        """프로세스 재시작으로 끊긴 작업을 재개하거나, 마지막 실행 후 하루가 지났으면 새로 시작"""
+        if self.running:
+            return False
+        if self.state["status"] == "running":
+            return self.resume()
+        if not max_age_days or self.state["status"] == "cancelled":
+            return False
+        finished_at = self.state.get("finished_at")
+        if finished_at and datetime.now() - datetime.fromisoformat(finished_at) < timedelta(seconds=RETENTION_INTERVAL_SECONDS):
+            return False
+        return self.start_for_age(max_age_days)
+
+    def cancel(self):
+        """실행 중인 작업 중단 (현재 배치까지만 삭제, 나중에 resume 가능)"""
+        self._cancel.set()
+
+    def _start_thread(self):
+        self._thread = threading.Thread(target=self._run, name="log-retention", daemon=True)
+        self._thread.start()
+
+    # --- 백그라운드 처리 ---
+
+    def _run(self):
+        cutoff = datetime.fromisoformat(self.state["cutoff"])
+        try:
+            self._delete_firestore_logs(cutoff)
+            if not self._cancel.is_set():
+                self._delete_rollups(cutoff)
+                self._delete_local_files(cutoff)
+            status = "cancelled" if self._cancel.is_set() else "done"
+            self._update(status=status, finished_at=datetime.now().isoformat())
+        except Exception as e:
+            self._update(status="failed", error=str(e), finished_at=datetime.now().isoformat())
+
+    def _delete_in_pages(self, query, counter: str):
+        """query 결과를 page_size건씩 읽어 배치 삭제 (결과가 없을 때까지 반복)"""
+        while not self._cancel.is_set():
+            docs = list(query.limit(self.page_size).stream())
+            if not docs:
+                return
+            batch = self.db.batch()
+            for doc in docs:
+                batch.delete(doc.reference)
+            batch.commit()
+            self._update(**{counter: self.state[counter] + len(docs)})
+
+    def _delete_firestore_logs(self, cutoff: datetime):
+        # 본문 없이 문서 참조만 읽음
+        query = (
+            self.db.collection(LOGS_COLLECTION)
+            .where("timestamp", "<", cutoff)
+            .order_by("timestamp")
+            .select([])
+        )
+        self._delete_in_pages(query, "deleted")
+
+    def _delete_rollups(self, cutoff: datetime):
+        if self.state["include_current"]:
+            # 전체 삭제: 오늘 일별 롤업과 질문별 누적 횟수까지 모두 지움
+            self._delete_in_pages(self.db.collection(DAILY_COLLECTION).select([]), "rollups_deleted")
+            self._delete_in_pages(self.db.collection(QUESTIONS_COLLECTION).select([]), "rollups_deleted")
+            return
+        # 질문별 누적 횟수는 날짜별로 나눌 수 없으므로 일별 롤업만 지움
+        query = (
+            self.db.collection(DAILY_COLLECTION)
+            .where("date", "<", cutoff.strftime("%Y-%m-%d"))
+            .select([])
+        )
+        self._delete_in_pages(query, "rollups_deleted")
+
+    def _delete_local_files(self, cutoff: datetime):
+        # 회전된 파일은 마지막 기록 시각이 cutoff 이전이면 안의 로그도 모두 cutoff 이전
+        paths = [p for p in rotated_log_files(self.path) if os.path.getmtime(p) < cutoff.timestamp()]
+        if self.state["include_current"]:
+            paths += [self.path, LEGACY_LOG_FILE]
+        deleted = sum(1 for p in paths if _remove_file(p))
+        self._update(files_deleted=self.state["files_deleted"] + deleted)
+
+    # --- 상태 ---
+
+    def _update(self, **changes):
+        with self._lock:
+            self.state.update(changes)
+            self._save_state()
+
+    def stats(self) -> dict:
+        """진행 상황"""
+        with self._lock:
+            return dict(self.state)
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        try:
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+        except OSError:
+            pass
+
+    def _load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                self.state.update(json.load(f))
+        except (OSError, ValueError):
+            pass
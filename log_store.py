@@ -0,0 +1,263 @@
+"""Firestore 채팅 로그 조회 (커서 페이지, 집계/롤업 통계)
+
+관리자 검색 이력 화면은 최근 로그 전체를 읽지 않고, timestamp 커서로 한 페이지씩
+질문 미리보기만 읽습니다. 답변 본문은 펼칠 때 한 건씩 읽습니다.
+통계는 count() 집계 쿼리와, 로그를 전송할 때 같은 배치로 갱신하는 롤업 문서에서 읽습니다.
+- chat_log_daily/{YYYY-MM-DD}: {"date", "total", "faq", "chat"}
+- chat_log_questions/{질문 해시}: {"query", "count", "last_asked"}
+롤업은 로그를 쓸 때만 갱신되므로, 롤업 도입 이전 로그는 rebuild_rollups로 한 번 채웁니다.
+
+    python log_store.py --rebuild-rollups
+"""
+
+import argparse
+import hashlib
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from answer_cache import normalize_question
+from backends import firestore_increment
+from log_writer import FIRESTORE_BATCH_LIMIT
+
+LOGS_COLLECTION = "chat_logs"
+DAILY_COLLECTION = "chat_log_daily"
+QUESTIONS_COLLECTION = "chat_log_questions"
+
+# 목록에서 읽는 필드 (답변 본문 제외)
+PREVIEW_FIELDS = ["timestamp", "query", "source"]
+LOG_SOURCES = ("faq", "chat")
+
+# firestore.Query.DESCENDING과 같은 값
+DESCENDING = "DESCENDING"
+
+
+def question_id(query: str) -> str:
+    """질문 롤업 문서 ID (정규화한 질문의 해시)"""
+    return hashlib.sha256(normalize_question(query).encode("utf-8")).hexdigest()[:20]
+
+
+def rollup_writes(db, entries: list[dict]) -> list[tuple]:
+    """로그 묶음에 대한 롤업 갱신 (ref, data) 목록 (같은 배치에 merge=True로 씀)
+
+    같은 날짜/질문은 묶음 안에서 먼저 합산해 쓰기 횟수를 줄입니다.
+    """
+    daily = defaultdict(lambda: defaultdict(int))
+    questions = {}
+    for entry in entries:
+        timestamp = entry.get("timestamp")
+        date = timestamp.strftime("%Y-%m-%d") if hasattr(timestamp, "strftime") else str(timestamp)[:10]
+        daily[date]["total"] += 1
+        daily[date][entry.get("source", "chat")] += 1
+
+        query = entry.get("query", "")
+        key = question_id(query)
+        if key in questions:
+            questions[key]["count"] += 1
+            questions[key]["last_asked"] = timestamp
+        else:
+            questions[key] = {"query": query, "count": 1, "last_asked": timestamp}
+
+    writes = []
+    daily_ref = db.collection(DAILY_COLLECTION)
+    for date, counts in daily.items():
+        data = {"date": date}
+        data.update({field: firestore_increment(value) for field, value in counts.items()})
+        writes.append((daily_ref.document(date), data))
+    questions_ref = db.collection(QUESTIONS_COLLECTION)
+    for key, question in questions.items():
+        writes.append((questions_ref.document(key), {
+            "query": question["query"],
+            "count": firestore_increment(question["count"]),
+            "last_asked": question["last_asked"],
+        }))
+    return writes
+
+
+def _format_timestamp(value) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def list_log_page(db, page_size: int = 20, cursor=None) -> tuple[list[dict], object]:
+    """최신순 로그 한 페이지의 미리보기와 다음 페이지 커서(timestamp, 마지막이면 None)"""
+    query = (
+        db.collection(LOGS_COLLECTION)
+        .order_by("timestamp", direction=DESCENDING)
+        .select(PREVIEW_FIELDS)
+    )
+    if cursor is not None:
+        query = query.start_after({"timestamp": cursor})
+    # 한 건 더 읽어 다음 페이지가 있는지 확인
+    docs = list(query.limit(page_size + 1).stream())
+
+    rows = []
+    for doc in docs[:page_size]:
+        data = doc.to_dict()
+        rows.append({
+            "id": doc.id,
+            "timestamp": _format_timestamp(data.get("timestamp", "")),
+            "query": data.get("query", ""),
+            "source": data.get("source", "chat"),
+        })
+    next_cursor = docs[page_size - 1].to_dict()["timestamp"] if len(docs) > page_size else None
+    return rows, next_cursor
+
+
+def _range_query(db, start=None, end=None):
+    """timestamp가 [start, end) 범위인 로그 쿼리"""
+    query = db.collection(LOGS_COLLECTION)
+    if start is not None:
+        query = query.where("timestamp", ">=", start)
+    if end is not None:
+        query = query.where("timestamp", "<", end)
+    return query
+
+
+def count_logs(db, start=None, end=None) -> int:
+    """범위 안의 로그 수 (count() 집계)"""
+    return _count(_range_query(db, start, end))
+
+
+def iter_logs(db, start=None, end=None, page_size: int = 500):
+    """범위 안의 로그를 오래된 순으로 한 페이지씩 읽어 하나씩 반환 ({"id", ...로그 필드})
+
+    한 번에 page_size건만 메모리에 둡니다.
+    """
+    cursor = None
+    while True:
+        query = _range_query(db, start, end).order_by("timestamp")
+        if cursor is not None:
+            query = query.start_after({"timestamp": cursor})
+        docs = list(query.limit(page_size).stream())
+        for doc in docs:
+            data = doc.to_dict()
+            data["id"] = doc.id
+            yield data
+        if len(docs) < page_size:
+            return
+        cursor = docs[-1].to_dict()["timestamp"]
+
+
+def load_log_response(db, log_id: str) -> str:
+    """로그 한 건의 답변 본문"""
+    snapshot = db.collection(LOGS_COLLECTION).document(log_id).get()
+    return (snapshot.to_dict() or {}).get("response", "") if snapshot.exists else ""
+
+
+def _count(query) -> int:
+    """count() 집계 쿼리 결과 (문서를 읽지 않음)"""
+    result = query.count().get()
+    return int(result[0][0].value)
+
+
+def log_statistics(db, days: int = 14, top_n: int = 10) -> dict:
+    """검색 이력 통계
+
+    {"total", "faq", "chat", "daily": [{"date", "total", "faq", "chat"}] (최근 days일, 오래된 순),
+     "top_questions": [{"query", "count"}]}
+    """
+    logs_ref = db.collection(LOGS_COLLECTION)
+    stats = {"total": _count(logs_ref)}
+    for source in LOG_SOURCES:
+        stats[source] = _count(logs_ref.where("source", "==", source))
+
+    daily_docs = (
+        db.collection(DAILY_COLLECTION)
+        .order_by("date", direction=DESCENDING)
+        .limit(days)
+        .stream()
+    )
+    daily = []
+    for doc in daily_docs:
+        data = doc.to_dict()
+        daily.append({
+            "date": data.get("date", doc.id),
+            "total": data.get("total", 0),
+            "faq": data.get("faq", 0),
+            "chat": data.get("chat", 0),
+        })
+    stats["daily"] = daily[::-1]
+
+    question_docs = (
+        db.collection(QUESTIONS_COLLECTION)
+        .order_by("count", direction=DESCENDING)
+        .limit(top_n)
+        .stream()
+    )
+    stats["top_questions"] = [
+        {"query": data.get("query", ""), "count": data.get("count", 0)}
+        for data in (doc.to_dict() for doc in question_docs)
+    ]
+    return stats
+
+
+def _rollup_date(timestamp) -> str:
+    """rollup_writes와 같은 기준의 날짜 문자열
+
+    save_log의 naive datetime.now()는 Firestore에 UTC로 저장되어 tz-aware로 돌아오므로,
+    UTC 기준 naive 시각으로 되돌린 뒤 날짜를 구합니다 (서버 시간대로 옮기지 않음).
+    """
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return timestamp.strftime("%Y-%m-%d")
+    return str(timestamp)[:10]
+
+
+def rebuild_rollups(db, progress_callback=None) -> dict:
+    """chat_logs 전체를 다시 읽어 일별/질문별 롤업 문서를 덮어씀 (롤업 도입 이전 로그 반영)
+
+    로그는 페이지 단위로 읽고, 메모리에는 날짜별/질문별 합계만 둡니다.
+    실행 중에 새로 기록되는 로그는 다시 세거나 빠질 수 있으므로 사용량이 적을 때 실행합니다.
+    progress_callback(읽은 로그 수)는 1000건마다 호출됩니다.
+    반환: {"logs", "days", "questions"}
+    """
+    daily = defaultdict(lambda: dict.fromkeys(("total",) + LOG_SOURCES, 0))
+    questions = {}
+    total = 0
+    for log in iter_logs(db):
+        total += 1
+        date = _rollup_date(log.get("timestamp"))
+        daily[date]["total"] += 1
+        source = log.get("source", "chat")
+        daily[date][source] = daily[date].get(source, 0) + 1
+
+        query = log.get("query", "")
+        key = question_id(query)
+        if key in questions:
+            questions[key]["count"] += 1
+            questions[key]["last_asked"] = log.get("timestamp")
+        else:
+            questions[key] = {"query": query, "count": 1, "last_asked": log.get("timestamp")}
+        if progress_callback and total % 1000 == 0:
+            progress_callback(total)
+
+    writes = [(db.collection(DAILY_COLLECTION).document(date), {"date": date, **counts}) for date, counts in daily.items()]
+    writes += [(db.collection(QUESTIONS_COLLECTION).document(key), data) for key, data in questions.items()]
+    for start in range(0, len(writes), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for ref, data in writes[start:start + FIRESTORE_BATCH_LIMIT]:
+            batch.set(ref, data)
+        batch.commit()
+    if progress_callback:
+        progress_callback(total)
+    return {"logs": total, "days": len(daily), "questions": len(questions)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="chat_logs 롤업 문서 관리")
+    parser.add_argument("--rebuild-rollups", action="store_true", help="전체 로그로 일별/질문별 롤업 다시 계산")
+    args = parser.parse_args()
+    if not args.rebuild_rollups:
+        parser.print_help()
+        return
+
+    import streamlit as st
+    from backends import create_firestore_client
+
+    db = create_firestore_client(st.secrets)
+    result = rebuild_rollups(db, progress_callback=lambda done: print(f"\r{done:,}건", end="", flush=True))
+    print(f"\n로그 {result['logs']:,}건 · 일별 롤업 {result['days']:,}개 · 질문 롤업 {result['questions']:,}개를 다시 썼습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""채팅 로그 백그라운드 기록기
+
+답변이 끝난 뒤 UI 스레드를 막지 않도록 로그를 큐에 넣고, 백그라운드 스레드가
+로컬 JSONL 파일에 추가(append)한 뒤 Firestore에 WriteBatch 단위로 전송합니다.
+Firestore에 연결할 수 없으면 로컬 파일에는 계속 기록하고 전송은 나중에 재시도합니다.
+"""
+
+import atexit
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from metrics import percentile
+
+# 로컬 백업 파일 경로
+LOG_FILE = "chat_logs.jsonl"
+# 이전 형식(JSON 배열) 로그 파일
+LEGACY_LOG_FILE = "chat_logs.json"
+
+# Firestore WriteBatch 최대 작업 수는 500
+FIRESTORE_BATCH_LIMIT = 500
+# 지연 시간 통계에 남길 최근 기록 수
+LATENCY_SAMPLES = 200
+
+
+def _to_json(entry: dict) -> dict:
+    """datetime 필드를 ISO 문자열로 변환"""
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in entry.items()
+    }
+
+
+def rotated_log_files(path: str = LOG_FILE) -> list[str]:
+    """회전된 로컬 로그 파일 목록 (오래된 순)"""
+    base, ext = os.path.splitext(path)
+    return sorted(glob.glob(f"{base}-*{ext}"))
+
+
+def read_local_logs(path: str = LOG_FILE, limit: int = 100) -> list[dict]:
+    """로컬 백업에서 최근 로그 읽기 (현재 파일 → 회전된 파일 → 이전 형식 순)"""
+    logs = []
+    for log_path in [path] + list(reversed(rotated_log_files(path))):
+        if not os.path.exists(log_path):
+            continue
+        with open(log_path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        for line in reversed(lines):
+            try:
+                logs.append(json.loads(line))
+            except ValueError:
+                continue
+            if len(logs) >= limit:
+                return logs
+    if os.path.exists(LEGACY_LOG_FILE):
+        with open(LEGACY_LOG_FILE, "r", encoding="utf-8") as f:
+            try:
+                logs.extend(reversed(json.load(f)))
+            except ValueError:
+                pass
+    return logs[:limit]
+
+
+class LogWriter:
+    """큐 기반 로그 기록기 (로컬 JSONL 추가 + Firestore 배치 전송)"""
+
+    def __init__(
+        self,
+        db,
+        collection: str = "chat_logs",
+        path: str = LOG_FILE,
+        max_bytes: int = 5 * 1024 * 1024,
+        rotate_seconds: float = 24 * 60 * 60,
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+        max_pending: int = 10000,
+        rollup=None,  # (db, 로그 묶음) -> 같은 배치에 merge로 쓸 (ref, data) 목록
+    ):
+        self.db = db
+        self.collection = collection
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.batch_size = min(batch_size, FIRESTORE_BATCH_LIMIT)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.rollup = rollup
+
+        self._queue = queue.Queue()
+        self._pending = []  # Firestore 전송 대기 중인 로그
+        self._stop = threading.Event()
+        self._retry_at = 0.0
+        self._retry_delay = flush_interval
+        self._file_started_at = time.time()
+        self.written = 0
+        self.uploaded = 0
+        self.upload_failures = 0
+        self.dropped = 0
+        # 최근 로컬 기록/Firestore 배치 전송 소요 시간 (ms)
+        self._append_ms = deque(maxlen=LATENCY_SAMPLES)
+        self._upload_ms = deque(maxlen=LATENCY_SAMPLES)
+
+        self._thread = threading.Thread(target=self._run, name="chat-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, entry: dict):
+        """로그 한 건을 큐에 추가 (즉시 반환)"""
+        self._queue.put(entry)
+
+    # --- 백그라운드 처리 ---
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            if batch:
+                self._append_local(batch)
+                self._pending.extend(batch)
+                if len(self._pending) > self.max_pending:
+                    self.dropped += len(self._pending) - self.max_pending
+                    self._pending = self._pending[-self.max_pending:]
+
+            now = time.monotonic()
+            if self._pending and (len(self._pending) >= self.batch_size or now - last_flush >= self.flush_interval):
+                self._upload_pending()
+                last_flush = now
+
+    def _append_local(self, batch: list[dict]):
+        """로컬 JSONL 파일에 추가 (필요하면 먼저 회전)"""
+        try:
+            started = time.perf_counter()
+            self._rotate_if_needed()
+            with open(self.path, "a", encoding="utf-8") as f:
+                for entry in batch:
+                    f.write(json.dumps(_to_json(entry), ensure_ascii=False) + "\n")
+            self._append_ms.append((time.perf_counter() - started) * 1000)
+            self.written += len(batch)
+        except OSError:
+            # 로컬 디스크 문제는 Firestore 전송에 영향을 주지 않음
+            pass
+
+    def _rotate_if_needed(self):
+        """크기 또는 기간 기준을 넘으면 현재 파일을 타임스탬프 이름으로 교체"""
+        if not os.path.exists(self.path):
+            return
+        too_big = os.path.getsize(self.path) >= self.max_bytes
+        too_old = time.time() - self._file_started_at >= self.rotate_seconds
+        if too_big or too_old:
+            base, ext = os.path.splitext(self.path)
+            os.replace(self.path, f"{base}-{datetime.now().strftime('%Y%m%d-%H%M%S')}{ext}")
+            self._file_started_at = time.time()
+
+    def _upload_pending(self):
+        """대기 중인 로그를 WriteBatch로 전송 (실패 시 지수 백오프 후 재시도)"""
+        if self.db is None or time.monotonic() < self._retry_at:
+            return
+        # 롤업 쓰기는 로그마다 최대 2건 (날짜, 질문)이므로 배치 한도 안에 들도록 묶음 크기를 줄임
+        chunk_size = FIRESTORE_BATCH_LIMIT // 3 if self.rollup else FIRESTORE_BATCH_LIMIT
+        while self._pending:
+            chunk = self._pending[:chunk_size]
+            try:
+                started = time.perf_counter()
+                batch = self.db.batch()
+                collection_ref = self.db.collection(self.collection)
+                for entry in chunk:
+                    batch.set(collection_ref.document(), entry)
+                # 롤업을 로그와 같은 배치로 써서 재시도해도 중복 집계되지 않게 함
+                if self.rollup:
+                    for ref, data in self.rollup(self.db, chunk):
+                        batch.set(ref, data, merge=True)
+                batch.commit()
+                self._upload_ms.append((time.perf_counter() - started) * 1000)
+            except Exception:
+                self.upload_failures += 1
+                self._retry_at = time.monotonic() + self._retry_delay
+                self._retry_delay = min(self._retry_delay * 2, 300)
+                return
+            del self._pending[:len(chunk)]
+            self.uploaded += len(chunk)
+            self._retry_delay = self.flush_interval
+
+    # --- 종료 ---
+
+    def flush(self, timeout: float = 10.0):
+        """큐에 남은 로그를 모두 처리할 때까지 대기"""
+        deadline = time.monotonic() + timeout
+        while (not self._queue.empty() or self._pending) and time.monotonic() < deadline:
+            if not self._thread.is_alive():
+                break
+            time.sleep(0.05)
+
+    def close(self, timeout: float = 10.0):
+        """종료 시 남은 로그를 기록하고 스레드 정리"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        # 스레드 종료 후 남은 로그는 한 번 더 전송 시도
+        self._retry_at = 0.0
+        self._upload_pending()
+
+    def stats(self) -> dict:
+        """기록기 상태"""
+        return {
+            "queued": self._queue.qsize(),
+            "pending_upload": len(self._pending),
+            "written": self.written,
+            "uploaded": self.uploaded,
+            "upload_failures": self.upload_failures,
+            "dropped": self.dropped,
+            "append_ms_p50": percentile(list(self._append_ms), 0.5),
+            "append_ms_p95": percentile(list(self._append_ms), 0.95),
+            "upload_ms_p50": percentile(list(self._upload_ms), 0.5),
+            "upload_ms_p95": percentile(list(self._upload_ms), 0.95),
+        }
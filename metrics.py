@@ -0,0 +1,173 @@
+"""답변 경로 계측 (단계별 소요 시간, 토큰 수)
+
+답변 한 번(턴)마다 TurnMetrics에 단계별 구간 시간과 토큰 수를 기록하고,
+프로세스 전체의 MetricsRegistry가 최근 기록으로 p50/p95를 계산해
+Prometheus 텍스트 형식 파일로 내보냅니다. 파일은 답변 경로 밖의 백그라운드 스레드가
+export_interval초마다 (새 기록이 있을 때만) 다시 씁니다.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Prometheus 텍스트 형식 파일 경로 (node_exporter textfile collector 등에서 수집)
+METRICS_FILE = "metrics.prom"
+
+# 시간(ms) 지표와 그 밖의 지표 이름
+TIMING_FIELDS = ["retrieve_ms", "prompt_ms", "history_ms", "ttft_ms", "stream_ms", "total_ms"]
+COUNT_FIELDS = ["prompt_tokens", "cached_tokens", "completion_tokens", "chunk_count", "render_count", "renders_saved"]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """정렬되지 않은 값 목록의 q 분위수 (선형 보간)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class TurnMetrics:
+    """답변 한 번의 계측값"""
+
+    def __init__(self):
+        self.values = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str):
+        """with 블록의 소요 시간을 "{name}_ms"로 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.values[f"{name}_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    def set(self, name: str, value):
+        """지표 값 기록"""
+        self.values[name] = value
+
+    def finish(self) -> dict:
+        """전체 소요 시간을 기록하고 계측값 반환"""
+        self.values["total_ms"] = round((time.perf_counter() - self._started) * 1000, 1)
+        return self.values
+
+
+class MetricsRegistry:
+    """최근 턴 계측값 보관 및 요약 (프로세스 전체 공유)"""
+
+    def __init__(self, max_turns: int = 1000, path: str | None = METRICS_FILE, export_interval: float = 15.0):
+        self.path = path
+        self.export_interval = export_interval
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._turns = deque(maxlen=max_turns)
+        self.turns_total = 0
+        self.cache_hits_total = 0
+        self.coalesced_total = 0
+        self.tokens_total = {"prompt": 0, "cached": 0, "completion": 0}
+
+        self._thread = None
+        if self.path:
+            self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def record(self, values: dict):
+        """턴 계측값 추가 (Prometheus 파일은 백그라운드에서 갱신)"""
+        with self._lock:
+            self._turns.append(dict(values))
+            self.turns_total += 1
+            self.cache_hits_total += 1 if values.get("cache_hit") else 0
+            self.coalesced_total += 1 if values.get("coalesced") else 0
+            self.tokens_total["prompt"] += values.get("prompt_tokens") or 0
+            self.tokens_total["cached"] += values.get("cached_tokens") or 0
+            self.tokens_total["completion"] += values.get("completion_tokens") or 0
+        self._dirty.set()
+
+    def summary(self) -> dict:
+        """지표별 {"p50", "p95", "count"} 요약"""
+        with self._lock:
+            turns = list(self._turns)
+        result = {}
+        for field in TIMING_FIELDS + COUNT_FIELDS:
+            values = [turn[field] for turn in turns if turn.get(field) is not None]
+            result[field] = {
+                "p50": percentile(values, 0.5),
+                "p95": percentile(values, 0.95),
+                "count": len(values),
+            }
+        return result
+
+    def recent(self, limit: int = 20) -> list[dict]:
+        """최근 턴 계측값 (최신순)"""
+        with self._lock:
+            return list(self._turns)[-limit:][::-1]
+
+    # --- Prometheus 파일 내보내기 ---
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._dirty.wait()
+            self._dirty.clear()
+            self._write_prometheus()
+            # 다음 갱신까지 대기 (그 사이 기록은 다음 번에 한꺼번에 반영)
+            self._stop.wait(self.export_interval)
+
+    def close(self, timeout: float = 5.0):
+        """종료 시 내보내기 스레드를 멈추고 마지막 값 기록"""
+        if self._thread is None or self._stop.is_set():
+            return
+        self._stop.set()
+        self._dirty.set()
+        self._thread.join(timeout)
+        self._write_prometheus()
+
+    def _write_prometheus(self):
+        if not self.path:
+            return
+        with self._lock:
+            turns = list(self._turns)
+            turns_total = self.turns_total
+            cache_hits_total = self.cache_hits_total
+            coalesced_total = self.coalesced_total
+            tokens_total = dict(self.tokens_total)
+        lines = [
+            "# HELP hr_chatbot_stage_milliseconds Answer path stage latency over recent turns.",
+            "# TYPE hr_chatbot_stage_milliseconds summary",
+        ]
+        for field in TIMING_FIELDS:
+            values = [turn[field] for turn in turns if turn.get(field) is not None]
+            stage = field[:-3]
+            for q in (0.5, 0.95, 0.99):
+                lines.append(f'hr_chatbot_stage_milliseconds{{stage="{stage}",quantile="{q}"}} {percentile(values, q):.1f}')
+            lines.append(f'hr_chatbot_stage_milliseconds_sum{{stage="{stage}"}} {sum(values):.1f}')
+            lines.append(f'hr_chatbot_stage_milliseconds_count{{stage="{stage}"}} {len(values)}')
+        lines += [
+            "# HELP hr_chatbot_turns_total Answered turns.",
+            "# TYPE hr_chatbot_turns_total counter",
+            f"hr_chatbot_turns_total {turns_total}",
+            "# HELP hr_chatbot_answer_cache_hits_total Turns served from the answer cache.",
+            "# TYPE hr_chatbot_answer_cache_hits_total counter",
+            f"hr_chatbot_answer_cache_hits_total {cache_hits_total}",
+            "# HELP hr_chatbot_coalesced_turns_total Turns that joined an identical in-flight OpenAI request.",
+            "# TYPE hr_chatbot_coalesced_turns_total counter",
+            f"hr_chatbot_coalesced_turns_total {coalesced_total}",
+            "# HELP hr_chatbot_tokens_total OpenAI tokens reported by the API.",
+            "# TYPE hr_chatbot_tokens_total counter",
+        ]
+        for kind, total in tokens_total.items():
+            lines.append(f'hr_chatbot_tokens_total{{kind="{kind}"}} {total}')
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
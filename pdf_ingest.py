@@ -0,0 +1,113 @@
+"""PDF 규정 문서 추출 파이프라인
+
+페이지 단위 텍스트 추출을 프로세스 풀에서 병렬로 수행하고, 완료된 페이지마다
+진행 상황을 알려줍니다. 추출에 실패한 페이지는 건너뛰고, 결과는 페이지 번호가
+붙은 청크로 만들어 검색 인덱스와 인용 확인에 바로 사용할 수 있습니다.
+"""
+
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from retrieval import chunk_text
+
+# 이 페이지 수 미만이면 프로세스 풀 없이 현재 프로세스에서 추출
+PARALLEL_MIN_PAGES = 16
+
+# 워커 시작 방식: Streamlit 서버는 다중 스레드이고 Firestore gRPC 스레드도 돌고 있어
+# fork하면 교착이나 충돌이 날 수 있으므로 새 인터프리터로 시작
+WORKER_START_METHOD = "spawn"
+
+# 워커 프로세스별로 한 번만 파싱한 PDF
+_worker_reader = None
+
+
+@dataclass
+class PdfIngestResult:
+    """PDF 추출 결과"""
+
+    pages: list[str] = field(default_factory=list)  # 페이지 순서대로의 텍스트 (실패 페이지는 빈 문자열)
+    skipped_pages: list[int] = field(default_factory=list)  # 추출에 실패했거나 텍스트가 없는 페이지 번호 (1부터)
+    chunks: list[dict] = field(default_factory=list)  # {"page": int, "text": str}
+
+    @property
+    def page_count(self) -> int:
+        """전체 페이지 수"""
+        return len(self.pages)
+
+    @property
+    def text(self) -> str:
+        """전체 텍스트 (빈 페이지 제외)"""
+        return "\n".join(page for page in self.pages if page).strip()
+
+
+def _init_worker(pdf_bytes: bytes):
+    global _worker_reader
+    from PyPDF2 import PdfReader
+
+    _worker_reader = PdfReader(io.BytesIO(pdf_bytes))
+
+
+def _extract_page(page_index: int) -> tuple[int, str | None]:
+    """워커에서 한 페이지 추출 (실패하면 None)"""
+    try:
+        return page_index, _worker_reader.pages[page_index].extract_text() or ""
+    except Exception:
+        return page_index, None
+
+
+def iter_pages(pdf_bytes: bytes, max_workers: int | None = None):
+    """(페이지 인덱스, 텍스트 또는 None, 전체 페이지 수)를 완료되는 순서대로 생성"""
+    # PyPDF2는 관리자 업로드에서만 쓰므로 채팅 화면 시작 시간에 포함되지 않게 여기서 import
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    total = len(reader.pages)
+
+    if total < PARALLEL_MIN_PAGES:
+        for page_index, page in enumerate(reader.pages):
+            try:
+                yield page_index, page.extract_text() or "", total
+            except Exception:
+                yield page_index, None, total
+        return
+
+    workers = max_workers or min(total, os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+        initializer=_init_worker,
+        initargs=(pdf_bytes,),
+    ) as executor:
+        futures = [executor.submit(_extract_page, page_index) for page_index in range(total)]
+        for future in as_completed(futures):
+            page_index, text = future.result()
+            yield page_index, text, total
+
+
+def ingest_pdf(pdf_bytes: bytes, progress_callback=None, max_workers: int | None = None) -> PdfIngestResult:
+    """PDF에서 페이지별 텍스트와 페이지 번호가 붙은 청크 추출
+
+    progress_callback(done, total)은 페이지 하나가 끝날 때마다 호출됩니다.
+    """
+    pages = {}
+    skipped = []
+    total = 0
+    for done, (page_index, text, total) in enumerate(iter_pages(pdf_bytes, max_workers), 1):
+        if text is None or not text.strip():
+            skipped.append(page_index + 1)
+            text = ""
+        pages[page_index] = text
+        if progress_callback:
+            progress_callback(done, total)
+
+    result = PdfIngestResult(
+        pages=[pages.get(i, "") for i in range(total)],
+        skipped_pages=sorted(skipped),
+    )
+    for page_number, page_text in enumerate(result.pages, 1):
+        for text in chunk_text(page_text):
+            result.chunks.append({"page": page_number, "text": text})
+    return result
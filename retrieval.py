@@ -0,0 +1,253 @@
+"""규정 문서 검색 인덱스 (BM25)
+
+업로드된 규정 문서를 청크로 나누고, 한국어 질문에 대해 관련 청크만 골라
+시스템 프롬프트에 넣기 위한 로컬 어휘 인덱스입니다.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+
+from tokens import count_tokens
+
+# 인덱스 파일 경로 (로컬 캐시)
+INDEX_FILE = "retrieval_index.json"
+
+# 청크 분할 기준
+CHUNK_MAX_CHARS = 800
+CHUNK_OVERLAP_CHARS = 100
+
+# BM25 파라미터
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_WORD_PATTERN = re.compile(r"[0-9a-z]+|[가-힣]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """한국어/영문 텍스트를 검색용 토큰으로 분리
+
+    한국어는 조사·어미가 붙어 어절 단위 매칭이 잘 안 되므로
+    어절 자체와 글자 bigram을 함께 사용합니다.
+    """
+    tokens = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        tokens.append(word)
+        if len(word) > 2 and "가" <= word[0] <= "힣":
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def content_hash(content: str) -> str:
+    """문서 내용 해시"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def chunk_text(content: str, max_chars: int = CHUNK_MAX_CHARS, overlap: int = CHUNK_OVERLAP_CHARS) -> list[str]:
+    """문서를 줄 단위로 모아 max_chars 이하의 청크로 분할"""
+    chunks = []
+    current = ""
+    for line in content.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        # 한 줄이 너무 길면 강제로 자름
+        while len(line) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:max_chars])
+            line = line[max_chars - overlap:]
+        if current and len(current) + len(line) + 1 > max_chars:
+            chunks.append(current)
+            # 문맥 유지를 위해 이전 청크의 끝부분을 겹쳐서 시작
+            current = current[-overlap:] + "\n" + line if overlap else line
+        else:
+            current = current + "\n" + line if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class RetrievalIndex:
+    """문서별로 증분 갱신되는 BM25 인덱스"""
+
+    def __init__(self, path: str = INDEX_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        # name -> {"hash": str, "chunks": [{"text": str, "page": int | None, "tf": {term: n}, "length": int}]}
+        self.docs = {}
+        # term -> {(name, chunk_idx): tf}
+        self._postings = defaultdict(dict)
+        self._total_length = 0
+        self._num_chunks = 0
+        # 마지막으로 동기화한 문서 집합 버전
+        self.synced_version = None
+
+    # --- 인덱스 갱신 ---
+
+    def _add_postings(self, name: str):
+        for idx, chunk in enumerate(self.docs[name]["chunks"]):
+            for term, tf in chunk["tf"].items():
+                self._postings[term][(name, idx)] = tf
+            self._total_length += chunk["length"]
+            self._num_chunks += 1
+
+    def _remove_postings(self, name: str):
+        for idx, chunk in enumerate(self.docs[name]["chunks"]):
+            for term in chunk["tf"]:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop((name, idx), None)
+                if not postings:
+                    del self._postings[term]
+            self._total_length -= chunk["length"]
+            self._num_chunks -= 1
+
+    def upsert(self, name: str, content: str, chunks: list[dict] | None = None, digest: str | None = None) -> bool:
+        """문서 추가/갱신 (내용이 같으면 건너뜀). 변경 여부 반환
+
+        chunks({"text", "page"} 목록)를 주면 그대로 색인하고, 없으면 content를 분할합니다.
+        digest를 주지 않으면 content의 해시를 사용합니다.
+        """
+        digest = digest or content_hash(content)
+        with self._lock:
+            existing = self.docs.get(name)
+            if existing and existing["hash"] == digest:
+                return False
+            # 개정된 문서는 바뀌지 않은 청크의 토큰 통계를 재사용하고 바뀐 청크만 다시 분석
+            reusable = {}
+            if existing:
+                self._remove_postings(name)
+                reusable = {chunk["text"]: chunk for chunk in existing["chunks"]}
+            if chunks is None:
+                chunks = [{"text": text, "page": None} for text in chunk_text(content)]
+            indexed = []
+            for chunk in chunks:
+                previous = reusable.get(chunk["text"])
+                if previous is not None:
+                    tf, length = previous["tf"], previous["length"]
+                else:
+                    terms = tokenize(chunk["text"])
+                    tf, length = dict(Counter(terms)), len(terms)
+                indexed.append({
+                    "text": chunk["text"],
+                    "page": chunk.get("page"),
+                    "tf": tf,
+                    "length": length,
+                })
+            self.docs[name] = {"hash": digest, "chunks": indexed}
+            self._add_postings(name)
+            return True
+
+    def remove(self, name: str) -> bool:
+        """문서 제거. 변경 여부 반환"""
+        with self._lock:
+            if name not in self.docs:
+                return False
+            self._remove_postings(name)
+            del self.docs[name]
+            return True
+
+    def sync(self, documents: list[dict], version: str | None = None, load_chunks=None) -> bool:
+        """Firestore 문서 목록과 인덱스를 맞춤 (변경된 문서만 다시 색인)
+
+        documents의 항목에 content가 없으면 해시가 달라진 문서만 load_chunks(name)로
+        청크({"text", "page"} 목록)를 불러와 색인합니다.
+        """
+        changed = False
+        with self._lock:
+            if version is not None and version == self.synced_version:
+                return False
+            names = {doc["name"] for doc in documents}
+            for name in list(self.docs):
+                if name not in names:
+                    changed |= self.remove(name)
+            for doc in documents:
+                if "content" in doc:
+                    changed |= self.upsert(doc["name"], doc["content"])
+                    continue
+                existing = self.docs.get(doc["name"])
+                digest = doc.get("hash")
+                if existing and (digest is None or existing["hash"] == digest):
+                    continue
+                chunks = load_chunks(doc["name"])
+                content = "\n".join(chunk["text"] for chunk in chunks)
+                changed |= self.upsert(doc["name"], content, chunks, digest)
+            # 모든 문서를 불러온 뒤에만 기록 (중간에 실패하면 다음 호출에서 다시 시도)
+            self.synced_version = version
+        return changed
+
+    # --- 검색 ---
+
+    def search(self, query: str, top_k: int = 8) -> list[dict]:
+        """BM25 점수 상위 top_k 청크 반환"""
+        with self._lock:
+            if not self._num_chunks:
+                return []
+            avg_length = self._total_length / self._num_chunks
+            scores = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (self._num_chunks - df + 0.5) / (df + 0.5))
+                for key, tf in postings.items():
+                    length = self.docs[key[0]]["chunks"][key[1]]["length"]
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                    scores[key] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            return [
+                {
+                    "name": name,
+                    "chunk": idx,
+                    "score": score,
+                    "page": self.docs[name]["chunks"][idx].get("page"),
+                    "text": self.docs[name]["chunks"][idx]["text"],
+                }
+                for (name, idx), score in ranked
+            ]
+
+    def select_context(self, query: str, token_budget: int, top_k: int = 8) -> list[dict]:
+        """토큰 예산 안에서 관련도 순으로 청크 선택"""
+        selected = []
+        used = 0
+        for hit in self.search(query, top_k):
+            tokens = count_tokens(hit["text"])
+            if used + tokens > token_budget:
+                continue
+            selected.append(hit)
+            used += tokens
+        return selected
+
+    # --- 저장/로드 ---
+
+    def save(self):
+        """인덱스를 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        with self._lock:
+            data = {"docs": self.docs}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, path: str = INDEX_FILE) -> "RetrievalIndex":
+        """저장된 인덱스 로드 (없거나 손상되었으면 빈 인덱스)"""
+        index = cls(path)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                index.docs = data.get("docs", {})
+                for name in index.docs:
+                    index._add_postings(name)
+            except (OSError, ValueError, KeyError):
+                index = cls(path)
+        return index
@@ -0,0 +1,188 @@
+"""의미 유사 질문 캐시 (단어/문자 n-gram 벡터 + NumPy 코사인 유사도)
+
+"육아휴직 몇 번 나눠 쓸 수 있어"와 "육아휴직은 몇 번 분리해서 사용할 수 있어"처럼
+표현만 다른 질문은 정확 일치 캐시(AnswerCache)에서 빗나갑니다. 질문에서 조사와 불용어를
+떼고 동의어를 맞춘 뒤 단어/문자 n-gram 해시 벡터로 바꿔, 이전에 답한 질문들과
+한 번의 행렬 곱으로 비교하고 유사도가 기준 이상이면 저장된 답변을 돌려줍니다.
+"배우자 출산휴가는 며칠" / "배우자 출산휴가는 며칠 유급"처럼 조건이 더 붙은 질문은
+유사도가 높아도 답이 다르므로, 단어가 많은 쪽 질문의 단어가 모두 다른 쪽에도 있어야 합니다.
+항목은 문서 집합 버전별로만 유효합니다.
+"""
+
+import re
+import threading
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+
+from answer_cache import normalize_question
+from metrics import percentile
+
+# n-gram 해시 벡터 차원
+VECTOR_DIM = 4096
+NGRAM_SIZES = (2,)
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_NUMBER = re.compile(r"\d+")
+
+# 단어 끝 조사/어미 (긴 것부터 검사)
+# 한 글자 조사 중 명사 끝 글자로도 흔한 것(휴가의 "가", 제도의 "도", 근로의 "로" 등)은 떼지 않음
+_SUFFIXES = ("에서는", "으로는", "인가요", "이에요", "에서", "으로", "이야", "예요", "은", "는", "을", "를", "에", "와")
+# 뜻이 같은 표현을 한 단어로 모음
+_SYNONYMS = {
+    "나눠": "분할", "나누어": "분할", "나눠서": "분할", "분리": "분할", "분리해서": "분할", "분할해서": "분할",
+    "쓸": "사용", "써": "사용", "쓰는": "사용", "사용할": "사용", "사용해": "사용",
+    "며칠": "일수", "몇일": "일수", "방법": "어떻게",
+}
+# 질문 의미에 거의 영향이 없는 단어
+_STOPWORDS = {
+    "수", "있어", "있나요", "있습니까", "있을까요", "해", "하나요", "해요", "돼", "되나요", "돼요",
+    "가능해", "가능한가요", "뭐야", "무엇인가요", "알려줘", "알려주세요", "어떻게",
+}
+
+
+def question_words(question: str) -> list[str]:
+    """질문 정규화 후 조사/불용어를 떼고 동의어를 맞춘 단어 목록"""
+    words = []
+    for word in _NON_WORD.sub(" ", normalize_question(question)).split():
+        word = _SYNONYMS.get(word, word)
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) > len(suffix) + 1:
+                word = word[:-len(suffix)]
+                break
+        word = _SYNONYMS.get(word, word)
+        if word not in _STOPWORDS:
+            words.append(word)
+    return words
+
+
+def question_ngrams(question: str) -> list[str]:
+    """단어 자체와 단어를 이어 붙인 문자열의 문자 n-gram 목록"""
+    words = question_words(question)
+    text = "".join(words)
+    grams = [f"w:{word}" for word in words]
+    for n in NGRAM_SIZES:
+        grams.extend(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+def embed_question(question: str, dim: int = VECTOR_DIM) -> np.ndarray:
+    """단어/문자 n-gram 해시 벡터 (L2 정규화)"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for gram in question_ngrams(question):
+        vector[zlib.crc32(gram.encode("utf-8")) % dim] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def question_numbers(question: str) -> tuple[str, ...]:
+    """질문 속 숫자 ("3년", "1회" 등은 유사도가 높아도 답이 달라짐)"""
+    return tuple(_NUMBER.findall(question))
+
+
+def words_covered(words: frozenset, other: frozenset) -> bool:
+    """단어가 많은 쪽 질문의 단어가 모두 다른 쪽 질문에도 있는지 (조건이 더 붙은 질문 구분)"""
+    longer, shorter = (words, other) if len(words) >= len(other) else (other, words)
+    return longer <= shorter
+
+
+class SemanticCache:
+    """문서 집합 버전별 (질문 벡터 → 답변) 캐시"""
+
+    def __init__(self, threshold: float = 0.85, max_entries: int = 1000, dim: int = VECTOR_DIM):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._version = None
+        # 고정 크기 링 버퍼 (가득 차면 가장 오래된 칸부터 덮어씀)
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        # _vectors의 앞 len(_entries)칸과 같은 순서의 {"question", "answer", "numbers", "words"}
+        self._entries = []
+        self._next = 0
+        self._lookup_ms = deque(maxlen=1000)
+        self.hits = 0
+        self.misses = 0
+
+    def _reset_if_stale(self, version: str | None):
+        # 문서 집합이 바뀌면 이전 버전 항목은 모두 버림
+        if version != self._version:
+            self._version = version
+            self._entries = []
+            self._next = 0
+
+    def lookup(self, question: str, version: str | None) -> dict | None:
+        """가장 유사한 이전 질문의 {"question", "answer", "similarity"} (기준 미달이면 None)"""
+        started = time.perf_counter()
+        query = embed_question(question, self.dim)
+        numbers = question_numbers(question)
+        words = frozenset(question_words(question))
+        with self._lock:
+            self._reset_if_stale(version)
+            result = None
+            if self._entries and query.any():
+                scores = self._vectors[:len(self._entries)] @ query
+                # 숫자가 다르거나 한쪽에만 있는 단어가 있는 질문은 후보에서 제외
+                for index in np.argsort(scores)[::-1][:5]:
+                    score = float(scores[index])
+                    if score < self.threshold:
+                        break
+                    entry = self._entries[index]
+                    if entry["numbers"] == numbers and words_covered(words, entry["words"]):
+                        result = {"question": entry["question"], "answer": entry["answer"], "similarity": score}
+                        break
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._lookup_ms.append((time.perf_counter() - started) * 1000)
+            return result
+
+    def put(self, question: str, answer: str, version: str | None):
+        """답변 저장 (같은 질문은 덮어쓰고, 가득 차면 가장 오래된 항목부터 제거)"""
+        vector = embed_question(question, self.dim)
+        if not vector.any():
+            return
+        entry = {
+            "question": question,
+            "answer": answer,
+            "numbers": question_numbers(question),
+            "words": frozenset(question_words(question)),
+        }
+        normalized = normalize_question(question)
+        with self._lock:
+            self._reset_if_stale(version)
+            for index, existing in enumerate(self._entries):
+                if normalize_question(existing["question"]) == normalized:
+                    self._entries[index] = entry
+                    self._vectors[index] = vector
+                    return
+            if len(self._entries) < self.max_entries:
+                self._entries.append(entry)
+            else:
+                self._entries[self._next] = entry
+            self._vectors[self._next] = vector
+            self._next = (self._next + 1) % self.max_entries
+
+    def clear(self):
+        """모든 항목 삭제"""
+        with self._lock:
+            self._entries = []
+            self._next = 0
+
+    def stats(self) -> dict:
+        """적중률과 조회 지연(ms) 통계"""
+        total = self.hits + self.misses
+        with self._lock:
+            lookups = list(self._lookup_ms)
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "threshold": self.threshold,
+            "lookup_p50_ms": percentile(lookups, 0.5),
+            "lookup_p95_ms": percentile(lookups, 0.95),
+        }
@@ -0,0 +1,209 @@
+"""OpenAI 요청 병합(single-flight) 및 동시 실행 제한
+
+같은 (프롬프트 지문, 질문) 요청이 동시에 여러 세션에서 들어오면 상류 스트림을 하나만 열고
+그 delta를 기다리는 모든 세션에 나눠 줍니다. 모든 상류 호출은 프로세스 전체 세마포어로
+동시 실행 수를 제한하고(초과분은 대기열에서 기다림), 429/5xx 오류는 지수 백오프로 재시도합니다.
+"""
+
+import random
+import threading
+import time
+
+
+class QueueTimeoutError(Exception):
+    """동시 실행 대기열에서 제한 시간 안에 차례가 오지 않음"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """재시도할 만한 오류인지 (429, 5xx, 연결/시간 초과)"""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+class Flight:
+    """진행 중인 상류 스트림 하나 (여러 구독자가 같은 delta를 받음)"""
+
+    def __init__(self, key: str | None):
+        self.key = key
+        self.deltas = []
+        self.usage = None
+        self.error = None
+        self.done = False
+        self._cond = threading.Condition()
+
+    def publish(self, delta: str):
+        with self._cond:
+            self.deltas.append(delta)
+            self._cond.notify_all()
+
+    def finish(self, usage=None, error: Exception | None = None):
+        with self._cond:
+            self.usage = usage
+            self.error = error
+            self.done = True
+            self._cond.notify_all()
+
+    def subscribe(self, shared: bool) -> "Subscription":
+        return Subscription(self, shared)
+
+
+class Subscription:
+    """Flight의 delta를 처음부터 순서대로 읽는 반복자"""
+
+    def __init__(self, flight: Flight, shared: bool):
+        self.flight = flight
+        self.shared = shared  # 이미 진행 중이던 요청에 합류했는지
+
+    @property
+    def usage(self):
+        return self.flight.usage
+
+    def __iter__(self):
+        index = 0
+        flight = self.flight
+        while True:
+            with flight._cond:
+                while index >= len(flight.deltas) and not flight.done:
+                    flight._cond.wait()
+                pending = flight.deltas[index:]
+                done = flight.done
+            for delta in pending:
+                yield delta
+            index += len(pending)
+            if done and index >= len(flight.deltas):
+                if flight.error is not None:
+                    raise flight.error
+                return
+
+
+class LLMGateway:
+    """상류 OpenAI 호출의 병합, 동시 실행 제한, 재시도를 담당 (프로세스 전체 공유)"""
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        queue_timeout: float = 60.0,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.queue_timeout = queue_timeout
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._flights = {}  # key -> Flight
+        self.upstream_calls = 0
+        self.shared_joins = 0
+        self.retries = 0
+        self.queued = 0
+        self.active = 0
+
+    # --- 동시 실행 제한 + 재시도 ---
+
+    def _acquire(self):
+        with self._lock:
+            self.queued += 1
+        try:
+            if not self._semaphore.acquire(timeout=self.queue_timeout):
+                raise QueueTimeoutError("요청이 많아 잠시 후 다시 시도해 주세요.")
+        finally:
+            with self._lock:
+                self.queued -= 1
+        with self._lock:
+            self.active += 1
+
+    def _release(self):
+        with self._lock:
+            self.active -= 1
+        self._semaphore.release()
+
+    def _with_retry(self, fn):
+        """fn()을 호출하고 재시도할 만한 오류면 지수 백오프(지터 포함) 후 다시 호출"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._lock:
+                    self.upstream_calls += 1
+                return fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                with self._lock:
+                    self.retries += 1
+                delay = min(self.base_delay * 2 ** attempt, self.max_delay)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def call(self, fn):
+        """스트리밍이 아닌 상류 호출 (동시 실행 제한 + 재시도)"""
+        self._acquire()
+        try:
+            return self._with_retry(fn)
+        finally:
+            self._release()
+
+    # --- 스트리밍 병합 ---
+
+    def stream(self, key: str | None, create_stream) -> Subscription:
+        """create_stream()이 만드는 스트림의 delta를 구독
+
+        key가 같은 요청이 진행 중이면 새 호출 없이 그 스트림에 합류합니다.
+        key가 None이면 병합하지 않습니다.
+        """
+        with self._lock:
+            if key is not None and key in self._flights:
+                self.shared_joins += 1
+                return self._flights[key].subscribe(shared=True)
+            flight = Flight(key)
+            if key is not None:
+                self._flights[key] = flight
+
+        thread = threading.Thread(target=self._run_flight, args=(flight, create_stream), name="llm-flight", daemon=True)
+        thread.start()
+        return flight.subscribe(shared=False)
+
+    def _run_flight(self, flight: Flight, create_stream):
+        usage = None
+        error = None
+        try:
+            self._acquire()
+            try:
+                # 첫 delta를 받기 전까지만 재시도 (이미 나눠 준 delta가 중복되지 않도록)
+                def open_stream():
+                    stream = create_stream()
+                    iterator = iter(stream)
+                    first = next(iterator, None)
+                    return iterator, first
+
+                iterator, first = self._with_retry(open_stream)
+                chunk = first
+                while chunk is not None:
+                    if getattr(chunk, "usage", None):
+                        usage = chunk.usage
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        flight.publish(delta)
+                    chunk = next(iterator, None)
+            finally:
+                self._release()
+        except Exception as e:
+            error = e
+        finally:
+            with self._lock:
+                if flight.key is not None and self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+            flight.finish(usage, error)
+
+    def stats(self) -> dict:
+        """게이트웨이 상태"""
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "active": self.active,
+                "queued": self.queued,
+                "upstream_calls": self.upstream_calls,
+                "shared_joins": self.shared_joins,
+                "retries": self.retries,
+            }
@@ -0,0 +1,60 @@
+"""스트리밍 답변 렌더러
+
+토큰이 올 때마다 전체 마크다운을 다시 그리면 답변 길이에 대해 O(n²) 작업과
+웹소켓 전송이 생기므로, 조각(delta)을 모아 일정 시간 간격 또는 글자 수마다 한 번만 그립니다.
+"""
+
+import time
+
+CURSOR = "▌"
+
+
+class StreamRenderer:
+    """delta를 모아 placeholder에 묶어서 그리는 렌더러"""
+
+    def __init__(self, placeholder, min_interval: float = 0.1, max_pending_chars: int = 200):
+        self.placeholder = placeholder
+        self.min_interval = min_interval
+        self.max_pending_chars = max_pending_chars
+        self._parts = []
+        self._pending_chars = 0
+        self._last_render = 0.0
+        self.deltas = 0
+        self.renders = 0
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 텍스트"""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def append(self, delta: str):
+        """delta 추가 (첫 delta이거나 간격/글자 수 기준을 넘으면 그림)"""
+        self._parts.append(delta)
+        self._pending_chars += len(delta)
+        self.deltas += 1
+        now = time.monotonic()
+        if (
+            self.renders == 0
+            or now - self._last_render >= self.min_interval
+            or self._pending_chars >= self.max_pending_chars
+        ):
+            self._render(self.text + CURSOR, now)
+
+    def finish(self, text: str | None = None) -> str:
+        """커서 없이 최종 텍스트를 그리고 반환"""
+        final = self.text if text is None else text
+        self._render(final, time.monotonic())
+        return final
+
+    def _render(self, markdown: str, now: float):
+        self.placeholder.markdown(markdown)
+        self.renders += 1
+        self._pending_chars = 0
+        self._last_render = now
+
+    @property
+    def renders_saved(self) -> int:
+        """delta마다 그렸을 때와 비교해 줄인 렌더링 횟수"""
+        return max(self.deltas + 1 - self.renders, 0)
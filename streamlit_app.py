@@ -1,12 +1,38 @@
 import streamlit as st
-from openai import OpenAI
-import json
+from backends import LazyResource, create_openai_client, create_firestore_client
 import os
-from datetime import datetime
-import firebase_admin
-from firebase_admin import credentials, firestore
-from PyPDF2 import PdfReader
-import io
+import time
+from datetime import datetime, timedelta
+from pdf_ingest import ingest_pdf
+from doc_store import (
+    delete_document,
+    list_documents,
+    load_document_chunks,
+    load_document_content,
+    file_hash,
+    find_duplicate,
+    is_same_upload,
+    join_chunks,
+    retrieval_chunks,
+    save_document,
+    split_for_storage,
+)
+from retrieval import RetrievalIndex, content_hash
+from doc_cache import DocumentCache
+from log_writer import LOG_FILE, LogWriter, read_local_logs
+from log_store import iter_logs, list_log_page, load_log_response, log_statistics, rebuild_rollups, rollup_writes
+from log_export import EXPORT_FORMATS, available_formats, create_export_file, export_logs, remove_stale_exports
+from log_retention import RetentionJob
+from answer_cache import AnswerCache, prompt_fingerprint
+from semantic_cache import SemanticCache
+from faq import DEFAULT_FAQ_QUESTIONS, add_faq_question, load_faq_questions, remove_faq_question
+from faq_mining import mine_faqs
+from history import build_history
+from articles import ArticleIndex
+from metrics import TIMING_FIELDS, MetricsRegistry, TurnMetrics
+from streaming import StreamRenderer
+from prompt import PROMPT_VERSION, context_prompt, static_prompt
+from single_flight import LLMGateway
 
 # 페이지 설정
 st.set_page_config(
@@ -29,236 +55,298 @@ if "messages" not in st.session_state:
 st.title("📋 사내 HR 챗봇")
 st.caption("HR 관련 궁금한 사항을 알려드립니다.")
 
-# OpenAI 클라이언트 초기화
+# 대화 히스토리 표시 (클라이언트 생성이나 네트워크 I/O보다 먼저 그림)
+for message in st.session_state.messages:
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+
+# OpenAI 클라이언트 초기화 (첫 호출 시 생성)
+def _create_openai_client():
+    try:
+        return create_openai_client(st.secrets)
+    except KeyError:
+        raise RuntimeError("OPENAI_API_KEY가 secrets.toml에 설정되어 있지 않습니다.") from None
+
 @st.cache_resource
 def get_openai_client():
-    try:
-        return OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
-    except Exception:
-        st.error("OPENAI_API_KEY가 secrets.toml에 설정되어 있지 않습니다.")
-        st.stop()
+    return LazyResource(_create_openai_client)
 
 client = get_openai_client()
 
-# Firebase 초기화
+# Firebase 초기화 (첫 사용 시 생성)
 @st.cache_resource
 def get_firestore_client():
-    """Firebase Firestore 클라이언트 초기화"""
-    if not firebase_admin._apps:
-        # secrets.toml에서 Firebase 설정 읽기
-        firebase_config = dict(st.secrets["firebase"])
-        cred = credentials.Certificate(firebase_config)
-        
-        # storage bucket 설정
-        project_id = firebase_config.get('project_id')
-        firebase_admin.initialize_app(cred, {
-            'storageBucket': f"{project_id}.firebasestorage.app"
-        })
-    
-    return firestore.client()
+    """Firestore 클라이언트 초기화 (HR_CHATBOT_BACKEND에 따라 live/emulator/fake)"""
+    return LazyResource(lambda: create_firestore_client(st.secrets))
 
 db = get_firestore_client()
 
-# 로그 파일 경로 (로컬 백업용)
-LOG_FILE = "chat_logs.json"
+# OpenAI 호출 게이트웨이 (프로세스 전체 공유: 동일 요청 병합, 동시 실행 제한, 재시도)
+@st.cache_resource
+def get_llm_gateway():
+    """OPENAI_MAX_CONCURRENCY개까지만 동시에 상류 호출, 나머지는 대기열에서 기다림"""
+    return LLMGateway(
+        max_concurrent=int(st.secrets.get("OPENAI_MAX_CONCURRENCY", 8)),
+        max_retries=int(st.secrets.get("OPENAI_MAX_RETRIES", 3)),
+        queue_timeout=float(st.secrets.get("OPENAI_QUEUE_TIMEOUT", 60)),
+    )
+
+llm_gateway = get_llm_gateway()
+
+# 로그 기록기 (프로세스 전체 공유, 백그라운드 스레드)
+@st.cache_resource
+def get_log_writer():
+    """로컬 JSONL 백업 + Firestore 배치 전송 기록기 생성"""
+    return LogWriter(db, rollup=rollup_writes)
+
+log_writer = get_log_writer()
+
+# 로그 보존 기간 (0이면 자동 삭제 안 함)
+LOG_RETENTION_DAYS = float(st.secrets.get("LOG_RETENTION_DAYS", 0))
+
+@st.cache_resource
+def get_retention_job():
+    """보존 기간이 지난 로그를 지우는 백그라운드 작업"""
+    return RetentionJob(db)
+
+retention_job = get_retention_job()
+# 끊긴 작업 재개 또는 하루 한 번 자동 실행 (실행 여부만 확인하므로 매 rerun마다 호출해도 가벼움)
+retention_job.maybe_run_scheduled(LOG_RETENTION_DAYS)
+
+# 답변 경로 계측 (프로세스 전체 공유)
+@st.cache_resource
+def get_metrics_registry():
+    """최근 턴 계측값 보관 및 Prometheus 파일 내보내기"""
+    return MetricsRegistry(path=st.secrets.get("METRICS_FILE", "metrics.prom") or None)
+
+metrics_registry = get_metrics_registry()
 
 # 로그 저장 함수
-def save_log(user_query: str, bot_response: str):
-    """사용자 질문과 봇 응답을 Firestore에 저장"""
+def save_log(user_query: str, bot_response: str, turn_metrics: dict | None = None, source: str = "chat"):
+    """사용자 질문과 봇 응답을 로그 큐에 추가 (기록은 백그라운드에서 처리)
+
+    source는 질문 경로 ("faq": 사이드바 FAQ 버튼, "chat": 직접 입력)입니다.
+    """
     log_entry = {
         "timestamp": datetime.now(),
         "query": user_query,
-        "response": bot_response
+        "response": bot_response,
+        "source": source,
     }
+    if turn_metrics:
+        log_entry["metrics"] = dict(turn_metrics)
     
     try:
-        # Firestore에 저장
-        db.collection('chat_logs').add(log_entry)
-        
-        # 로컬 백업도 저장
-        logs = []
-        if os.path.exists(LOG_FILE):
-            with open(LOG_FILE, "r", encoding="utf-8") as f:
-                try:
-                    logs = json.load(f)
-                except:
-                    logs = []
-        
-        log_entry_json = {
-            "timestamp": log_entry["timestamp"].isoformat(),
-            "query": user_query,
-            "response": bot_response
-        }
-        logs.append(log_entry_json)
-        
-        with open(LOG_FILE, "w", encoding="utf-8") as f:
-            json.dump(logs, f, ensure_ascii=False, indent=2)
+        # 실제 파일/Firestore 기록 시간은 log_writer.stats()에서 따로 집계
+        log_writer.submit(log_entry)
+        if turn_metrics is not None:
+            metrics_registry.record(turn_metrics)
     except Exception as e:
         st.error(f"로그 저장 실패: {e}")
 
-# 로그 읽기 함수
-def load_logs():
-    """Firestore에서 저장된 모든 로그 읽기"""
+# 관리자 검색 이력 페이지 크기
+LOG_PAGE_SIZE = int(st.secrets.get("LOG_PAGE_SIZE", 20))
+
+def load_log_page(cursor=None):
+    """검색 이력 한 페이지 (질문 미리보기, 다음 페이지 커서)"""
     try:
-        # Firestore에서 읽기 (최신순 정렬)
-        logs_ref = db.collection('chat_logs').order_by('timestamp', direction=firestore.Query.DESCENDING).limit(100)
-        docs = logs_ref.stream()
-        
-        logs = []
-        for doc in docs:
-            data = doc.to_dict()
-            logs.append({
-                'id': doc.id,
-                'timestamp': data['timestamp'].isoformat() if hasattr(data['timestamp'], 'isoformat') else str(data['timestamp']),
-                'query': data['query'],
-                'response': data['response']
-            })
-        
-        return logs
+        return list_log_page(db, LOG_PAGE_SIZE, cursor)
     except Exception as e:
         st.error(f"로그 읽기 실패: {e}")
-        # 실패 시 로컬 파일에서 읽기
-        if os.path.exists(LOG_FILE):
-            with open(LOG_FILE, "r", encoding="utf-8") as f:
-                try:
-                    return json.load(f)
-                except:
-                    return []
-        return []
+        # 실패 시 로컬 백업의 최근 로그 한 페이지
+        try:
+            logs = read_local_logs(LOG_FILE, limit=LOG_PAGE_SIZE) if cursor is None else []
+        except OSError:
+            logs = []
+        return [
+            {"id": None, "timestamp": log["timestamp"], "query": log["query"], "source": log.get("source", "chat"), "response": log["response"]}
+            for log in logs
+        ], None
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_log_statistics():
+    """검색 이력 통계 (집계 쿼리 + 롤업 문서, 1분 캐시)"""
+    return log_statistics(db)
+
+# 규정 문서 검색 인덱스 (프로세스 전체 공유)
+@st.cache_resource
+def get_retrieval_index():
+    """로컬에 저장된 검색 인덱스 로드"""
+    return RetrievalIndex.load()
+
+retrieval_index = get_retrieval_index()
+
+# 규정 문서 목록 캐시 (프로세스 전체 공유)
+@st.cache_resource
+def get_document_cache():
+    """문서 캐시 생성 (Firestore 변경 감지 리스너는 첫 문서 로드 때 등록)"""
+    cache = DocumentCache(ttl_seconds=float(st.secrets.get("DOCUMENT_CACHE_TTL", 300)))
+    cache.watch_on_first_load(lambda: db.collection('documents').where('active', '==', True))
+    return cache
+
+document_cache = get_document_cache()
+
+# 답변 캐시 (프로세스 전체 공유)
+@st.cache_resource
+def get_answer_cache():
+    """답변 캐시 생성 (ANSWER_CACHE_FILE이 비어 있으면 디스크 저장 안 함)"""
+    return AnswerCache(
+        max_entries=int(st.secrets.get("ANSWER_CACHE_SIZE", 500)),
+        ttl_seconds=float(st.secrets.get("ANSWER_CACHE_TTL", 24 * 60 * 60)),
+        path=st.secrets.get("ANSWER_CACHE_FILE", "answer_cache.json") or None,
+    )
+
+answer_cache = get_answer_cache()
+
+# 의미 유사 질문 캐시 (프로세스 전체 공유, 문서 집합 버전별)
+@st.cache_resource
+def get_semantic_cache():
+    """SEMANTIC_CACHE_THRESHOLD 이상 유사한 이전 질문의 답변을 재사용하는 캐시 생성"""
+    return SemanticCache(
+        threshold=float(st.secrets.get("SEMANTIC_CACHE_THRESHOLD", 0.85)),
+        max_entries=int(st.secrets.get("SEMANTIC_CACHE_SIZE", 1000)),
+    )
+
+semantic_cache = get_semantic_cache()
+
+# 규정 조항 인덱스 (프로세스 전체 공유, 메모리)
+@st.cache_resource
+def get_article_index():
+    """(규정, 조항) 인덱스 생성"""
+    return ArticleIndex()
+
+article_index = get_article_index()
+
+# 프롬프트에 넣을 규정 청크의 토큰 예산 및 검색 개수
+CONTEXT_TOKEN_BUDGET = int(st.secrets.get("CONTEXT_TOKEN_BUDGET", 3000))
+RETRIEVAL_TOP_K = int(st.secrets.get("RETRIEVAL_TOP_K", 8))
 
 # PDF 관련 함수
-def extract_text_from_pdf(pdf_file):
-    """PDF 파일에서 텍스트 추출"""
+def extract_text_from_pdf(pdf_file, progress_callback=None):
+    """PDF 파일에서 페이지별 텍스트와 청크 추출 (페이지 병렬 처리)"""
     try:
-        pdf_reader = PdfReader(io.BytesIO(pdf_file.read()))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        return ingest_pdf(pdf_file.getvalue(), progress_callback)
     except Exception as e:
         st.error(f"PDF 텍스트 추출 실패: {e}")
         return None
 
-def save_document_to_firestore(doc_name: str, content: str):
-    """규정 문서를 Firestore에 저장"""
+def save_document_to_firestore(doc_name: str, content: str, pages: list[str] | None = None, chunks: list[dict] | None = None, uploaded_file_hash: str | None = None):
+    """규정 문서를 Firestore에 저장 (메타데이터 + 변경된 청크만 기록). 변경 요약 반환"""
     try:
-        doc_data = {
-            "name": doc_name,
-            "content": content,
-            "uploaded_at": datetime.now(),
-            "active": True
-        }
-        db.collection('documents').document(doc_name).set(doc_data)
-        return True
+        summary = save_document(db, doc_name, content, pages, uploaded_file_hash)
+        if summary["changed"]:
+            # 이 문서를 참고한 답변만 무효화하고 검색 인덱스에 바로 반영
+            document_cache.invalidate()
+            answer_cache.invalidate_documents([doc_name])
+            if chunks is None:
+                chunks = retrieval_chunks(split_for_storage(content, pages))
+            if retrieval_index.upsert(doc_name, content, chunks):
+                retrieval_index.save()
+            article_index.upsert(doc_name, content, content_hash(content))
+        return summary
     except Exception as e:
         st.error(f"문서 저장 실패: {e}")
-        return False
+        return None
+
+def _fetch_documents_from_firestore():
+    """Firestore에서 활성화된 규정 문서들의 메타데이터 읽기"""
+    return list_documents(db)
 
 def load_documents_from_firestore():
-    """Firestore에서 활성화된 규정 문서들 로드"""
+    """활성화된 규정 문서들의 메타데이터 로드 (프로세스 공유 캐시 사용)"""
     try:
-        docs_ref = db.collection('documents').where('active', '==', True).stream()
-        documents = []
-        for doc in docs_ref:
-            data = doc.to_dict()
-            documents.append({
-                'name': data.get('name', 'Unknown'),
-                'content': data.get('content', ''),
-                'uploaded_at': data.get('uploaded_at', '')
-            })
-        return documents
+        return document_cache.get(_fetch_documents_from_firestore)
     except Exception as e:
         st.error(f"문서 로드 실패: {e}")
         return []
 
+def load_document_content_from_firestore(doc_name: str):
+    """규정 문서 전체 본문 로드"""
+    try:
+        return load_document_content(db, doc_name)
+    except Exception as e:
+        st.error(f"문서 내용 로드 실패: {e}")
+        return None
+
 def delete_document_from_firestore(doc_name: str):
-    """Firestore에서 문서 삭제"""
+    """Firestore에서 문서 삭제 (청크 하위 문서 포함)"""
     try:
-        db.collection('documents').document(doc_name).delete()
+        delete_document(db, doc_name)
+        document_cache.invalidate()
+        answer_cache.invalidate_documents([doc_name])
+        if retrieval_index.remove(doc_name):
+            retrieval_index.save()
+        article_index.remove(doc_name)
         return True
     except Exception as e:
         st.error(f"문서 삭제 실패: {e}")
         return False
 
-# 자주 묻는 질문 정의
-FAQ_QUESTIONS = [
-    "4대보험 피부양자 등록을 하려면 어떤 서류를 제출해야 하나요?",
-    "육아휴직 신청 시 제출해야 할 서류는 무엇인가요?",
-    "육아휴직 1년 사용 후 6개월 연장 시 필요한 서류는 무엇인가요?",
-    "육아휴직 급여를 얼마나 받을 수 있나요?",
-    "출산휴가 후 육아휴직 바로 전환하려면 어떻게 하나요?",
-]
+# 자주 묻는 질문 (기본 FAQ + 검색 이력 분석에서 채택한 질문, 5분 캐시)
+@st.cache_data(ttl=300, show_spinner=False)
+def faq_questions() -> list[str]:
+    try:
+        return load_faq_questions(db)
+    except Exception:
+        return list(DEFAULT_FAQ_QUESTIONS)
 
 # 시스템 프롬프트 생성 함수
-def build_system_prompt():
-    """Firestore에서 규정 문서를 가져와 시스템 프롬프트 생성"""
-    base_prompt = """당신은 인사 서류 제출을 안내하는 친절한 HR 어시스턴트입니다.
-
-주요 안내 사항:
-
-**육아휴직 급여 신청을 위한 자녀 정보 제출 안내:**
-- 공문으로 육아휴직 신청서 제출 시 자녀 주민등록번호 뒷자리가 기재된 가족관계증명서를 첨부해 주세요.
-- 개인정보인 주민등록번호 공문 첨부가 우려되면 HR 담당자 이메일로 별도 송부해 주세요.
-- 육아휴직 급여 지급을 위한 신청서 제출 시 자녀 주민등록번호 확인이 필요합니다(고용센터 필수 확인사항).
-- 산전 휴직이면 자녀 주민번호를 알 수 없으므로 해당 없음.
-
-**1년 육아휴직 사용 후 연장 신청 시 추가 증빙 안내:**
-- 육아휴직 급여 대상기간은 1년이며, 부부가 모두 육아휴직을 사용하는 경우에 한해 1년 6개월까지 지급됩니다.
-- 최초 1년 사용 후 추가 6개월 연장 시, 배우자가 동시에 3개월 이상 육아휴직을 사용했다는 증빙자료를 제출해 주세요. 없으면 제출 불필요.
-- 배우자가 동시에 3개월 이상 육아휴직을 사용했다는 증빙자료:
-  * 같은 자녀를 대상으로 부모가 모두 육아휴직을 각각 3개월 이상 사용한 경우의 부 또는 모
-  * 증빙자료 예시: ▲육아휴직급여 지급 결정 통지서, ▲회사에서 공식적으로 발령한 휴직-복직 발령문(휴직 발령문만으로는 실제 휴직여부를 알 수 없으므로 복직 발령문도 함께 확인 필요)
-
-**육아휴직 신청 시 기본 필요 서류:**
-1. 육아휴직 신청서
-2. 가족관계증명서 (주민등록번호 뒷자리 포함)
-
-**출산휴가 후 육아휴직 바로 전환:**
-- 통합신청서를 제출하면 됩니다.
-- 통합신청서 작성 항목:
-  1. 신청인의 성명, 생년월일 등 인적사항
-  2. 육아휴직 대상인 영유아의 성명·생년월일
-  3. 휴직개시예정일
-  4. 육아휴직을 종료하려는 날
-  5. 육아휴직 신청 연월일
-  6. 출산전후휴가 또는 배우자출산휴가 개시예정일 및 종료일(통합신청시에만 기재)
-- 자세한 내용은 링크 참고: https://www.moel.go.kr/news/notice/noticeView.do?bbs_seq=20250100161
-
-**4대보험 피부양자 등록 시 필요 서류:**
-- 피부양자 명의의 가족관계증명서 (주민등록번호 뒷자리 포함), 제출처는 회사 인사부서 담당자.
-
-**추가 참고 사항:**
-- 가족관계증명서는 주민센터 또는 정부24에서 발급 가능합니다.
-- 주민등록번호 뒷자리가 포함되어야 합니다.
-- 발급일로부터 3개월 이내 서류를 제출해야 합니다.
-
-**육아휴직 급여 관련:**
-- 육아휴직급여는 고용보험에 가입해 있는 피보험자가 받을 수 있습니다.
-- 미리 알아보는 나의 육아휴직급여 지급액 모의계산: https://www.work24.go.kr/cm/c/f/1100/selecSimulate12.do?currentPageNo=1&recordCountPerPage=10&upprSystClId=SC00000245&systClId=SC00000251&systId=SI00000402&systCnntId=CI00001626
-- 육아휴직급여에 관한 급여모의계산은 고용보험에 가입해 있는 피보험자가 육아휴직급여를 받게될 경우 받게 될 육아휴직급여를 계산해 볼 수 있습니다.
-
-**사내 인권 업무 담당 부서:**
-- 직장 내 괴롭힘, 성희롱, 차별 등 인권 관련 문의 및 신고는 인사팀으로 문의해 주세요.
-- 인권 관련 사건 처리 및 상담은 인사팀에서 담당합니다.
-"""
-    
-    # Firestore에서 업로드된 규정 문서 가져오기
+def sync_document_indexes():
+    """Firestore의 규정 문서와 검색/조항 인덱스 동기화 (변경된 문서만 다시 색인)"""
     documents = load_documents_from_firestore()
+    loaded = {}
     
-    if documents:
-        base_prompt += "\n\n**=== 추가 규정 및 안내 사항 (관리자 업로드) ===**\n\n"
-        for doc in documents:
-            base_prompt += f"**[{doc['name']}]**\n{doc['content']}\n\n"
-    
-    base_prompt += """\n**답변 시 중요 지침:**
-1. 위 규정 문서의 내용을 참고하여 답변할 때는 반드시 "규정명 + 조항 번호"를 명시하세요.
-   예시: "직장 내 괴롭힘 방지규정 제16조", "인사규정 제25조 제2항"
-2. 규정 문서명은 위 [문서명] 부분을 참고하여 정확히 작성하세요.
-3. 추상적이거나 일반적인 답변을 피하고, 규정에 명시된 구체적인 내용을 인용하세요.
-4. 만약 규정에 명확한 기준이나 기간이 명시되어 있지 않다면, 그 사실을 정확히 알려주세요.
-5. 사용자의 질문에 따라 필요한 서류를 명확하고 친절하게 안내하세요. 단계별로 설명하고, 추가 궁금한 사항을 묻습니다."""
+    def load_chunks(name: str):
+        if name not in loaded:
+            loaded[name] = load_document_chunks(db, name)
+        return loaded[name]
     
-    return base_prompt
+    if retrieval_index.sync(documents, document_cache.version, lambda name: retrieval_chunks(load_chunks(name))):
+        retrieval_index.save()
+    article_index.sync(documents, document_cache.version, lambda name: join_chunks(load_chunks(name)))
+
+def retrieve_context(query: str) -> list[dict]:
+    """질문과 관련된 규정 내용 검색
+
+    질문이 특정 조항을 직접 지목하면("인사규정 제25조") 그 조항만, 아니면 관련 청크를 토큰 예산 안에서 반환
+    """
+    sync_document_indexes()
+    article = article_index.resolve_question(query)
+    if article:
+        return article
+    return retrieval_index.select_context(query, CONTEXT_TOKEN_BUDGET, RETRIEVAL_TOP_K)
+
+def citation_warnings(answer: str) -> str:
+    """답변의 규정 인용 중 확인되지 않은 것에 대한 안내 문구 (없으면 빈 문자열)"""
+    unverified = [
+        result["citation"]
+        for result in article_index.verify_citations(answer)
+        if result["status"] != "ok"
+    ]
+    if not unverified:
+        return ""
+    return f"\n\n> ⚠️ 업로드된 규정에서 확인되지 않은 인용: {', '.join(dict.fromkeys(unverified))}"
+
+def build_prompt_segments(query: str = "", chunks: list[dict] | None = None) -> tuple[str, str]:
+    """(모든 요청에 공통인 시스템 프롬프트, 질문 관련 규정 발췌) 반환"""
+    if chunks is None:
+        chunks = retrieve_context(query) if query else []
+    return static_prompt(), context_prompt(chunks)
+
+def standalone_messages(system_prompt: str, context: str, question: str) -> list[dict]:
+    """이전 대화 없이 보내는 요청 메시지 (고정 프롬프트, 규정 발췌, 질문)
+
+    답변 캐시에 저장하거나 다른 세션과 스트림을 공유하는 답변은 항상 이 형태로 생성합니다.
+    """
+    messages = [{"role": "system", "content": system_prompt}]
+    if context:
+        messages.append({"role": "system", "content": context})
+    messages.append({"role": "user", "content": question})
+    return messages
+
+def answer_fingerprint(system_prompt: str, context: str) -> str:
+    """답변 캐시 키에 쓰는 프롬프트 지문 (프롬프트 버전 + 시스템 프롬프트 + 규정 발췌)"""
+    return prompt_fingerprint(f"{PROMPT_VERSION}\n{system_prompt}\n{context}")
 
 # 세션 상태 초기화
 if "messages" not in st.session_state:
@@ -270,11 +358,154 @@ if "messages" not in st.session_state:
     ]
 if "admin_mode" not in st.session_state:
     st.session_state.admin_mode = False
+if "history_summary" not in st.session_state:
+    st.session_state.history_summary = {}
+
+# 대화 히스토리 토큰 예산 (초과분은 요약)
+HISTORY_TOKEN_BUDGET = int(st.secrets.get("HISTORY_TOKEN_BUDGET", 2000))
+
+def summarize_history(previous_summary: str, messages: list[dict]) -> str:
+    """이전 요약과 새로 밀려난 대화를 합쳐 요약 갱신"""
+    conversation = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    response = llm_gateway.call(lambda: client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "system",
+                "content": "HR 챗봇과 사용자의 대화를 요약합니다. 사용자의 상황, 질문 주제, 안내된 서류와 규정 조항을 빠짐없이 간결하게 정리하세요.",
+            },
+            {
+                "role": "user",
+                "content": f"기존 요약:\n{previous_summary or '(없음)'}\n\n추가 대화:\n{conversation}",
+            },
+        ],
+        temperature=0,
+        max_tokens=300,
+    ))
+    return response.choices[0].message.content or previous_summary
+
+# 스트리밍 렌더링 간격(초)과 최대 대기 글자 수
+STREAM_RENDER_INTERVAL = float(st.secrets.get("STREAM_RENDER_INTERVAL", 0.1))
+STREAM_RENDER_CHARS = int(st.secrets.get("STREAM_RENDER_CHARS", 200))
+
+# 답변 생성 함수
+def generate_response(question: str) -> tuple[str, dict]:
+    """질문에 대한 답변을 스트리밍으로 표시하고 (전체 답변, 단계별 계측값) 반환"""
+    placeholder = st.empty()
+    full_response = ""
+    turn = TurnMetrics()
 
-# 대화 히스토리 표시
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
+    try:
+        # 동적으로 시스템 프롬프트 생성
+        with turn.span("retrieve"):
+            context_chunks = retrieve_context(question)
+        with turn.span("prompt"):
+            system_prompt, context = build_prompt_segments(question, context_chunks)
+        turn.set("prompt_chars", len(system_prompt) + len(context))
+
+        # 대화 맥락과 무관한 질문(FAQ 또는 첫 질문)만 답변 캐시 사용
+        # (이전 대화 없이 생성하므로 다른 세션에 그대로 보여줘도 됨)
+        user_turns = sum(1 for m in st.session_state.messages if m["role"] == "user")
+        cacheable = question in faq_questions() or user_turns <= 1
+        fingerprint = answer_fingerprint(system_prompt, context)
+        if cacheable:
+            cached = answer_cache.get(question, fingerprint)
+            if cached is not None:
+                full_response = cached + citation_warnings(cached)
+                placeholder.markdown(full_response)
+                turn.set("cache_hit", True)
+                return full_response, turn.finish()
+
+            # 표현만 다른 이전 질문이 있으면 그 답변 사용
+            similar = semantic_cache.lookup(question, document_cache.version)
+            if similar is not None:
+                full_response = similar["answer"] + citation_warnings(similar["answer"])
+                placeholder.markdown(full_response)
+                turn.set("cache_hit", True)
+                turn.set("semantic_similarity", round(similar["similarity"], 3))
+                return full_response, turn.finish()
+
+        if cacheable:
+            messages_for_api = standalone_messages(system_prompt, context, question)
+        else:
+            with turn.span("history"):
+                history = build_history(
+                    st.session_state.messages,
+                    HISTORY_TOKEN_BUDGET,
+                    st.session_state.history_summary,
+                    summarize_history,
+                )
+            # 캐시되는 앞부분(고정 프롬프트 + 이전 대화)을 유지하도록 턴마다 바뀌는 발췌는 마지막 질문 바로 앞에 둠
+            messages_for_api = [{"role": "system", "content": system_prompt}] + history[:-1]
+            if context:
+                messages_for_api.append({"role": "system", "content": context})
+            messages_for_api += history[-1:]
+
+        # 맥락과 무관한 같은 질문이 동시에 들어오면 상류 스트림 하나를 함께 받음 (이전 대화 없는 요청만)
+        flight_key = answer_cache.make_key(question, fingerprint) if cacheable else None
+        stream_started = time.perf_counter()
+        subscription = llm_gateway.stream(flight_key, lambda: client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages_for_api,
+            stream=True,
+            stream_options={"include_usage": True},
+            temperature=0.7,
+            max_tokens=1000,
+        ))
+        turn.set("coalesced", subscription.shared)
+
+        renderer = StreamRenderer(placeholder, STREAM_RENDER_INTERVAL, STREAM_RENDER_CHARS)
+        for delta in subscription:
+            if renderer.deltas == 0:
+                turn.set("ttft_ms", round((time.perf_counter() - stream_started) * 1000, 1))
+            renderer.append(delta)
+        # 토큰 사용량은 상류 호출 한 번에 대해서만 집계
+        if subscription.usage and not subscription.shared:
+            turn.set("prompt_tokens", subscription.usage.prompt_tokens)
+            turn.set("completion_tokens", subscription.usage.completion_tokens)
+            details = getattr(subscription.usage, "prompt_tokens_details", None)
+            turn.set("cached_tokens", getattr(details, "cached_tokens", None) or 0)
+        full_response = renderer.text
+        turn.set("stream_ms", round((time.perf_counter() - stream_started) * 1000, 1))
+        turn.set("chunk_count", renderer.deltas)
+
+        if cacheable and full_response:
+            answer_cache.put(question, fingerprint, full_response, [chunk["name"] for chunk in context_chunks])
+            semantic_cache.put(question, full_response, document_cache.version)
+
+        # 답변 속 규정 인용을 조항 인덱스와 대조
+        full_response = renderer.finish(full_response + citation_warnings(full_response))
+        turn.set("render_count", renderer.renders)
+        turn.set("renders_saved", renderer.renders_saved)
+    except Exception as e:
+        full_response = f"오류가 발생했습니다: {e}"
+        placeholder.error(full_response)
+        turn.set("error", True)
+
+    return full_response, turn.finish()
+
+def prewarm_answer(question: str) -> bool:
+    """현재 규정 문서 기준 답변을 미리 만들어 답변 캐시에 저장 (이미 있으면 False)
+
+    대화 맥락 없이 첫 질문과 같은 프롬프트로 생성하므로, 이후 같은 질문은 LLM 호출 없이 답변합니다.
+    """
+    context_chunks = retrieve_context(question)
+    system_prompt, context = build_prompt_segments(question, context_chunks)
+    fingerprint = answer_fingerprint(system_prompt, context)
+    if answer_cache.contains(question, fingerprint):
+        return False
+    response = llm_gateway.call(lambda: client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=standalone_messages(system_prompt, context, question),
+        temperature=0.7,
+        max_tokens=1000,
+    ))
+    answer = response.choices[0].message.content or ""
+    if not answer:
+        return False
+    answer_cache.put(question, fingerprint, answer, [chunk["name"] for chunk in context_chunks])
+    semantic_cache.put(question, answer, document_cache.version)
+    return True
 
 # FAQ에서 추가된 질문이 있으면 AI 응답 생성
 if st.session_state.messages and st.session_state.messages[-1]["role"] == "user":
@@ -286,36 +517,13 @@ if st.session_state.messages and st.session_state.messages[-1]["role"] == "user"
             # 이전 메시지가 assistant이면 새로운 user 메시지에 대한 응답 필요
             needs_response = True
     
-    if needs_response and last_message["content"] in FAQ_QUESTIONS:
+    if needs_response and last_message["content"] in faq_questions():
         with st.chat_message("assistant"):
-            placeholder = st.empty()
-            full_response = ""
-
-            try:
-                # 동적으로 시스템 프롬프트 생성
-                system_prompt = build_system_prompt()
-                messages_for_api = [{"role": "system", "content": system_prompt}] + st.session_state.messages
-                stream = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages_for_api,
-                    stream=True,
-                    temperature=0.7,
-                    max_tokens=1000,
-                )
-
-                for chunk in stream:
-                    delta = chunk.choices[0].delta.content if chunk.choices else None
-                    if delta:
-                        full_response += delta
-                        placeholder.markdown(full_response + "▌")
-                placeholder.markdown(full_response)
-            except Exception as e:
-                full_response = f"오류가 발생했습니다: {e}"
-                placeholder.error(full_response)
+            full_response, turn_metrics = generate_response(last_message["content"])
 
         st.session_state.messages.append({"role": "assistant", "content": full_response})
         # 로그 저장
-        save_log(last_message["content"], full_response)
+        save_log(last_message["content"], full_response, turn_metrics, source="faq")
         st.rerun()
 
 # 사용자 입력 처리
@@ -325,34 +533,11 @@ if prompt := st.chat_input("질문을 입력하세요..."):
         st.markdown(prompt)
 
     with st.chat_message("assistant"):
-        placeholder = st.empty()
-        full_response = ""
-
-        try:
-            # 동적으로 시스템 프롬프트 생성
-            system_prompt = build_system_prompt()
-            messages_for_api = [{"role": "system", "content": system_prompt}] + st.session_state.messages
-            stream = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages_for_api,
-                stream=True,
-                temperature=0.7,
-                max_tokens=1000,
-            )
-
-            for chunk in stream:
-                delta = chunk.choices[0].delta.content if chunk.choices else None
-                if delta:
-                    full_response += delta
-                    placeholder.markdown(full_response + "▌")
-            placeholder.markdown(full_response)
-        except Exception as e:
-            full_response = f"오류가 발생했습니다: {e}"
-            placeholder.error(full_response)
+        full_response, turn_metrics = generate_response(prompt)
 
     st.session_state.messages.append({"role": "assistant", "content": full_response})
     # 로그 저장
-    save_log(prompt, full_response)
+    save_log(prompt, full_response, turn_metrics)
 
 # 관리자 모드 페이지 (맨 아래)
 if st.session_state.admin_mode:
@@ -360,53 +545,246 @@ if st.session_state.admin_mode:
     st.subheader("🔐 관리자 모드")
     
     # 탭으로 구분
-    tab1, tab2 = st.tabs(["📊 검색 이력", "📄 규정 관리"])
+    tab1, tab2, tab3 = st.tabs(["📊 검색 이력", "📄 규정 관리", "⏱️ 성능"])
     
     with tab1:
-        logs = load_logs()
+        # 통계 (원본 로그를 읽지 않고 집계 쿼리와 롤업 문서에서 계산)
+        try:
+            log_stats = load_log_statistics()
+        except Exception as e:
+            st.error(f"통계 읽기 실패: {e}")
+            log_stats = None
         
-        if logs:
-            st.info(f"총 {len(logs)}개의 검색 기록이 있습니다.")
-            
-            # 통계
-            col1, col2 = st.columns(2)
+        if log_stats:
+            col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("총 검색 수", len(logs))
+                st.metric("총 검색 수", f"{log_stats['total']:,}")
+            with col2:
+                faq_share = log_stats["faq"] / log_stats["total"] if log_stats["total"] else 0.0
+                st.metric("FAQ / 직접 입력", f"{faq_share:.0%} / {1 - faq_share:.0%}" if log_stats["total"] else "-")
+            with col3:
+                st.metric("전송 대기 로그", log_writer.stats()["pending_upload"])
             
-            # 로그 표시
-            st.subheader("📊 검색 이력")
+            if log_stats["daily"]:
+                st.markdown("**일별 검색 수**")
+                st.bar_chart(
+                    [{"날짜": row["date"], "FAQ": row["faq"], "직접 입력": row["chat"]} for row in log_stats["daily"]],
+                    x="날짜",
+                    y=["FAQ", "직접 입력"],
+                )
+            if log_stats["top_questions"]:
+                with st.expander("자주 묻는 질문 상위 10개"):
+                    st.table([
+                        {"질문": question["query"], "횟수": question["count"]}
+                        for question in log_stats["top_questions"]
+                    ])
             
-            for i, log in enumerate(reversed(logs), 1):
+            # 롤업은 기록 시점에만 갱신되므로 도입 이전 로그는 다시 계산해야 반영됨
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.caption("일별 검색 수와 자주 묻는 질문은 롤업 문서 기준입니다. 이전 로그가 빠져 있으면 통계를 다시 계산하세요.")
+            with col2:
+                if st.button("📈 통계 다시 계산"):
+                    with st.spinner("전체 로그로 통계를 다시 계산하는 중..."):
+                        try:
+                            rebuilt = rebuild_rollups(db)
+                            load_log_statistics.clear()
+                            st.success(f"로그 {rebuilt['logs']:,}건으로 다시 계산했습니다.")
+                        except Exception as e:
+                            st.error(f"통계 계산 실패: {e}")
+        
+        # 로그 표시 (timestamp 커서 기반 페이지)
+        st.subheader("📊 검색 이력")
+        if "log_cursors" not in st.session_state:
+            # 각 페이지의 시작 커서 (첫 페이지는 None)
+            st.session_state.log_cursors = [None]
+            st.session_state.log_responses = {}
+        page_index = len(st.session_state.log_cursors) - 1
+        logs, next_cursor = load_log_page(st.session_state.log_cursors[-1])
+        
+        if logs:
+            for i, log in enumerate(logs, page_index * LOG_PAGE_SIZE + 1):
+                source_label = "FAQ" if log["source"] == "faq" else "직접 입력"
                 with st.expander(f"{i}. {log['query'][:50]}... ({log['timestamp'][:10]})"):
                     st.markdown("**사용자 질문:**")
                     st.write(log['query'])
-                    st.markdown("**챗봇 답변:**")
-                    st.write(log['response'])
-                    st.caption(f"시간: {log['timestamp']}")
+                    st.caption(f"시간: {log['timestamp']} · 경로: {source_label}")
+                    # 답변 본문은 요청할 때만 한 건씩 읽음
+                    if "response" in log:
+                        st.markdown("**챗봇 답변:**")
+                        st.write(log["response"])
+                    elif st.checkbox("답변 보기", key=f"log_response_{log['id']}"):
+                        if log["id"] not in st.session_state.log_responses:
+                            st.session_state.log_responses[log["id"]] = load_log_response(db, log["id"])
+                        st.markdown("**챗봇 답변:**")
+                        st.write(st.session_state.log_responses[log["id"]])
             
-            # 로그 다운로드
+            col1, col2, col3 = st.columns([1, 1, 2])
+            with col1:
+                if st.button("◀ 이전", disabled=page_index == 0):
+                    st.session_state.log_cursors.pop()
+                    st.rerun()
+            with col2:
+                if st.button("다음 ▶", disabled=next_cursor is None):
+                    st.session_state.log_cursors.append(next_cursor)
+                    st.rerun()
+            with col3:
+                st.caption(f"{page_index + 1}페이지")
+            
+            # 로그 내보내기 (전체 기간을 페이지 단위로 읽어 임시 파일에 바로 기록)
             st.divider()
             col1, col2 = st.columns(2)
             with col1:
-                log_json = json.dumps(logs, ensure_ascii=False, indent=2)
-                st.download_button(
-                    "📥 로그 다운로드 (JSON)",
-                    log_json,
-                    "chat_logs.json",
-                    "application/json"
-                )
+                st.markdown("**📥 로그 내보내기**")
+                today = datetime.now().date()
+                export_range = st.date_input("기간", (today - timedelta(days=30), today), key="log_export_range")
+                export_format = st.selectbox("형식", available_formats(), key="log_export_format")
+                if st.button("내보내기 파일 만들기"):
+                    start_date, end_date = export_range if len(export_range) == 2 else (export_range[0], export_range[0])
+                    progress = st.progress(0.0, text="로그를 읽는 중...")
+                    # 요청마다 다른 임시 파일에 씀 (다른 관리자의 파일과 겹치지 않음)
+                    remove_stale_exports()
+                    export_path = create_export_file(export_format)
+                    try:
+                        exported = export_logs(
+                            db,
+                            export_format,
+                            export_path,
+                            datetime.combine(start_date, datetime.min.time()),
+                            datetime.combine(end_date + timedelta(days=1), datetime.min.time()),
+                            progress_callback=lambda done, total: progress.progress(
+                                min(done / total, 1.0) if total else 1.0, text=f"{done:,} / {total:,}건"
+                            ),
+                        )
+                        # 파일은 만든 실행에서 한 번만 읽어 버튼에 넘기고 바로 지움
+                        # (rerun마다 파일 전체를 다시 읽지 않도록 버튼은 이번 실행에만 표시)
+                        with open(export_path, "rb") as f:
+                            data = f.read()
+                        st.download_button(
+                            f"📥 로그 다운로드 ({exported:,}건, {export_format.upper()})",
+                            data,
+                            f"chat_logs_{start_date}_{end_date}{EXPORT_FORMATS[export_format][1]}",
+                            EXPORT_FORMATS[export_format][0],
+                            on_click="ignore",
+                        )
+                        st.caption("다른 조작을 하면 버튼이 사라집니다. 다시 받으려면 파일을 다시 만드세요.")
+                    except Exception as e:
+                        st.error(f"내보내기 실패: {e}")
+                    finally:
+                        os.remove(export_path)
             
             with col2:
-                if st.button("🗑️ 모든 로그 삭제", type="secondary"):
-                    os.remove(LOG_FILE)
-                    st.success("로그가 삭제되었습니다.")
+                st.markdown("**🗑️ 로그 삭제**")
+                retention_days = st.number_input(
+                    "보존 기간 (일)", min_value=1, value=int(LOG_RETENTION_DAYS) or 180, step=30,
+                )
+                if st.button("보존 기간 지난 로그 삭제", disabled=retention_job.running):
+                    retention_job.start_for_age(retention_days)
+                    st.rerun()
+                confirm_delete = st.checkbox("모든 로그(Firestore + 로컬 백업)를 삭제합니다")
+                if st.button("🗑️ 모든 로그 삭제", type="secondary", disabled=not confirm_delete or retention_job.running):
+                    retention_job.start(datetime.now(), include_current=True)
                     st.rerun()
         else:
             st.info("아직 검색 기록이 없습니다.")
+        
+        # 삭제 작업 진행 상황 (백그라운드 실행)
+        retention = retention_job.stats()
+        if retention["status"] != "idle":
+            status_labels = {"running": "진행 중", "done": "완료", "cancelled": "중단됨", "failed": "실패"}
+            st.caption(
+                f"로그 삭제 {status_labels.get(retention['status'], retention['status'])} · 기준 {retention['cutoff'][:16]} 이전 · "
+                f"Firestore {retention['deleted']:,}건 · 롤업 {retention['rollups_deleted']:,}건 · 로컬 파일 {retention['files_deleted']}개"
+            )
+            if retention["error"]:
+                st.error(f"로그 삭제 실패: {retention['error']}")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if retention_job.running and st.button("⏸️ 삭제 중단"):
+                    retention_job.cancel()
+                    st.rerun()
+            with col2:
+                if not retention_job.running and retention["status"] in ("cancelled", "failed") and st.button("▶️ 이어서 삭제"):
+                    retention_job.resume()
+                    st.rerun()
+            with col3:
+                if retention_job.running and st.button("🔄 진행 상황 새로고침"):
+                    st.rerun()
+        
+        # FAQ 후보 찾기 (전체 로그를 페이지 단위로 읽어 비슷한 질문끼리 묶음)
+        st.divider()
+        st.subheader("🔎 자주 묻는 질문 분석")
+        st.caption("검색 이력에서 많이 나온 질문 중 현재 FAQ에 없는 것을 찾아 FAQ 후보로 제안합니다.")
+        added_faqs = [question for question in faq_questions() if question not in DEFAULT_FAQ_QUESTIONS]
+        if added_faqs:
+            with st.expander(f"채택한 FAQ ({len(added_faqs)}개)"):
+                for i, question in enumerate(added_faqs):
+                    col1, col2 = st.columns([4, 1])
+                    with col1:
+                        st.write(question)
+                    with col2:
+                        if st.button("삭제", key=f"faq_remove_{i}"):
+                            remove_faq_question(db, question)
+                            faq_questions.clear()
+                            st.rerun()
+        if st.button("검색 이력 분석"):
+            with st.spinner("검색 이력을 분석하는 중..."):
+                try:
+                    st.session_state.faq_mining = mine_faqs(iter_logs(db), faq_questions())
+                except Exception as e:
+                    st.error(f"분석 실패: {e}")
+        
+        mining = st.session_state.get("faq_mining")
+        if mining:
+            st.caption(f"로그 {mining['logs']:,}건 · 고유 질문 {mining['unique_questions']:,}개 · FAQ 후보 {len(mining['suggestions'])}개")
+            current_faqs = faq_questions()
+            for i, suggestion in enumerate(mining["suggestions"]):
+                with st.expander(f"{suggestion['question']} ({suggestion['count']:,}회)"):
+                    st.markdown("**비슷한 질문:**")
+                    for variant in suggestion["variants"]:
+                        st.write(f"- {variant}")
+                    added = suggestion["question"] in current_faqs
+                    if st.button("✅ FAQ에 추가됨" if added else "FAQ에 추가", key=f"faq_add_{i}", disabled=added):
+                        add_faq_question(db, suggestion["question"])
+                        faq_questions.clear()
+                        st.rerun()
+            
+            # 답변 미리 생성 (현재 규정 문서 기준으로 답변 캐시 채움)
+            if mining["suggestions"] and st.button("💡 FAQ 후보 답변 미리 생성"):
+                progress = st.progress(0.0, text="답변을 생성하는 중...")
+                warmed = 0
+                for done, suggestion in enumerate(mining["suggestions"], 1):
+                    try:
+                        warmed += prewarm_answer(suggestion["question"])
+                    except Exception as e:
+                        st.error(f"답변 생성 실패 ({suggestion['question']}): {e}")
+                    progress.progress(done / len(mining["suggestions"]), text=f"{done} / {len(mining['suggestions'])}")
+                st.success(f"{warmed}개 답변을 캐시에 저장했습니다.")
     
     with tab2:
         st.subheader("📄 규정 문서 관리")
         
+        # 문서 캐시 상태
+        cache_stats = document_cache.stats()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("문서 캐시 적중", cache_stats["hits"])
+        with col2:
+            st.metric("컬렉션 읽기", cache_stats["misses"])
+        with col3:
+            st.metric("적중률", f"{cache_stats['hit_rate']:.0%}")
+        st.caption(f"문서 버전: {cache_stats['version'] or 'N/A'} · 변경 감지: {'리스너' if cache_stats['watching'] else 'TTL'}")
+        answer_stats = answer_cache.stats()
+        article_stats = article_index.stats()
+        st.caption(f"조항 인덱스: 규정 {article_stats['regulations']}개 · 조항 {article_stats['articles']}개")
+        st.caption(f"답변 캐시: {answer_stats['entries']}개 저장 · 적중 {answer_stats['hits']} / 실패 {answer_stats['misses']} ({answer_stats['hit_rate']:.0%})")
+        semantic_stats = semantic_cache.stats()
+        st.caption(
+            f"유사 질문 캐시: {semantic_stats['entries']}개 저장 · 적중 {semantic_stats['hits']} / 실패 {semantic_stats['misses']} "
+            f"({semantic_stats['hit_rate']:.0%}) · 기준 유사도 {semantic_stats['threshold']:.2f} · "
+            f"조회 p50 {semantic_stats['lookup_p50_ms']:.2f}ms / p95 {semantic_stats['lookup_p95_ms']:.2f}ms"
+        )
+        
         # PDF 업로드
         st.markdown("### 📤 새 규정 문서 업로드")
         uploaded_pdf = st.file_uploader(
@@ -419,17 +797,50 @@ if st.session_state.admin_mode:
             doc_name = st.text_input("문서 이름", value=uploaded_pdf.name.replace(".pdf", ""))
             
             if st.button("📤 업로드 및 저장", type="primary"):
-                with st.spinner("PDF에서 텍스트 추출 중..."):
-                    pdf_text = extract_text_from_pdf(uploaded_pdf)
+                pdf_bytes = uploaded_pdf.getvalue()
+                uploaded_file_hash = file_hash(pdf_bytes)
+                documents = load_documents_from_firestore()
+                duplicate = find_duplicate(documents, doc_name, uploaded_file_hash)
+                
+                if is_same_upload(documents, doc_name, uploaded_file_hash):
+                    # 같은 이름으로 같은 파일을 다시 올린 경우 텍스트 추출 없이 건너뜀
+                    st.info(f"'{doc_name}' 문서와 같은 파일이라 변경 사항이 없습니다.")
+                elif duplicate:
+                    st.warning(f"같은 파일이 이미 '{duplicate['name']}' 문서로 저장되어 있어 건너뛰었습니다.")
+                else:
+                    progress_bar = st.progress(0.0, text="PDF에서 텍스트 추출 중...")
                     
-                    if pdf_text:
-                        if save_document_to_firestore(doc_name, pdf_text):
-                            st.success(f"✅ '{doc_name}' 문서가 저장되었습니다!")
-                            st.rerun()
-                        else:
-                            st.error("문서 저장에 실패했습니다.")
-                    else:
+                    def update_progress(done: int, total: int):
+                        progress_bar.progress(done / total, text=f"PDF에서 텍스트 추출 중... ({done}/{total} 페이지)")
+                    
+                    result = extract_text_from_pdf(uploaded_pdf, update_progress)
+                    pdf_text = result.text if result else None
+                    
+                    if not pdf_text:
                         st.error("PDF에서 텍스트를 추출할 수 없습니다.")
+                    elif duplicate := find_duplicate(load_documents_from_firestore(), doc_name, digest=content_hash(pdf_text)):
+                        st.warning(f"같은 내용이 이미 '{duplicate['name']}' 문서로 저장되어 있어 건너뛰었습니다.")
+                    else:
+                        if result.skipped_pages:
+                            st.warning(f"텍스트를 추출하지 못한 페이지를 건너뛰었습니다: {', '.join(map(str, result.skipped_pages))}")
+                        summary = save_document_to_firestore(doc_name, pdf_text, result.pages, result.chunks, uploaded_file_hash)
+                        if summary is None:
+                            st.error("문서 저장에 실패했습니다.")
+                        elif not summary["changed"]:
+                            st.info(f"'{doc_name}' 문서와 내용이 같아 변경 사항이 없습니다.")
+                        else:
+                            st.success(
+                                f"✅ '{doc_name}' 문서가 저장되었습니다! ({result.page_count}페이지, "
+                                f"변경된 청크 {summary['written_chunks']}개 기록, {summary['deleted_chunks']}개 삭제)"
+                            )
+                            articles = summary["articles"]
+                            st.markdown(
+                                f"**조항 변경 요약:** 추가 {len(articles['added'])} · 수정 {len(articles['modified'])} · "
+                                f"삭제 {len(articles['removed'])} · 변경 없음 {articles['unchanged']}"
+                            )
+                            for title, labels in (("추가", articles["added"]), ("수정", articles["modified"]), ("삭제", articles["removed"])):
+                                if labels:
+                                    st.caption(f"{title}: {', '.join(labels)}")
         
         # 현재 저장된 문서 목록
         st.divider()
@@ -441,12 +852,22 @@ if st.session_state.admin_mode:
             for doc in documents:
                 with st.expander(f"📄 {doc['name']}"):
                     st.caption(f"업로드: {doc.get('uploaded_at', 'N/A')}")
+                    if doc.get('size') is not None:
+                        st.caption(f"페이지: {doc.get('page_count') or '-'} · 크기: {doc['size'] / 1024:.1f} KB · 청크: {doc.get('chunk_count')}")
+                    
+                    # 본문은 요청할 때만 불러옴 (목록은 메타데이터만 읽음)
+                    show_full = st.checkbox("전체 내용 보기", key=f"full_{doc['name']}")
+                    if show_full:
+                        content = load_document_content_from_firestore(doc['name']) or ""
+                    else:
+                        preview = doc.get('preview', '')
+                        content = preview + "..." if doc.get('size') and len(preview.encode("utf-8")) < doc['size'] else preview
                     st.text_area(
                         "문서 내용",
-                        value=doc['content'][:500] + "..." if len(doc['content']) > 500 else doc['content'],
+                        value=content,
                         height=200,
                         disabled=True,
-                        key=f"doc_{doc['name']}"
+                        key=f"doc_{doc['name']}_{'full' if show_full else 'preview'}"
                     )
                     
                     if st.button(f"🗑️ 삭제", key=f"del_{doc['name']}", type="secondary"):
@@ -455,6 +876,63 @@ if st.session_state.admin_mode:
                             st.rerun()
         else:
             st.info("아직 업로드된 규정 문서가 없습니다.")
+    
+    with tab3:
+        st.subheader("⏱️ 답변 경로 성능")
+        summary = metrics_registry.summary()
+        
+        if metrics_registry.turns_total:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("계측된 답변 수", metrics_registry.turns_total)
+            with col2:
+                st.metric("답변 캐시 적중", metrics_registry.cache_hits_total)
+            with col3:
+                st.metric("누적 토큰 (입력/출력)", f"{metrics_registry.tokens_total['prompt']:,} / {metrics_registry.tokens_total['completion']:,}")
+            
+            # 단계별 p50/p95 (ms)
+            stage_names = {
+                "retrieve_ms": "문서 동기화 + 검색",
+                "prompt_ms": "프롬프트 생성",
+                "history_ms": "히스토리 정리",
+                "ttft_ms": "첫 토큰까지 (TTFT)",
+                "stream_ms": "스트리밍 전체",
+                "total_ms": "전체",
+            }
+            st.table([
+                {
+                    "단계": stage_names[field],
+                    "p50 (ms)": f"{summary[field]['p50']:.0f}",
+                    "p95 (ms)": f"{summary[field]['p95']:.0f}",
+                    "표본 수": summary[field]["count"],
+                }
+                for field in TIMING_FIELDS
+            ])
+            st.caption(
+                f"입력 토큰 p50 {summary['prompt_tokens']['p50']:.0f} / p95 {summary['prompt_tokens']['p95']:.0f} · "
+                f"프롬프트 캐시 적중 토큰 p50 {summary['cached_tokens']['p50']:.0f} "
+                f"(누적 {metrics_registry.tokens_total['cached'] / max(metrics_registry.tokens_total['prompt'], 1):.0%}) · "
+                f"출력 토큰 p50 {summary['completion_tokens']['p50']:.0f} / p95 {summary['completion_tokens']['p95']:.0f} · "
+                f"스트림 청크 수 p50 {summary['chunk_count']['p50']:.0f} · "
+                f"렌더링 p50 {summary['render_count']['p50']:.0f}회 (절약 p50 {summary['renders_saved']['p50']:.0f}회)"
+            )
+            writer_stats = log_writer.stats()
+            st.caption(
+                f"로그 기록 (백그라운드): 로컬 파일 p50 {writer_stats['append_ms_p50']:.0f} / p95 {writer_stats['append_ms_p95']:.0f} ms · "
+                f"Firestore 배치 p50 {writer_stats['upload_ms_p50']:.0f} / p95 {writer_stats['upload_ms_p95']:.0f} ms · "
+                f"전송 실패 {writer_stats['upload_failures']}회"
+            )
+            
+            gateway_stats = llm_gateway.stats()
+            st.caption(
+                f"OpenAI 호출: 진행 {gateway_stats['active']} · 대기 {gateway_stats['queued']} · "
+                f"상류 호출 {gateway_stats['upstream_calls']}회 · 병합 {gateway_stats['shared_joins']}회 · 재시도 {gateway_stats['retries']}회"
+            )
+            
+            with st.expander("최근 답변 계측값"):
+                st.dataframe(metrics_registry.recent(), use_container_width=True)
+        else:
+            st.info("아직 계측된 답변이 없습니다.")
 
 # 사이드바에 안내 정보 추가
 with st.sidebar:
@@ -463,7 +941,7 @@ with st.sidebar:
     st.markdown("### 자주 묻는 질문")
     st.caption("질문을 클릭하면 챗봇이 답변해드립니다.")
     
-    for i, question in enumerate(FAQ_QUESTIONS, 1):
+    for i, question in enumerate(faq_questions(), 1):
         if st.button(f"Q{i}: {question}", key=f"faq_{i}", use_container_width=True):
             # FAQ 질문을 채팅에 추가
             st.session_state.messages.append({"role": "user", "content": question})
@@ -478,6 +956,7 @@ with st.sidebar:
                 "content": "안녕하세요! 저는 사내 HR 챗봇입니다. 어떤 것이 궁금하신가요?\n\n예시: 인사규정 / 4대보험 / 육아휴직 등",
             }
         ]
+        st.session_state.history_summary = {}
         st.rerun()
     
     st.divider()
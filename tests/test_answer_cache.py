@@ -0,0 +1,27 @@
+import json
+import time
+
+from answer_cache import AnswerCache
+
+
+def test_put_does_not_write_synchronously(tmp_path):
+    path = tmp_path / "answer_cache.json"
+    cache = AnswerCache(path=str(path), save_interval=60)
+    cache.put("연차휴가 며칠?", "fp", "15일")
+    assert not path.exists()
+    cache.close()
+    assert json.loads(path.read_text(encoding="utf-8"))[0][1]["answer"] == "15일"
+
+
+def test_background_save_and_reload(tmp_path):
+    path = tmp_path / "answer_cache.json"
+    cache = AnswerCache(path=str(path), save_interval=0.05)
+    cache.put("연차휴가 며칠?", "fp", "15일", ["인사규정"])
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    cache.close()
+
+    reloaded = AnswerCache(path=str(path))
+    assert reloaded.get("연차휴가 며칠", "fp") == "15일"
+    reloaded.close()
@@ -0,0 +1,78 @@
+import pytest
+
+from articles import ArticleIndex
+
+HR_RULES = """인사규정
+제16조(채용) ① 직원은 공개 채용한다.
+제17조(수습) ① 신규 직원은 3개월간 수습으로 근무한다.
+제25조(육아휴직) ① 직원은 육아휴직을 신청할 수 있다.
+② 육아휴직 기간은 1년 이내로 한다.
+제74조(포상) ① 공로가 있는 직원은 포상할 수 있다.
+"""
+
+
+def make_index():
+    index = ArticleIndex()
+    index.upsert("인사규정", HR_RULES)
+    return index
+
+
+def statuses(results):
+    return [(result["citation"], result["status"]) for result in results]
+
+
+def test_verify_citations_follows_previous_regulation():
+    results = make_index().verify_citations("인사규정 제16조 및 제17조에 따라")
+    assert statuses(results) == [("인사규정 제16조", "ok"), ("인사규정 제17조", "ok")]
+
+
+def test_verify_citations_checks_paragraph():
+    results = make_index().verify_citations("인사규정 제25조 제3항에 따라")
+    assert statuses(results) == [("인사규정 제25조 제3항", "missing_paragraph")]
+
+
+def test_verify_citations_skips_statute_after_regulation():
+    results = make_index().verify_citations("인사규정 제25조 및 남녀고용평등법 제19조에 따라")
+    assert statuses(results) == [("인사규정 제25조", "ok")]
+
+
+def test_verify_citations_skips_enforcement_decree():
+    results = make_index().verify_citations("인사규정 제25조, 같은 법 시행령 제10조")
+    assert statuses(results) == [("인사규정 제25조", "ok")]
+
+
+def test_verify_citations_reports_unknown_regulation():
+    results = make_index().verify_citations("복무규정 제3조에 따라")
+    assert statuses(results) == [("복무규정 제3조", "unknown_regulation")]
+
+
+def test_resolve_question_with_regulation_name():
+    resolved = make_index().resolve_question("인사규정 제25조 2항 알려줘")
+    assert [(chunk["name"], chunk["article"]) for chunk in resolved] == [("인사규정", "제25조")]
+    assert "1년 이내" in resolved[0]["text"]
+
+
+def test_resolve_question_uses_unique_article_without_name():
+    resolved = make_index().resolve_question("제74조 내용이 뭐야?")
+    assert [(chunk["name"], chunk["article"]) for chunk in resolved] == [("인사규정", "제74조")]
+
+
+def test_resolve_question_ignores_statute_article():
+    assert make_index().resolve_question("근로기준법 제74조 출산휴가 며칠이야?") == []
+
+
+def test_sync_retries_after_failed_load():
+    index = ArticleIndex()
+    documents = [{"name": "인사규정", "hash": "a1"}, {"name": "복무규정", "hash": "b1"}]
+
+    def failing(name):
+        if name == "복무규정":
+            raise RuntimeError("firestore unavailable")
+        return HR_RULES
+
+    with pytest.raises(RuntimeError):
+        index.sync(documents, "v1", failing)
+    assert index.stats()["regulations"] == 1
+
+    index.sync(documents, "v1", lambda name: HR_RULES)
+    assert index.stats()["regulations"] == 2
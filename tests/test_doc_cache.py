@@ -0,0 +1,23 @@
+from doc_cache import DocumentCache
+from fake_backends import InMemoryFirestore
+
+
+def test_watch_registers_on_first_load():
+    db = InMemoryFirestore()
+    created = []
+
+    def query():
+        created.append(True)
+        return db.collection("documents")
+
+    cache = DocumentCache()
+    cache.watch_on_first_load(query)
+    assert not created and not cache.stats()["watching"]
+
+    assert cache.get(lambda: [{"name": "인사규정", "hash": "a1"}])[0]["name"] == "인사규정"
+    assert created == [True] and cache.stats()["watching"]
+
+    # 다른 인스턴스의 변경은 리스너로 무효화
+    db.collection("documents").document("복무규정").set({"name": "복무규정"})
+    assert cache.get(lambda: []) == []
+    assert created == [True]
@@ -0,0 +1,80 @@
+from doc_store import is_same_upload, list_documents, load_document_content, save_document
+from fake_backends import InMemoryFirestore
+
+
+def make_pages(count):
+    return [f"제{i}조(조항 {i}) 직원은 규정 {i}을 따른다." for i in range(1, count + 1)]
+
+
+def test_inserted_page_rewrites_only_new_chunk():
+    db = InMemoryFirestore()
+    pages = make_pages(40)
+    save_document(db, "인사규정", "\n".join(pages), pages)
+
+    pages = ["제0조(목적) 이 규정은 인사에 관한 사항을 정한다."] + pages
+    summary = save_document(db, "인사규정", "\n".join(pages), pages)
+
+    assert summary["written_chunks"] == 1
+    assert summary["deleted_chunks"] == 0
+    assert summary["articles"]["added"] == ["제0조"]
+    assert load_document_content(db, "인사규정") == "\n".join(pages)
+
+
+def test_removed_page_deletes_unreferenced_chunk():
+    db = InMemoryFirestore()
+    pages = make_pages(5)
+    save_document(db, "인사규정", "\n".join(pages), pages)
+
+    pages = pages[1:]
+    summary = save_document(db, "인사규정", "\n".join(pages), pages)
+
+    assert summary["written_chunks"] == 0
+    assert summary["deleted_chunks"] == 1
+    assert load_document_content(db, "인사규정") == "\n".join(pages)
+
+
+class FailingBatches(InMemoryFirestore):
+    """fail_at번째 배치 커밋에서 실패하는 Firestore"""
+
+    def __init__(self, fail_at):
+        super().__init__()
+        self.fail_at = fail_at
+        self.commits = 0
+
+    def batch(self):
+        batch = super().batch()
+        commit = batch.commit
+
+        def failing_commit():
+            self.commits += 1
+            if self.commits == self.fail_at:
+                raise RuntimeError("commit failed")
+            commit()
+
+        batch.commit = failing_commit
+        return batch
+
+
+def test_failed_revision_keeps_previous_document_readable():
+    pages = [f"{i}쪽 본문" for i in range(600)]
+    revised = [f"{i}쪽 개정 본문" for i in range(600)]
+    for fail_at in range(1, 6):
+        db = FailingBatches(fail_at=0)
+        save_document(db, "인사규정", "\n".join(pages), pages)
+        db.fail_at, db.commits = fail_at, 0
+        try:
+            save_document(db, "인사규정", "\n".join(revised), revised)
+        except RuntimeError:
+            pass
+        content = load_document_content(db, "인사규정")
+        assert content in ("\n".join(pages), "\n".join(revised))
+
+
+def test_same_upload_is_detected_by_file_hash():
+    db = InMemoryFirestore()
+    pages = make_pages(3)
+    save_document(db, "인사규정", "\n".join(pages), pages, uploaded_file_hash="f1")
+    documents = list_documents(db)
+    assert is_same_upload(documents, "인사규정", "f1")
+    assert not is_same_upload(documents, "인사규정", "f2")
+    assert not is_same_upload(documents, "복무규정", "f1")
@@ -0,0 +1,14 @@
+from faq import DEFAULT_FAQ_QUESTIONS, add_faq_question, load_faq_questions, remove_faq_question
+from fake_backends import InMemoryFirestore
+
+
+def test_add_and_remove_faq_question(monkeypatch):
+    monkeypatch.setenv("HR_CHATBOT_BACKEND", "fake")
+    db = InMemoryFirestore()
+    add_faq_question(db, "연차 휴가는 며칠인가요?")
+    add_faq_question(db, "연차 휴가는 며칠인가요?")
+    add_faq_question(db, DEFAULT_FAQ_QUESTIONS[0])
+    assert load_faq_questions(db) == DEFAULT_FAQ_QUESTIONS + ["연차 휴가는 며칠인가요?"]
+
+    remove_faq_question(db, "연차 휴가는 며칠인가요?")
+    assert load_faq_questions(db) == DEFAULT_FAQ_QUESTIONS
@@ -0,0 +1,34 @@
+from faq_mining import collect_questions, cluster_questions, mine_faqs
+
+
+def logs(*pairs):
+    return [{"query": query, "source": "chat"} for query, count in pairs for _ in range(count)]
+
+
+def test_clusters_paraphrases_and_ranks_by_count():
+    clusters = cluster_questions(collect_questions(logs(
+        ("연차휴가 며칠이야?", 5),
+        ("연차휴가 며칠이야", 2),
+        ("출장비 정산 방법", 3),
+    )))
+    assert [(c["question"], c["count"]) for c in clusters] == [("연차휴가 며칠이야?", 7), ("출장비 정산 방법", 3)]
+
+
+def test_numbers_split_clusters():
+    clusters = cluster_questions(collect_questions(logs(("육아휴직 1년 연장", 3), ("육아휴직 3년 연장", 2))))
+    assert len(clusters) == 2
+
+
+def test_long_tail_joins_seed_clusters():
+    clusters = cluster_questions(
+        collect_questions(logs(("연차휴가 며칠이야", 5), ("출장비 정산 방법", 4), ("연차 휴가 며칠이야", 1), ("기타 질문", 1))),
+        threshold=0.75,
+        max_seeds=2,
+    )
+    assert [(c["question"], c["count"]) for c in clusters] == [("연차휴가 며칠이야", 6), ("출장비 정산 방법", 4)]
+
+
+def test_mine_faqs_skips_existing_faq():
+    result = mine_faqs(logs(("연차휴가 며칠이야", 5), ("출장비 정산 방법", 4)), ["연차휴가 며칠이야?"], min_count=3)
+    assert result["logs"] == 9
+    assert [s["question"] for s in result["suggestions"]] == ["출장비 정산 방법"]
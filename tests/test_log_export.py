@@ -0,0 +1,25 @@
+import os
+import time
+
+from log_export import EXPORT_TEMP_MAX_AGE, create_export_file, remove_stale_exports
+
+
+def test_remove_stale_exports_keeps_recent_files(tmp_path):
+    stale = create_export_file("csv", str(tmp_path))
+    recent = create_export_file("jsonl", str(tmp_path))
+    other = tmp_path / "metrics.prom"
+    other.write_text("")
+    old = time.time() - EXPORT_TEMP_MAX_AGE - 60
+    os.utime(stale, (old, old))
+    os.utime(other, (old, old))
+
+    assert remove_stale_exports(str(tmp_path)) == 1
+    assert not os.path.exists(stale)
+    assert os.path.exists(recent)
+    assert other.exists()
+
+
+def test_create_export_file_uses_format_extension(tmp_path):
+    path = create_export_file("parquet", str(tmp_path))
+    assert os.path.basename(path).startswith("chat_logs_")
+    assert path.endswith(".parquet")
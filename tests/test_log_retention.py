@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from fake_backends import InMemoryFirestore
+from log_retention import RetentionJob
+from log_store import DAILY_COLLECTION, LOGS_COLLECTION, QUESTIONS_COLLECTION
+
+
+def count(db, collection):
+    return len(list(db.collection(collection).stream()))
+
+
+def seed(db):
+    today = datetime.now()
+    db.collection(LOGS_COLLECTION).document("log-1").set({"timestamp": today, "query": "q", "response": "a"})
+    db.collection(DAILY_COLLECTION).document("2020-01-01").set({"date": "2020-01-01", "total": 3})
+    db.collection(DAILY_COLLECTION).document(today.strftime("%Y-%m-%d")).set({"date": today.strftime("%Y-%m-%d"), "total": 1})
+    db.collection(QUESTIONS_COLLECTION).document("q").set({"query": "q", "count": 1})
+
+
+def run(job, *args, **kwargs):
+    job.start(*args, **kwargs)
+    job._thread.join(10)
+    return job.stats()
+
+
+def test_full_purge_deletes_all_rollups(tmp_path, monkeypatch):
+    # 전체 삭제는 현재 디렉터리의 이전 형식 로그 파일도 지움
+    monkeypatch.chdir(tmp_path)
+    db = InMemoryFirestore()
+    seed(db)
+    job = RetentionJob(db, path=str(tmp_path / "chat_logs.jsonl"), state_path=None)
+
+    state = run(job, datetime.now(), include_current=True)
+
+    assert state["status"] == "done"
+    assert count(db, LOGS_COLLECTION) == 0
+    assert count(db, DAILY_COLLECTION) == 0
+    assert count(db, QUESTIONS_COLLECTION) == 0
+
+
+def test_age_cutoff_keeps_current_rollups(tmp_path):
+    db = InMemoryFirestore()
+    seed(db)
+    job = RetentionJob(db, path=str(tmp_path / "chat_logs.jsonl"), state_path=None)
+
+    state = run(job, datetime(2021, 1, 1))
+
+    assert state["status"] == "done"
+    assert count(db, LOGS_COLLECTION) == 1
+    assert count(db, DAILY_COLLECTION) == 1
+    assert count(db, QUESTIONS_COLLECTION) == 1
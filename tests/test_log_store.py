@@ -0,0 +1,51 @@
+import time
+from datetime import datetime, timezone
+
+from fake_backends import InMemoryFirestore
+from log_store import LOGS_COLLECTION, log_statistics, rebuild_rollups
+
+
+def test_rebuild_rollups_counts_existing_logs():
+    db = InMemoryFirestore()
+    logs = [
+        (datetime(2026, 9, 1, 10), "faq", "육아휴직 서류"),
+        (datetime(2026, 9, 1, 11), "chat", "육아휴직 서류?"),
+        (datetime(2026, 9, 2, 9), "chat", "연차 일수"),
+    ]
+    for i, (timestamp, source, query) in enumerate(logs):
+        db.collection(LOGS_COLLECTION).document(f"log-{i}").set(
+            {"timestamp": timestamp, "source": source, "query": query, "response": "답변"}
+        )
+
+    result = rebuild_rollups(db)
+    assert result == {"logs": 3, "days": 2, "questions": 2}
+
+    stats = log_statistics(db)
+    assert stats["daily"] == [
+        {"date": "2026-09-01", "total": 2, "faq": 1, "chat": 1},
+        {"date": "2026-09-02", "total": 1, "faq": 0, "chat": 1},
+    ]
+    assert stats["top_questions"][0]["count"] == 2
+
+    # 다시 실행해도 값이 늘어나지 않음
+    rebuild_rollups(db)
+    assert log_statistics(db)["daily"][0]["total"] == 2
+
+
+def test_rebuild_rollups_keeps_utc_dates(monkeypatch):
+    # Firestore는 기록한 naive 시각을 UTC로 돌려주므로 서버 시간대와 무관하게 같은 날짜여야 함
+    monkeypatch.setenv("TZ", "Asia/Seoul")
+    time.tzset()
+    try:
+        db = InMemoryFirestore()
+        db.collection(LOGS_COLLECTION).document("log-0").set({
+            "timestamp": datetime(2026, 9, 1, 20, tzinfo=timezone.utc),
+            "source": "chat",
+            "query": "연차 일수",
+            "response": "답변",
+        })
+        rebuild_rollups(db)
+        assert [row["date"] for row in log_statistics(db)["daily"]] == ["2026-09-01"]
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
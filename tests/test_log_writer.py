@@ -0,0 +1,99 @@
+import time
+from datetime import datetime
+
+from fake_backends import InMemoryFirestore
+from log_writer import LogWriter, read_local_logs, rotated_log_files
+
+
+class FlakyFirestore(InMemoryFirestore):
+    """처음 failures번의 배치 커밋이 실패하는 Firestore"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.commits = 0
+
+    def batch(self):
+        batch = super().batch()
+        commit = batch.commit
+
+        def flaky_commit():
+            self.commits += 1
+            if self.commits <= self.failures:
+                raise RuntimeError("unavailable")
+            return commit()
+
+        batch.commit = flaky_commit
+        return batch
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def entry(query):
+    return {"timestamp": datetime.now(), "query": query, "response": "답변", "source": "chat"}
+
+
+def count_logs(db):
+    return len(list(db.collection("chat_logs").stream()))
+
+
+def test_flush_writes_local_file_and_uploads(tmp_path):
+    db = InMemoryFirestore()
+    writer = LogWriter(db, path=str(tmp_path / "chat_logs.jsonl"), flush_interval=0.05)
+    for i in range(3):
+        writer.submit(entry(f"질문 {i}"))
+    writer.flush()
+
+    assert writer.stats()["written"] == 3
+    assert writer.stats()["uploaded"] == 3
+    assert count_logs(db) == 3
+    assert len((tmp_path / "chat_logs.jsonl").read_text(encoding="utf-8").splitlines()) == 3
+    writer.close()
+
+
+def test_rotates_local_file_by_size(tmp_path, monkeypatch):
+    # read_local_logs는 현재 디렉터리의 이전 형식 로그 파일도 읽음
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "chat_logs.jsonl")
+    writer = LogWriter(None, path=path, max_bytes=1, flush_interval=0.05)
+    writer.submit(entry("첫 질문"))
+    assert wait_for(lambda: writer.stats()["written"] == 1)
+    writer.submit(entry("두 번째 질문"))
+    assert wait_for(lambda: writer.stats()["written"] == 2)
+    writer.close()
+
+    assert len(rotated_log_files(path)) == 1
+    assert [log["query"] for log in read_local_logs(path)] == ["두 번째 질문", "첫 질문"]
+
+
+def test_failed_upload_backs_off_and_retries_once(tmp_path):
+    db = FlakyFirestore(failures=2)
+    writer = LogWriter(db, path=str(tmp_path / "chat_logs.jsonl"), flush_interval=0.05)
+    writer.submit(entry("질문"))
+
+    assert wait_for(lambda: writer.stats()["uploaded"] == 1)
+    stats = writer.stats()
+    assert stats["upload_failures"] == 2
+    assert stats["pending_upload"] == 0
+    # 실패한 배치는 통째로 다시 보내므로 중복 기록되지 않음
+    assert count_logs(db) == 1
+    # 성공하면 백오프 간격이 초기화됨
+    assert wait_for(lambda: writer._retry_delay == writer.flush_interval)
+    writer.close()
+
+
+def test_close_uploads_remaining_logs(tmp_path):
+    db = InMemoryFirestore()
+    writer = LogWriter(db, path=str(tmp_path / "chat_logs.jsonl"), batch_size=100, flush_interval=0.2)
+    writer.submit(entry("질문 1"))
+    writer.submit(entry("질문 2"))
+    writer.close()
+
+    assert count_logs(db) == 2
+    assert writer.stats()["pending_upload"] == 0
+    assert writer.stats()["upload_ms_p50"] > 0
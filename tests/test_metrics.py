@@ -0,0 +1,34 @@
+import time
+
+from metrics import MetricsRegistry
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_export_is_throttled(tmp_path):
+    path = tmp_path / "metrics.prom"
+    registry = MetricsRegistry(path=str(path), export_interval=60)
+    registry.record({"total_ms": 10.0})
+    assert wait_for(lambda: path.exists() and "hr_chatbot_turns_total 1" in path.read_text())
+
+    # 간격 안의 기록은 파일에 바로 반영되지 않음
+    registry.record({"total_ms": 20.0})
+    time.sleep(0.1)
+    assert "hr_chatbot_turns_total 1" in path.read_text()
+
+    registry.close()
+    assert "hr_chatbot_turns_total 2" in path.read_text()
+
+
+def test_summary_percentiles():
+    registry = MetricsRegistry(path=None)
+    for value in (10.0, 20.0, 30.0):
+        registry.record({"total_ms": value, "prompt_tokens": 100})
+    summary = registry.summary()
+    assert summary["total_ms"]["p50"] == 20.0
+    assert summary["prompt_tokens"]["count"] == 3
@@ -0,0 +1,26 @@
+import pytest
+
+from retrieval import RetrievalIndex
+
+DOCUMENTS = [{"name": "A", "hash": "a1"}, {"name": "B", "hash": "b1"}]
+
+
+def load_chunks(name):
+    return [{"text": f"{name} 규정 육아휴직 신청", "page": 1}]
+
+
+def test_sync_retries_after_failed_load():
+    index = RetrievalIndex(path=None)
+
+    def failing(name):
+        if name == "B":
+            raise RuntimeError("firestore unavailable")
+        return load_chunks(name)
+
+    with pytest.raises(RuntimeError):
+        index.sync(DOCUMENTS, "v1", failing)
+    assert sorted(index.docs) == ["A"]
+
+    assert index.sync(DOCUMENTS, "v1", load_chunks)
+    assert sorted(index.docs) == ["A", "B"]
+    assert not index.sync(DOCUMENTS, "v1", load_chunks)
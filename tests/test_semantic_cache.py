@@ -0,0 +1,42 @@
+from semantic_cache import SemanticCache, question_words
+
+
+def test_paraphrase_hits():
+    cache = SemanticCache()
+    cache.put("육아휴직 몇 번 나눠 쓸 수 있어", "두 번", "v1")
+    hit = cache.lookup("육아휴직은 몇 번 분리해서 사용할 수 있어", "v1")
+    assert hit is not None and hit["answer"] == "두 번"
+
+
+def test_added_qualifier_misses():
+    cache = SemanticCache()
+    cache.put("배우자 출산휴가는 며칠이야", "10일", "v1")
+    assert cache.lookup("배우자 출산휴가는 며칠 유급이야", "v1") is None
+
+
+def test_different_numbers_miss():
+    cache = SemanticCache()
+    cache.put("육아휴직 1년 사용 후 연장할 수 있어", "가능", "v1")
+    assert cache.lookup("육아휴직 3년 사용 후 연장할 수 있어", "v1") is None
+
+
+def test_nouns_keep_final_syllable():
+    assert question_words("출산휴가 연차휴가 제도") == ["출산휴가", "연차휴가", "제도"]
+
+
+def test_version_change_clears_entries():
+    cache = SemanticCache()
+    cache.put("연차휴가는 며칠이야", "15일", "v1")
+    assert cache.lookup("연차휴가는 며칠이야", "v2") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_ring_buffer_evicts_oldest():
+    cache = SemanticCache(max_entries=2)
+    cache.put("연차휴가 일수", "15일", "v1")
+    cache.put("출산휴가 일수", "90일", "v1")
+    cache.put("경조사 휴가 일수", "5일", "v1")
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup("연차휴가 일수", "v1") is None
+    assert cache.lookup("출산휴가 일수", "v1")["answer"] == "90일"
+    assert cache.lookup("경조사 휴가 일수", "v1")["answer"] == "5일"
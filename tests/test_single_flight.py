@@ -0,0 +1,124 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from single_flight import LLMGateway, QueueTimeoutError
+
+
+class UpstreamError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def chunk(content=None, usage=None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))], usage=usage)
+
+
+def fake_stream(deltas, release=None, fail_after=None):
+    """deltas를 차례로 내보내는 스트림 (release가 있으면 첫 delta 전에 대기)"""
+    def generate():
+        if release is not None:
+            release.wait(5)
+        for index, delta in enumerate(deltas):
+            if fail_after is not None and index == fail_after:
+                raise UpstreamError(503)
+            yield chunk(delta)
+        yield chunk(usage={"completion_tokens": len(deltas)})
+    return generate()
+
+
+def test_same_key_shares_one_upstream_stream():
+    gateway = LLMGateway(base_delay=0)
+    release = threading.Event()
+    calls = []
+
+    def create_stream():
+        calls.append(1)
+        return fake_stream(["연차는 ", "15일입니다."], release)
+
+    first = gateway.stream("key", create_stream)
+    second = gateway.stream("key", create_stream)
+    release.set()
+
+    assert "".join(first) == "연차는 15일입니다."
+    assert "".join(second) == "연차는 15일입니다."
+    assert (first.shared, second.shared) == (False, True)
+    assert second.usage == {"completion_tokens": 2}
+    assert len(calls) == 1
+    assert gateway.stats()["in_flight"] == 0
+
+
+def test_none_key_is_not_coalesced():
+    gateway = LLMGateway(base_delay=0)
+    calls = []
+
+    def create_stream():
+        calls.append(1)
+        return fake_stream(["답변"])
+
+    assert "".join(gateway.stream(None, create_stream)) == "답변"
+    assert "".join(gateway.stream(None, create_stream)) == "답변"
+    assert len(calls) == 2
+
+
+def test_retries_before_first_delta():
+    gateway = LLMGateway(base_delay=0)
+    attempts = []
+
+    def create_stream():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise UpstreamError(429)
+        return fake_stream(["재시도 ", "성공"])
+
+    assert "".join(gateway.stream("key", create_stream)) == "재시도 성공"
+    assert gateway.stats()["retries"] == 1
+
+
+def test_does_not_retry_after_first_delta():
+    gateway = LLMGateway(base_delay=0)
+    attempts = []
+
+    def create_stream():
+        attempts.append(1)
+        return fake_stream(["앞부분", "뒷부분"], fail_after=1)
+
+    received = []
+    with pytest.raises(UpstreamError):
+        for delta in gateway.stream("key", create_stream):
+            received.append(delta)
+    # 이미 나눠 준 delta가 중복되지 않도록 다시 호출하지 않음
+    assert received == ["앞부분"]
+    assert len(attempts) == 1
+
+
+def test_non_retryable_error_is_raised_immediately():
+    gateway = LLMGateway(base_delay=0)
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        raise UpstreamError(400)
+
+    with pytest.raises(UpstreamError):
+        gateway.call(fn)
+    assert len(attempts) == 1
+
+
+def test_queue_timeout_when_all_slots_busy():
+    gateway = LLMGateway(max_concurrent=1, base_delay=0, queue_timeout=0.05)
+    release = threading.Event()
+    busy = gateway.stream("first", lambda: fake_stream(["첫 답변"], release))
+    deadline = time.monotonic() + 5
+    while gateway.stats()["active"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with pytest.raises(QueueTimeoutError):
+        list(gateway.stream("second", lambda: fake_stream(["두 번째 답변"])))
+
+    release.set()
+    assert "".join(busy) == "첫 답변"
+    assert gateway.stats()["active"] == 0
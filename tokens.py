@@ -0,0 +1,28 @@
+"""토큰 수 계산 유틸리티"""
+
+from functools import lru_cache
+
+# gpt-4o-mini가 사용하는 토크나이저
+ENCODING_NAME = "o200k_base"
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """tiktoken 인코더 로드 (설치되어 있지 않으면 None)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """텍스트의 토큰 수 계산 (tiktoken이 없으면 근사치)"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # 근사치: 영문/숫자는 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 약 1토큰
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1